@@ -28,8 +28,14 @@ async def get_current_user(
     Dependency to get the current authenticated user.
     Validates JWT token from Authorization header.
     """
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials)
 
+
+async def authenticate_token(token: str) -> User:
+    """
+    Validate a Google ID token and return its user.
+    Used directly by websocket endpoints, which cannot send the header.
+    """
     if not GOOGLE_CLIENT_ID:
         logger.warning("DEBUG AUTH: GOOGLE_CLIENT_ID is None")
 
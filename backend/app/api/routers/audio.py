@@ -22,23 +22,89 @@ from pathlib import Path
 import aiofiles
 
 try:
-    from ..deps import get_current_user
+    from ..deps import authenticate_token, get_current_user
     from ...schemas.user import User
     from ...db import DatabaseManager
     from ...core.rbac import RBAC
     from ...services.audio.manager import StreamingTranscriptionManager
-    from ...services.audio.recorder import get_or_create_recorder, stop_recorder
+    from ...services.audio.scheduler import get_transcription_scheduler
+    from ...services.audio.vad_pool import get_vad_pool
+    from ...services.audio.ingest_queue import (
+        AudioIngestQueue,
+        AUDIO_QUEUE_POLICY,
+        POLICIES as QUEUE_POLICIES,
+    )
+    from ...services.audio.latency import get_pipeline_latency
+    from ...services.audio.codecs import (
+        CODEC_PCM,
+        StreamDecoder,
+        available_codecs,
+        negotiate_codec,
+    )
+    from ...services.audio.resample import (
+        AudioFormatConverter,
+        MAX_INPUT_CHANNELS,
+        MAX_INPUT_RATE,
+        MIN_INPUT_RATE,
+        TARGET_CHANNELS,
+        TARGET_SAMPLE_RATE,
+    )
+    from ...services.audio.recorder import (
+        active_recorders,
+        get_or_create_recorder,
+        seal_recorder,
+    )
+    from ...services.audio.session_store import (
+        SessionLease,
+        SessionStoreUnavailable,
+        get_session_store,
+    )
+    from ...services.audio.transcript_writer import TranscriptWriteBehind
+    from ...services.audio.transcript_hub import CLOSE_SLOW_CONSUMER, get_transcript_hub
     from ...services.audio.post_recording import get_post_recording_service
-    from ...services.storage import StorageService
+    from ...services.storage import LocalStorageBackend, StorageService
 except (ImportError, ValueError):
-    from api.deps import get_current_user
+    from api.deps import authenticate_token, get_current_user
     from schemas.user import User
     from db import DatabaseManager
     from core.rbac import RBAC
     from services.audio.manager import StreamingTranscriptionManager
-    from services.audio.recorder import get_or_create_recorder, stop_recorder
+    from services.audio.scheduler import get_transcription_scheduler
+    from services.audio.vad_pool import get_vad_pool
+    from services.audio.ingest_queue import (
+        AudioIngestQueue,
+        AUDIO_QUEUE_POLICY,
+        POLICIES as QUEUE_POLICIES,
+    )
+    from services.audio.latency import get_pipeline_latency
+    from services.audio.codecs import (
+        CODEC_PCM,
+        StreamDecoder,
+        available_codecs,
+        negotiate_codec,
+    )
+    from services.audio.resample import (
+        AudioFormatConverter,
+        MAX_INPUT_CHANNELS,
+        MAX_INPUT_RATE,
+        MIN_INPUT_RATE,
+        TARGET_CHANNELS,
+        TARGET_SAMPLE_RATE,
+    )
+    from services.audio.recorder import (
+        active_recorders,
+        get_or_create_recorder,
+        seal_recorder,
+    )
+    from services.audio.session_store import (
+        SessionLease,
+        SessionStoreUnavailable,
+        get_session_store,
+    )
+    from services.audio.transcript_writer import TranscriptWriteBehind
+    from services.audio.transcript_hub import CLOSE_SLOW_CONSUMER, get_transcript_hub
     from services.audio.post_recording import get_post_recording_service
-    from services.storage import StorageService
+    from services.storage import LocalStorageBackend, StorageService
 
 db = DatabaseManager()
 rbac = RBAC(db)
@@ -49,6 +115,34 @@ logger = logging.getLogger(__name__)
 # Track active streaming sessions
 streaming_managers = {}
 active_connections = {}
+transcript_writers = {}  # session_id -> TranscriptWriteBehind
+session_leases = {}  # session_id -> SessionLease held by this worker
+
+
+def _session_snapshot(session_id, meeting_id, user_email, recorder=None):
+    """What another worker needs to resume this session (see session_store.py)."""
+    mgr = streaming_managers.get(session_id)
+    if mgr is None:
+        return None
+    recorder = recorder or active_recorders.get(meeting_id or session_id)
+    return {
+        "meeting_id": meeting_id,
+        "user_email": user_email,
+        "manager": mgr.snapshot_state(),
+        "recorder": recorder.snapshot() if recorder else None,
+    }
+
+
+async def _session_resumed(session_id: str, recorder_key: str) -> bool:
+    """Whether a newer connection picked the session up (on any worker)."""
+    if recorder_key in active_recorders:
+        return True
+    try:
+        return await get_session_store().lease_owner(session_id) is not None
+    except Exception as e:
+        # Finalizing under a live session can delete its chunks; leave it
+        logger.warning(f"[Streaming] Could not check whether {session_id} resumed: {e}")
+        return True
 
 
 @router.websocket("/ws/streaming-audio")
@@ -57,27 +151,110 @@ async def websocket_streaming_audio(
     session_id: Optional[str] = None,
     user_email: Optional[str] = None,
     meeting_id: Optional[str] = None,
+    queue_policy: Optional[str] = None,
+    codecs: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
 ):
     """
     Real-time streaming transcription with Groq Whisper Large v3.
     Includes heartbeat and force-flush on disconnect.
+
+    queue_policy selects what happens when transcription falls behind:
+    'block', 'coalesce' or 'drop_oldest' (default: AUDIO_QUEUE_POLICY);
+    other values are rejected with UNSUPPORTED_QUEUE_POLICY.
+    Recording always receives every chunk.
+
+    codecs lists the audio codecs the client can send, in preference order
+    (e.g. "opus,flac"). The chosen one is returned as `codec` in the
+    `connected` message; without it the legacy raw PCM protocol is used
+    (see services/audio/codecs.py for the frame formats).
+
+    sample_rate/channels declare the client's audio format (default 16kHz
+    mono). Other formats are resampled and downmixed server-side.
     """
     await websocket.accept()
 
+    # Client audio format (legacy clients send 16kHz mono)
+    input_rate = sample_rate or TARGET_SAMPLE_RATE
+    input_channels = channels or TARGET_CHANNELS
+    if not (
+        MIN_INPUT_RATE <= input_rate <= MAX_INPUT_RATE
+        and 1 <= input_channels <= MAX_INPUT_CHANNELS
+    ):
+        await websocket.send_json(
+            {
+                "type": "error",
+                "code": "UNSUPPORTED_AUDIO_FORMAT",
+                "message": f"Unsupported audio format: {input_rate}Hz, {input_channels} channel(s). "
+                f"Supported: {MIN_INPUT_RATE}-{MAX_INPUT_RATE}Hz, 1-{MAX_INPUT_CHANNELS} channels.",
+            }
+        )
+        await websocket.close()
+        return
+
+    # Transcription overload policy (recording is unaffected either way)
+    queue_policy = (queue_policy or AUDIO_QUEUE_POLICY).strip().lower()
+    if queue_policy not in QUEUE_POLICIES:
+        await websocket.send_json(
+            {
+                "type": "error",
+                "code": "UNSUPPORTED_QUEUE_POLICY",
+                "message": f"Unsupported queue_policy '{queue_policy}'. "
+                f"Supported: {', '.join(QUEUE_POLICIES)}.",
+            }
+        )
+        await websocket.close()
+        return
+
     # Initialize manager to avoid unbound errors
     manager = None
 
     # Check if resuming session
     is_resume = False
+    session_state = None  # Snapshot left by an earlier connection (any worker)
     if session_id and session_id in streaming_managers:
         manager = streaming_managers[session_id]
         is_resume = True
         logger.info(f"[Streaming] 🔄 Resuming session {session_id}")
     else:
-        # Create new session
+        # Create new session, or rebuild one this worker does not hold
+        resuming_remote = bool(session_id)
         session_id = str(uuid.uuid4()) if not session_id else session_id
         is_resume = False
 
+        lease = SessionLease(get_session_store(), session_id)
+        try:
+            acquired = await lease.acquire()
+        except SessionStoreUnavailable:
+            await websocket.send_json(
+                {
+                    "type": "error",
+                    "code": "SESSION_STORE_UNAVAILABLE",
+                    "message": "Session service is temporarily unavailable. Try again shortly.",
+                }
+            )
+            await websocket.close()
+            return
+        if not acquired:
+            await websocket.send_json(
+                {
+                    "type": "error",
+                    "code": "SESSION_LOCKED",
+                    "message": "Session is still active on another connection. Try again shortly.",
+                }
+            )
+            await websocket.close()
+            return
+        session_leases[session_id] = lease
+
+        if resuming_remote:
+            session_state = await lease.load()
+        if session_state:
+            meeting_id = meeting_id or session_state.get("meeting_id")
+            user_email = user_email or session_state.get("user_email")
+            logger.info(f"[Streaming] 🔄 Restoring session {session_id} from session store")
+
     # Audio recorder setup
     audio_recorder = None
     enable_recording = os.getenv("ENABLE_AUDIO_RECORDING", "true").lower() == "true"
@@ -92,7 +269,10 @@ async def websocket_streaming_audio(
             logger.info(
                 f"[Streaming] Attempting to start recorder for key: {recorder_key}"
             )
-            audio_recorder = await get_or_create_recorder(recorder_key)
+            audio_recorder = await get_or_create_recorder(
+                recorder_key,
+                resume_state=session_state.get("recorder") if session_state else None,
+            )
             if audio_recorder:
                 logger.info(
                     f"[Streaming] 🎙️ Audio recording active using key: {recorder_key}"
@@ -122,6 +302,9 @@ async def websocket_streaming_audio(
                     }
                 )
                 await websocket.close()
+                lease = session_leases.pop(session_id, None)
+                if lease:
+                    await lease.release()
                 return
 
             # Ensure meeting exists in DB for RBAC visibility
@@ -141,8 +324,24 @@ async def websocket_streaming_audio(
             except Exception as e:
                 logger.error(f"[Streaming] Failed to create meeting record: {e}")
 
-            manager = StreamingTranscriptionManager(groq_api_key)
+            manager = await StreamingTranscriptionManager.create(
+                groq_api_key, session_id=session_id
+            )
+            if session_state and session_state.get("manager"):
+                manager.restore_state(session_state["manager"])
             streaming_managers[session_id] = manager
+            # Keep the lease and a resumable snapshot fresh in the session store
+            session_leases[session_id].start(
+                lambda: _session_snapshot(session_id, meeting_id, user_email)
+            )
+            # Persist finals as they happen (flushed in batches, and on disconnect)
+            transcript_writers[session_id] = TranscriptWriteBehind(
+                db, meeting_id or session_id
+            )
+            # Live viewers subscribe by meeting_id or session_id
+            get_transcript_hub().open_topic(
+                meeting_id or session_id, aliases=[session_id], producer=session_id
+            )
             logger.info(f"[Streaming] ✅ Session {session_id} started (HYBRID mode)")
 
     # Register active connection
@@ -167,6 +366,36 @@ async def websocket_streaming_audio(
 
     monitor_task = asyncio.create_task(heartbeat_monitor())
 
+    # Another worker took the session over (see SessionLease.lost_event):
+    # stop here, without finalizing, so both don't record the same chunks
+    session_moved = False
+    session_lease = session_leases.get(session_id)
+
+    async def lease_monitor():
+        nonlocal session_moved
+        await session_lease.lost_event.wait()
+        session_moved = True
+        logger.warning(f"[Streaming] Session {session_id} moved to another worker, closing")
+        try:
+            await websocket.send_json(
+                {
+                    "type": "error",
+                    "code": "SESSION_MOVED",
+                    "message": "Session continued on another connection.",
+                }
+            )
+            await websocket.close()
+        except Exception:
+            pass
+
+    lease_task = asyncio.create_task(lease_monitor()) if session_lease else None
+
+    # Audio transport codec (negotiated via the connected handshake)
+    codec = negotiate_codec(codecs)
+    decoder = StreamDecoder(codec, input_rate, input_channels)
+    # Resample/downmix decoded audio to 16kHz mono ahead of VAD
+    converter = AudioFormatConverter(*decoder.output_format)
+
     # Send connection confirmation
     await websocket.send_json(
         {
@@ -174,25 +403,37 @@ async def websocket_streaming_audio(
             "session_id": session_id,
             "message": "Groq streaming ready (HYBRID mode)",
             "timestamp": datetime.utcnow().isoformat(),
+            "codec": codec,
+            "codecs_supported": available_codecs(),
+            "sample_rate": input_rate,
+            "channels": input_channels,
         }
     )
 
+    # Fan-out to /ws/transcript-subscribe viewers
+    live_topic = get_transcript_hub().get_topic(session_id)
+
     # Define callbacks
     async def on_partial(data):
+        partial = {
+            "type": "partial",
+            "text": data["text"],
+            "confidence": data["confidence"],
+            "is_stable": data.get("is_stable", False),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        if live_topic:
+            live_topic.publish(partial)
         try:
-            await websocket.send_json(
-                {
-                    "type": "partial",
-                    "text": data["text"],
-                    "confidence": data["confidence"],
-                    "is_stable": data.get("is_stable", False),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
+            await websocket.send_json(partial)
         except Exception:
             pass
 
+    transcript_writer = transcript_writers.get(session_id)
+
     async def on_final(data):
+        if transcript_writer:
+            transcript_writer.add(data)
         try:
             response = {
                 "type": "final",
@@ -207,6 +448,8 @@ async def websocket_streaming_audio(
             if data.get("original_text"):
                 response["original_text"] = data["original_text"]
                 response["translated"] = data.get("translated", False)
+            if live_topic:
+                live_topic.publish(response, replay=True)
             await websocket.send_json(response)
         except Exception:
             pass
@@ -225,22 +468,21 @@ async def websocket_streaming_audio(
         except Exception:
             pass
 
-    # Audio Queue
-    audio_queue = asyncio.Queue()
+    # Audio Queue (bounded, see services/audio/ingest_queue.py)
+    audio_queue = AudioIngestQueue(policy=queue_policy)
+    if manager:
+        manager.ingest_queue = audio_queue
+        manager.stream_decoder = decoder
+        audio_queue.latency = manager.latency
 
     async def audio_worker():
         try:
             while True:
                 item = await audio_queue.get()
-                if item is None:
-                    audio_queue.task_done()
+                if item is None or session_moved:
                     break
 
-                if isinstance(item, tuple):
-                    chunk, ts = item
-                else:
-                    chunk = item
-                    ts = None
+                chunk, ts, received_at = item
 
                 try:
                     # Ensure manager is available
@@ -252,11 +494,10 @@ async def websocket_streaming_audio(
                             on_partial=on_partial,
                             on_final=on_final,
                             on_error=on_error,
+                            received_at=received_at,
                         )
                 except Exception as e:
                     logger.error(f"[Streaming] Worker transcription error: {e}")
-
-                audio_queue.task_done()
         except Exception as e:
             logger.error(f"[Streaming] Audio worker crashed: {e}")
 
@@ -274,17 +515,27 @@ async def websocket_streaming_audio(
                 )
                 break
 
+            if session_moved:
+                break
+
             if "text" in message:
                 try:
                     data = json.loads(message["text"])
                     if data.get("type") == "ping":
                         last_heartbeat = time.time()
-                        await websocket.send_json({"type": "pong"})
+                        await websocket.send_json(
+                            {
+                                "type": "pong",
+                                "queue_depth": audio_queue.qsize(),
+                                "dropped_chunks": audio_queue.dropped_chunks,
+                            }
+                        )
                         continue
                 except:
                     pass
 
             if "bytes" in message:
+                received_at = time.monotonic()
                 message_bytes = message["bytes"]
                 timestamp = None
                 audio_chunk = message_bytes
@@ -297,21 +548,58 @@ async def websocket_streaming_audio(
                     except:
                         audio_chunk = message_bytes
 
+                if decoder.codec != CODEC_PCM:
+                    try:
+                        audio_chunk = await decoder.decode(audio_chunk)
+                    except Exception as e:
+                        logger.warning(
+                            f"[Streaming] Dropping undecodable {decoder.codec} frame: {e}"
+                        )
+                        continue
+
+                if not converter.is_passthrough:
+                    audio_chunk = converter.convert(audio_chunk)
+
                 if audio_recorder:
-                    await audio_recorder.add_chunk(audio_chunk)
+                    # Only buffers; chunks are persisted by the recorder's worker
+                    audio_recorder.add_chunk(audio_chunk)
 
-                await audio_queue.put((audio_chunk, timestamp))
+                await audio_queue.put(audio_chunk, timestamp, received_at)
+                if manager:
+                    manager.latency.observe("receive", time.monotonic() - received_at)
 
     except WebSocketDisconnect:
         logger.info(f"[Streaming] Session {session_id} disconnected by client")
     except Exception as e:
-        logger.error(f"[Streaming] Error in receiver loop {session_id}: {e}")
+        if session_moved:
+            logger.info(f"[Streaming] Session {session_id} receiver stopped after move")
+        else:
+            logger.error(f"[Streaming] Error in receiver loop {session_id}: {e}")
 
     finally:
         monitor_task.cancel()
+        if lease_task:
+            lease_task.cancel()
+
+        # Drain queued audio into the manager before flushing (the new
+        # owner transcribes it instead if the session moved)
+        audio_queue.close()
+        if session_moved:
+            worker_task.cancel()
+        try:
+            await asyncio.wait_for(worker_task, timeout=5.0)
+        except:
+            pass
+
+        if session_moved and audio_recorder:
+            # Chunks from the last snapshot the new owner loaded on are its own
+            last_saved = session_lease.last_saved or {}
+            audio_recorder.abandon(
+                keep_below=(last_saved.get("recorder") or {}).get("chunk_index", 0)
+            )
 
         # Force flush on disconnect
-        if session_id in streaming_managers:
+        if session_id in streaming_managers and not session_moved:
             try:
                 mgr = streaming_managers[session_id]
                 flush_result = await mgr.force_flush()
@@ -320,70 +608,210 @@ async def websocket_streaming_audio(
                         await on_final(flush_result)
                     except:
                         pass
-
-                    # Also explicitly save this flush segment to DB
-                    if meeting_id:
-                        try:
-                            async with db._get_connection() as conn:
-                                await conn.execute(
-                                    """
-                                    INSERT INTO transcript_segments (
-                                        meeting_id, transcript, timestamp, source, alignment_state, audio_start_time
-                                    ) VALUES ($1, $2, $3, 'live', 'CONFIDENT', $4)
-                                """,
-                                    meeting_id,
-                                    flush_result["text"],
-                                    datetime.utcnow(),
-                                    mgr.speech_start_time,
-                                )
-                        except Exception as db_e:
-                            logger.error(f"Failed to save flush segment to DB: {db_e}")
-
             except Exception as e:
                 logger.error(f"Force flush failed: {e}")
 
-        # Cleanup queues and workers
-        await audio_queue.put(None)
-        try:
-            await asyncio.wait_for(worker_task, timeout=5.0)
-        except:
-            pass
-
-        # Recorder cleanup
-        if audio_recorder:
-            try:
-                recorder_key = meeting_id or session_id
-                await stop_recorder(recorder_key)
-                try:
-                    post_service = get_post_recording_service()
-                    asyncio.create_task(
-                        post_service.finalize_recording(
-                            recorder_key,
-                            trigger_diarization=False,
-                            user_email=user_email,
-                        )
-                    )
-                    logger.info(
-                        f"[Streaming] Scheduled post-recording processing for {recorder_key}"
-                    )
-                except Exception as post_e:
-                    logger.warning(
-                        f"[Streaming] Post-recording service unavailable: {post_e}"
-                    )
-            except:
-                pass
+        # Write buffered finals (including the flush segment) now
+        if transcript_writer:
+            await transcript_writer.flush()
+
+        # Seal the recorder: the handoff snapshot below gets its final chunk
+        # numbering, and the slow drain waits until the lease is released.
+        # Another connection to the session on this worker keeps recording.
+        last_connection = active_connections.get(session_id, 0) <= 1
+        sealed_recorder = (
+            seal_recorder(meeting_id or session_id)
+            if audio_recorder and last_connection
+            else None
+        )
 
         # Connection tracking cleanup
         if session_id in active_connections:
             active_connections[session_id] -= 1
             if active_connections[session_id] <= 0:
+                # Hand the session off: final snapshot, then release the lease
+                lease = session_leases.pop(session_id, None)
+                if lease and not session_moved:
+                    await lease.release(
+                        _session_snapshot(session_id, meeting_id, user_email, audio_recorder)
+                    )
+                elif lease:
+                    await lease.release()
                 if session_id in streaming_managers:
                     # Clean up the manager instance
                     mgr = streaming_managers[session_id]
                     mgr.cleanup()
                     del streaming_managers[session_id]
+                writer = transcript_writers.pop(session_id, None)
+                if writer:
+                    await writer.close()
+                get_transcript_hub().close_topic(session_id, producer=session_id)
                 del active_connections[session_id]
 
+        # Recorder cleanup
+        if sealed_recorder:
+            try:
+                recorder_key = meeting_id or session_id
+                # Only the last owner writes metadata.json
+                recording_metadata = await sealed_recorder.stop(write_metadata=False)
+                if session_moved or await _session_resumed(session_id, recorder_key):
+                    # The last connection finalizes the recording
+                    logger.info(
+                        f"[Streaming] Left post-recording processing of {recorder_key} to the new owner"
+                    )
+                else:
+                    if "chunks" in recording_metadata:
+                        await sealed_recorder.write_metadata(recording_metadata)
+                    try:
+                        post_service = get_post_recording_service()
+                        asyncio.create_task(
+                            post_service.finalize_recording(
+                                recorder_key,
+                                trigger_diarization=False,
+                                user_email=user_email,
+                            )
+                        )
+                        logger.info(
+                            f"[Streaming] Scheduled post-recording processing for {recorder_key}"
+                        )
+                    except Exception as post_e:
+                        logger.warning(
+                            f"[Streaming] Post-recording service unavailable: {post_e}"
+                        )
+            except:
+                pass
+
+
+@router.websocket("/ws/transcript-subscribe")
+async def websocket_transcript_subscribe(
+    websocket: WebSocket,
+    token: str,
+    meeting_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+):
+    """
+    Read-only live transcript of a streaming session, for other viewers.
+
+    Sends the last finals of the session (replay), then every partial and
+    final as the producer receives them, and `session_ended` when it stops.
+    A viewer that cannot keep up is disconnected with SLOW_CONSUMER and
+    may reconnect. token is the Google ID token (websockets cannot send
+    the Authorization header); the user needs view access to the meeting.
+    """
+    await websocket.accept()
+
+    async def reject(code: str, message: str):
+        await websocket.send_json({"type": "error", "code": code, "message": message})
+        await websocket.close()
+
+    try:
+        user = await authenticate_token(token)
+    except HTTPException as e:
+        await reject("UNAUTHORIZED", str(e.detail))
+        return
+
+    hub = get_transcript_hub()
+    topic = hub.get_topic(meeting_id or session_id)
+    if not topic:
+        await reject("SESSION_NOT_FOUND", "No live transcription for this meeting")
+        return
+    if not await rbac.can(user, "view", topic.key):
+        await reject("FORBIDDEN", "You do not have access to this meeting")
+        return
+
+    subscriber = topic.subscribe()
+    await websocket.send_json(
+        {
+            "type": "subscribed",
+            "meeting_id": topic.key,
+            "replay": len(topic.history),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    )
+    logger.info(f"[Subscribe] 👀 {user.email} watching {topic.key}")
+
+    async def sender():
+        while True:
+            message = await subscriber.get()
+            if message is None:
+                break
+            await websocket.send_text(message)
+
+    async def receiver():
+        # Only pings are expected; returns when the client goes away
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("text") and '"ping"' in message["text"]:
+                await websocket.send_json({"type": "pong"})
+
+    tasks = [asyncio.create_task(sender()), asyncio.create_task(receiver())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        topic.unsubscribe(subscriber)
+
+    if subscriber.close_reason == CLOSE_SLOW_CONSUMER:
+        try:
+            await reject("SLOW_CONSUMER", "Transcript viewer fell behind; reconnect to resume")
+        except Exception:
+            pass
+    elif subscriber.close_reason:
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+@router.get("/streaming/metrics")
+async def get_streaming_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Live transcription metrics: scheduler queue depth, wait times and
+    rate-limit state per API key (keys are reported as fingerprints),
+    plus VAD pool usage, live transcript viewers and session leases,
+    per-stage pipeline latency (see services/audio/latency.py), each
+    session's codec decoder and each active recorder's upload backlog.
+    """
+    return {
+        "active_sessions": len(streaming_managers),
+        "scheduler": get_transcription_scheduler().get_metrics(),
+        "vad_pool": get_vad_pool().get_stats(),
+        "transcript_hub": get_transcript_hub().get_stats(),
+        "latency": get_pipeline_latency().summary(),
+        "decoders": {
+            session_id: mgr.stream_decoder.get_stats()
+            for session_id, mgr in streaming_managers.items()
+            if mgr.stream_decoder
+        },
+        "session_store": {
+            "backend": get_session_store().backend,
+            "leases_held": len(session_leases),
+        },
+        "recorders": {
+            key: recorder.get_upload_stats() for key, recorder in active_recorders.items()
+        },
+    }
+
+
+@router.get("/streaming/latency")
+async def get_streaming_latency(
+    session_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Raw latency histograms (bucket counts per stage and trigger reason),
+    process-wide or for one active session.
+    """
+    if session_id:
+        mgr = streaming_managers.get(session_id)
+        if not mgr:
+            raise HTTPException(status_code=404, detail="Session not active on this worker")
+        return mgr.latency.histograms()
+    return get_pipeline_latency().histograms()
+
 
 import tempfile
 import shutil
@@ -484,31 +912,17 @@ async def get_meeting_recording_url(
     try:
         recording_path = f"{meeting_id}/recording.wav"
 
-        # We need STORAGE_TYPE. It's likely in storage.py or env.
-        # Assuming it's in env.
-        STORAGE_TYPE = os.getenv("STORAGE_TYPE", "local").lower()
-
-        # 1. Primary Check
         exists = await StorageService.check_file_exists(recording_path)
 
-        # 2. Fallback: If GCP missing, check Local
-        if not exists and STORAGE_TYPE == "gcp":
-            exists_local = await StorageService._check_local_exists(recording_path)
-            if exists_local:
+        # Fallback: recordings made before switching to an object store are
+        # still on local disk
+        if not exists and not StorageService.is_local():
+            if await LocalStorageBackend().exists(recording_path):
                 return {
                     "url": f"/audio/{meeting_id}/recording.wav",
                     "expiration": 3600,
                 }
 
-        # 3. Fallback: If Local missing, check GCP
-        if not exists and STORAGE_TYPE != "gcp":
-            exists_gcp = await StorageService._check_gcp_exists(recording_path)
-            if exists_gcp:
-                url = await StorageService._generate_gcp_signed_url(
-                    recording_path, 3600
-                )
-                return {"url": url, "expiration": 3600}
-
         if not exists:
             raise HTTPException(status_code=404, detail="Recording not found")
 
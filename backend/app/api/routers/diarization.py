@@ -3,7 +3,6 @@ from fastapi.responses import JSONResponse
 import logging
 import json
 from datetime import datetime
-from pathlib import Path
 import os
 
 try:
@@ -21,7 +20,7 @@ try:
         get_diarization_service,
         DiarizationService,
     )
-    from ...services.audio.recorder import AudioRecorder
+    from ...services.audio.audio_source import open_meeting_audio
     from ...services.storage import StorageService
 except (ImportError, ValueError):
     from api.deps import get_current_user
@@ -35,7 +34,7 @@ except (ImportError, ValueError):
     from db import DatabaseManager
     from core.rbac import RBAC
     from services.audio.diarization import get_diarization_service, DiarizationService
-    from services.audio.recorder import AudioRecorder
+    from services.audio.audio_source import open_meeting_audio
     from services.storage import StorageService
 
 # Initialize
@@ -50,6 +49,7 @@ async def run_diarization_job(meeting_id: str, provider: str, user_email: str):
     """
     Background job that runs speaker diarization.
     """
+    audio = None
     try:
         logger.info(
             f"🎯 Starting Gold Standard Diarization job for meeting {meeting_id}"
@@ -57,50 +57,26 @@ async def run_diarization_job(meeting_id: str, provider: str, user_email: str):
 
         diarization_service = get_diarization_service()
         storage_path = os.getenv("RECORDINGS_STORAGE_PATH", "./data/recordings")
-        storage_type = os.getenv("STORAGE_TYPE", "local").lower()
 
-        # 1. Get Audio URL (GCS) or local bytes
+        # 1. Get Audio URL (object storage) and the recording, memory-mapped
+        # (object storage: spooled to the local audio cache first)
         audio_url = None
-        audio_data = None
 
-        if storage_type == "gcp":
-            logger.info(f"☁️ Using GCS audio for {meeting_id}")
-            audio_url = await StorageService.generate_signed_url(
-                f"{meeting_id}/recording.wav", 3600
-            )
-            if not audio_url:
+        if not StorageService.is_local():
+            logger.info(f"☁️ Using stored audio for {meeting_id}")
+            wav_path = f"{meeting_id}/recording.wav"
+            if not await StorageService.check_file_exists(wav_path):
                 raise ValueError(
-                    f"Recording WAV not found in GCS for meeting {meeting_id}. "
+                    f"Recording WAV not found in storage for meeting {meeting_id}. "
                     "Check that PCM chunks uploaded and merge service is configured."
                 )
+            # None on backends without public URLs; providers upload the audio
+            audio_url = await StorageService.generate_signed_url(wav_path, 3600)
 
-            # Groq high-fidelity transcription still needs bytes
-            audio_data = await StorageService.download_bytes(
-                f"{meeting_id}/recording.wav"
-            )
-            if not audio_data:
-                raise ValueError(
-                    f"Failed to download audio bytes from GCS for {meeting_id}"
-                )
-        else:
-            # Local mode fallback
-            recording_dir = Path(storage_path) / meeting_id
-            recording_dir.mkdir(parents=True, exist_ok=True)
-            merged_wav = recording_dir / "merged_recording.wav"
-
-            if merged_wav.exists():
-                import aiofiles
-
-                async with aiofiles.open(merged_wav, "rb") as af:
-                    audio_data = await af.read()
-            else:
-                logger.info(f"🧩 Merging live audio chunks for {meeting_id}")
-                audio_data = await AudioRecorder.merge_chunks(meeting_id, storage_path)
-
-            if not audio_data:
-                raise ValueError(
-                    f"No audio data found for meeting {meeting_id} (Local)"
-                )
+        # Groq high-fidelity transcription still needs the audio itself
+        audio = await open_meeting_audio(meeting_id, storage_path)
+        if not audio:
+            raise ValueError(f"No audio data found for meeting {meeting_id}")
 
         # CHECK CANCELLATION
         async with db._get_connection() as conn:
@@ -130,7 +106,9 @@ async def run_diarization_job(meeting_id: str, provider: str, user_email: str):
         # Step A: High-fidelity Whisper (The Words) via Groq
         # This provides the accurate text baseline that we map speaker labels onto
         logger.info(f"💎 Running High-Fidelity Groq Whisper for {meeting_id}...")
-        whisper_segments = await diarization_service.transcribe_with_whisper(audio_data)
+        whisper_segments = await diarization_service.transcribe_with_whisper(
+            audio, meeting_id=meeting_id
+        )
 
         # CHECK CANCELLATION
         async with db._get_connection() as conn:
@@ -149,7 +127,7 @@ async def run_diarization_job(meeting_id: str, provider: str, user_email: str):
             meeting_id=meeting_id,
             storage_path=storage_path,
             provider=provider,
-            audio_data=audio_data,
+            audio=audio,
             audio_url=audio_url,
             user_email=user_email,
         )
@@ -271,6 +249,9 @@ async def run_diarization_job(meeting_id: str, provider: str, user_email: str):
                 )
         except Exception as db_err:
             logger.error(f"Failed to update job status after error: {db_err}")
+    finally:
+        if audio is not None:
+            audio.close()
 
 
 @router.post("/meetings/{meeting_id}/diarize")
@@ -851,7 +851,13 @@ async def save_transcript(
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
 ):
-    """Save transcript segments manually (from frontend)"""
+    """
+    Save transcript segments from the frontend.
+
+    Live sessions already persist finals as they happen (write-behind), so
+    this is an idempotent reconcile: segments already stored are skipped
+    and only missing ones are inserted.
+    """
     meeting_id = data.session_id or str(uuid.uuid4())
 
     try:
@@ -868,7 +874,7 @@ async def save_transcript(
                 owner_id=current_user.email,
             )
 
-        # Save segments (batch)
+        # Reconcile segments (batch; already stored ones are skipped)
         await db.save_meeting_transcripts_batch(meeting_id, data.transcripts)
 
         # CRITICAL FIX: Ensure audio folder matches meeting_id
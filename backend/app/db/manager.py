@@ -385,41 +385,79 @@ class DatabaseManager:
             logger.error(f"Error saving transcript: {str(e)}")
             raise
 
-    async def save_meeting_transcripts_batch(self, meeting_id: str, transcripts: list):
-        """Batch save transcripts for a meeting"""
+    async def save_meeting_transcripts_batch(
+        self, meeting_id: str, transcripts: list, source: str = "web_client"
+    ):
+        """
+        Batch save transcripts for a meeting.
+
+        Idempotent: segments already stored for the meeting (same text and
+        audio start time, from any source) are skipped, so the live
+        write-behind and /save-transcript can both submit the same segments.
+        Batches for one meeting are serialized with an advisory lock.
+        """
         if not transcripts:
             return True
 
         try:
             async with self._get_connection() as conn:
-                # Prepare data for executemany
-                data = [
-                    (
+                async with conn.transaction():
+                    await conn.execute(
+                        "SELECT pg_advisory_xact_lock(hashtext($1))", meeting_id
+                    )
+
+                    # Only rows whose text matches can be duplicates
+                    existing = await conn.fetch(
+                        """
+                        SELECT transcript, audio_start_time FROM transcript_segments
+                        WHERE meeting_id = $1 AND transcript = ANY($2::text[])
+                        """,
                         meeting_id,
-                        t.text,
-                        t.timestamp,
-                        "",  # summary
-                        "",  # action_items
-                        "",  # key_points
-                        t.audio_start_time,
-                        t.audio_end_time,
-                        t.duration,
-                        "web_client",  # source
-                        None,  # speaker
-                        None,  # speaker_confidence
+                        list({t.text for t in transcripts}),
                     )
-                    for t in transcripts
-                ]
+                    stored = {
+                        (row["transcript"], round(row["audio_start_time"] or 0.0, 3))
+                        for row in existing
+                    }
 
-                await conn.executemany(
-                    """
-                    INSERT INTO transcript_segments (
-                        meeting_id, transcript, timestamp, summary, action_items, key_points,
-                        audio_start_time, audio_end_time, duration, source, speaker, speaker_confidence
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                    """,
-                    data,
-                )
+                    # Prepare data for executemany
+                    data = []
+                    for t in transcripts:
+                        key = (t.text, round(t.audio_start_time or 0.0, 3))
+                        if key in stored:
+                            continue
+                        stored.add(key)
+                        data.append(
+                            (
+                                meeting_id,
+                                t.text,
+                                t.timestamp,
+                                "",  # summary
+                                "",  # action_items
+                                "",  # key_points
+                                t.audio_start_time,
+                                t.audio_end_time,
+                                t.duration,
+                                source,
+                                None,  # speaker
+                                None,  # speaker_confidence
+                            )
+                        )
+
+                    if data:
+                        await conn.executemany(
+                            """
+                            INSERT INTO transcript_segments (
+                                meeting_id, transcript, timestamp, summary, action_items, key_points,
+                                audio_start_time, audio_end_time, duration, source, speaker, speaker_confidence
+                            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                            """,
+                            data,
+                        )
+                    logger.debug(
+                        f"Saved {len(data)}/{len(transcripts)} transcript segments for {meeting_id} "
+                        f"({len(transcripts) - len(data)} already stored)"
+                    )
                 return True
         except Exception as e:
             logger.error(f"Error batch saving transcripts: {str(e)}")
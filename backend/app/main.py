@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from fastapi import FastAPI
@@ -73,6 +74,36 @@ app.include_router(admin.router, tags=["Admin"])
 app.include_router(feedback.router, prefix="/feedback", tags=["Feedback"])
 
 
+@app.on_event("startup")
+async def warm_vad_pool():
+    """Load VAD models before the first websocket connects."""
+    try:
+        from app.services.audio.vad_pool import get_vad_pool
+    except ImportError:
+        from services.audio.vad_pool import get_vad_pool
+
+    try:
+        await asyncio.to_thread(get_vad_pool().warm)
+    except Exception as e:
+        logger.error(f"❌ VAD pool warm-up failed: {e}")
+
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    try:
+        from app.services.audio.groq_client import close_groq_client_pool
+        from app.services.audio.scheduler import close_transcription_scheduler
+        from app.services.audio.session_store import close_session_store
+    except ImportError:
+        from services.audio.groq_client import close_groq_client_pool
+        from services.audio.scheduler import close_transcription_scheduler
+        from services.audio.session_store import close_session_store
+
+    await close_transcription_scheduler()
+    await close_groq_client_pool()
+    await close_session_store()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "version": "1.0.0"}
@@ -0,0 +1,350 @@
+"""
+Memory-mapped recordings for post-meeting processing.
+
+Post-meeting jobs (gold transcription, diarization, file imports) used to
+read the whole merged PCM or WAV into bytes first - ~350 MB per job for a
+3-hour meeting, twice that once it was wrapped in a WAV for upload.
+AudioSource memory-maps the file instead:
+
+- samples() / pcm() are zero-copy NumPy / memoryview views of the mapping
+- every view and stream takes an optional (start, end) time range in seconds
+- wav_body() streams a WAV request body a block at a time, and wav_file()
+  is a seekable file object for multipart uploads
+
+Mapped pages live in the OS page cache, so concurrent jobs on the same
+meeting share one copy and the kernel can drop it under memory pressure.
+
+open_meeting_audio() finds a meeting's recording. Recordings in object
+storage are spooled once into AUDIO_CACHE_PATH and mapped from there; the
+cache is trimmed to AUDIO_CACHE_MAX_BYTES, least recently used first.
+"""
+
+import asyncio
+import io
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .wav_merge import WAV_HEADER_BYTES, merge_to_wav_file, wav_header
+    from ..storage import StorageService
+except (ImportError, ValueError):
+    from services.audio.wav_merge import WAV_HEADER_BYTES, merge_to_wav_file, wav_header
+    from services.storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CACHE_PATH = os.getenv("AUDIO_CACHE_PATH", "./data/audio_cache")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(4 * 1024 * 1024 * 1024)))
+AUDIO_STREAM_BLOCK_BYTES = int(os.getenv("AUDIO_STREAM_BLOCK_BYTES", str(1024 * 1024)))
+
+# One spool per cached object at a time
+_spool_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _parse_wav(data) -> Tuple[int, int, int, int]:
+    """(sample_rate, channels, data_offset, data_bytes) of a 16-bit PCM WAV."""
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, offset)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", data, body)
+        elif chunk_id == b"data":
+            if fmt is None:
+                break
+            audio_format, channels, sample_rate, _, _, bits = fmt
+            # 0xFFFE: WAVE_FORMAT_EXTENSIBLE (ffmpeg writes it for some inputs)
+            if audio_format not in (1, 0xFFFE) or bits != 16:
+                raise ValueError(f"Unsupported WAV encoding (format {audio_format}, {bits}-bit)")
+            # Streamed WAVs may carry a 0 / 0xFFFFFFFF placeholder length
+            available = len(data) - body
+            if size == 0 or size > available:
+                size = available
+            return sample_rate, channels, body, size
+        offset = body + size + (size & 1)
+    raise ValueError("WAV file has no fmt/data chunk")
+
+
+class _WavReader(io.RawIOBase):
+    """Seekable file object over a WAV header followed by a PCM memoryview."""
+
+    def __init__(self, header: bytes, pcm: memoryview):
+        self._header = header
+        self._pcm = pcm
+        self._size = len(header) + len(pcm)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        out = memoryview(buffer).cast("B")
+        header_bytes = len(self._header)
+        written = 0
+        if self._pos < header_bytes:
+            part = self._header[self._pos : self._pos + len(out)]
+            out[: len(part)] = part
+            written = len(part)
+        start = max(self._pos - header_bytes, 0)
+        part = self._pcm[start : start + len(out) - written]
+        out[written : written + len(part)] = part
+        written += len(part)
+        self._pos += written
+        return written
+
+
+class AudioSource:
+    """
+    16-bit PCM audio in a local file (raw PCM or WAV), memory-mapped.
+
+    Raw PCM is taken to be 16kHz mono s16le, like the recorder writes.
+    len() is the number of PCM bytes, like the bytes it stands in for.
+    """
+
+    def __init__(self, path: Union[str, Path], sample_rate: int = 16000, channels: int = 1):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # Zero-length files cannot be mapped
+        self._mmap = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        )
+
+        self.is_wav = size >= 12 and self._mmap[:4] == b"RIFF" and self._mmap[8:12] == b"WAVE"
+        if self.is_wav:
+            sample_rate, channels, self.data_offset, data_bytes = _parse_wav(self._mmap)
+        else:
+            self.data_offset, data_bytes = 0, size
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_bytes = 2 * channels
+        self.data_bytes = data_bytes - data_bytes % self.frame_bytes
+
+        if size and hasattr(self._mmap, "madvise"):
+            # Jobs mostly read front to back
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __len__(self) -> int:
+        return self.data_bytes
+
+    def __enter__(self) -> "AudioSource":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def num_frames(self) -> int:
+        return self.data_bytes // self.frame_bytes
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.num_frames / self.sample_rate
+
+    def _byte_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """File offsets of the whole frames between start and end seconds."""
+        first = 0 if start is None else int(round(start * self.sample_rate))
+        last = self.num_frames if end is None else int(round(end * self.sample_rate))
+        first = min(max(first, 0), self.num_frames)
+        last = min(max(last, first), self.num_frames)
+        return (
+            self.data_offset + first * self.frame_bytes,
+            self.data_offset + last * self.frame_bytes,
+        )
+
+    def pcm(self, start: Optional[float] = None, end: Optional[float] = None) -> memoryview:
+        """Raw PCM between start and end seconds (a view of the mapping)."""
+        begin, stop = self._byte_range(start, end)
+        return memoryview(self._mmap)[begin:stop]
+
+    def samples(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """
+        Read-only int16 samples between start and end seconds, shaped
+        (frames,) for mono or (frames, channels). No copy is made.
+        """
+        begin, stop = self._byte_range(start, end)
+        if stop == begin:
+            view = np.zeros(0, dtype="<i2")
+        else:
+            view = np.frombuffer(self._mmap, dtype="<i2", count=(stop - begin) // 2, offset=begin)
+        return view if self.channels == 1 else view.reshape(-1, self.channels)
+
+    def wav_size(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Length of the WAV body wav_body()/wav_file() produce for the range."""
+        begin, stop = self._byte_range(start, end)
+        return WAV_HEADER_BYTES + stop - begin
+
+    def _wav_header(self, pcm_bytes: int) -> bytes:
+        return wav_header(pcm_bytes, self.sample_rate, self.channels)
+
+    def iter_wav(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        block_size: int = AUDIO_STREAM_BLOCK_BYTES,
+    ) -> Iterator[bytes]:
+        """The range as a WAV file: header, then PCM blocks of block_size."""
+        pcm = self.pcm(start, end)
+        yield self._wav_header(len(pcm))
+        for offset in range(0, len(pcm), block_size):
+            yield bytes(pcm[offset : offset + block_size])
+
+    async def wav_body(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        block_size: int = AUDIO_STREAM_BLOCK_BYTES,
+    ) -> AsyncIterator[bytes]:
+        """
+        iter_wav() for an HTTP request body (send with Content-Length
+        wav_size()). Blocks are read off the event loop, since a cold
+        page-in would otherwise stall live sessions.
+        """
+        loop = asyncio.get_running_loop()
+        pcm = self.pcm(start, end)
+        yield self._wav_header(len(pcm))
+        for offset in range(0, len(pcm), block_size):
+            yield await loop.run_in_executor(None, bytes, pcm[offset : offset + block_size])
+
+    def wav_file(self, start: Optional[float] = None, end: Optional[float] = None) -> io.RawIOBase:
+        """The range as a seekable WAV file object (e.g. a multipart upload)."""
+        pcm = self.pcm(start, end)
+        return _WavReader(self._wav_header(len(pcm)), pcm)
+
+    def close(self):
+        if isinstance(self._mmap, mmap.mmap) and not self._mmap.closed:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # NumPy views are still alive; the mapping goes with the last one
+                pass
+        self._file.close()
+
+
+def _cache_path(storage_path: str) -> Path:
+    return Path(AUDIO_CACHE_PATH) / storage_path
+
+
+def _spool_lock(target: Path) -> asyncio.Lock:
+    return _spool_locks.setdefault(str(target), asyncio.Lock())
+
+
+def _trim_cache(keep: Path):
+    """Delete least recently used cache files beyond AUDIO_CACHE_MAX_BYTES."""
+    files = [p for p in Path(AUDIO_CACHE_PATH).rglob("*") if p.is_file()]
+    total = sum(p.stat().st_size for p in files)
+    for path in sorted(files, key=lambda p: p.stat().st_mtime):
+        if total <= AUDIO_CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        size = path.stat().st_size
+        # Safe while mapped: open mappings keep the data until closed
+        path.unlink()
+        total -= size
+        logger.info(f"🧹 Evicted cached audio {path}")
+
+
+async def cache_storage_audio(storage_path: str) -> Optional[Path]:
+    """
+    Local copy of an object in storage, downloaded into AUDIO_CACHE_PATH
+    unless an up-to-date copy is already there.
+
+    Returns:
+        The cached file, or None if the object does not exist or the
+        download failed
+    """
+    sizes = await StorageService.list_file_sizes(storage_path)
+    size = sizes.get(storage_path)
+    if size is None:
+        return None
+
+    target = _cache_path(storage_path)
+    async with _spool_lock(target):
+        if target.exists() and target.stat().st_size == size:
+            os.utime(target)
+            return target
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+        started = time.monotonic()
+        if not await StorageService.download_file(storage_path, str(partial)):
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+            return None
+        os.replace(partial, target)
+        logger.info(
+            f"📥 Cached {storage_path} ({size / 1024 / 1024:.1f} MB) "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+    _trim_cache(keep=target)
+    return target
+
+
+async def open_meeting_audio(
+    meeting_id: str, storage_path: str = "./data/recordings"
+) -> Optional[AudioSource]:
+    """
+    A meeting's recording as an AudioSource.
+
+    Local recordings: merged_recording.pcm / .wav (imports) or
+    recording.wav, else the live chunks merged into recording.wav.
+    Object storage: recording.wav spooled into the cache, else the chunks
+    merged straight into the cache.
+
+    Returns:
+        The AudioSource (caller closes it), or None if there is no audio
+    """
+    if StorageService.is_local():
+        recording_dir = Path(storage_path) / meeting_id
+        for name in ("merged_recording.pcm", "merged_recording.wav", "recording.wav"):
+            path = recording_dir / name
+            if path.exists() and path.stat().st_size:
+                return AudioSource(path)
+        logger.info(f"🧩 Merging live audio chunks for {meeting_id}")
+        wav_path = await merge_to_wav_file(meeting_id, recording_dir / "recording.wav", storage_path)
+    else:
+        recording = f"{meeting_id}/recording.wav"
+        wav_path = await cache_storage_audio(recording)
+        if wav_path is None:
+            target = _cache_path(recording)
+            async with _spool_lock(target):
+                if target.exists():
+                    # Merged by another job meanwhile
+                    wav_path = target
+                else:
+                    logger.info(
+                        f"🧩 No merged WAV in storage for {meeting_id}, merging chunks into cache"
+                    )
+                    wav_path = await merge_to_wav_file(meeting_id, target)
+            if wav_path is not None:
+                _trim_cache(keep=wav_path)
+
+    if wav_path is None:
+        return None
+    return AudioSource(wav_path)
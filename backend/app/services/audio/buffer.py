@@ -4,7 +4,6 @@ Maintains a sliding window of audio for continuous processing.
 """
 
 import numpy as np
-from collections import deque
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +19,17 @@ class RollingAudioBuffer:
         Time 1.0s: [--2s buffer--] → Transcribe
 
     The overlap provides context for better transcription accuracy.
+
+    Storage is a preallocated int16 array of twice the window size. The
+    first ``window_size`` slots start out as zeros, so the latest window is
+    always the contiguous slice ``[end - window_size, end)`` (zero-padded
+    until the buffer fills). When the write position reaches the end of the
+    array, the last window is moved back to the front - one copy per
+    ``window_size`` appended samples, i.e. O(1) amortized per sample.
+
+    A parallel boolean ring records the VAD decision for every sample, so
+    the speech layout of the current window is available without re-running
+    VAD (see services/audio/speech_window.py).
     """
 
     def __init__(
@@ -42,8 +52,12 @@ class RollingAudioBuffer:
         self.window_size = int((window_duration_ms / 1000) * sample_rate)
         self.slide_size = int((slide_duration_ms / 1000) * sample_rate)
 
-        # Buffer storage (circular buffer)
-        self.buffer = deque(maxlen=self.window_size)
+        # Ring storage: [zero padding | samples ...], see class docstring
+        self._capacity = self.window_size * 2
+        self._ring = np.zeros(self._capacity, dtype=np.int16)
+        self._speech = np.zeros(self._capacity, dtype=bool)
+        self._end = self.window_size  # One past the newest sample
+        self._count = 0  # Valid samples, capped at window_size
         self.samples_since_last_slide = 0
 
         logger.info(
@@ -52,19 +66,40 @@ class RollingAudioBuffer:
             f"slide={slide_duration_ms}ms ({self.slide_size} samples)"
         )
 
-    def add_samples(self, samples: np.ndarray) -> bool:
+    def add_samples(self, samples: np.ndarray, speech=True) -> bool:
         """
         Add audio samples to buffer.
 
         Args:
             samples: NumPy array of audio samples (int16)
+            speech: VAD decision for the samples - a bool for the whole
+                    chunk or a per-sample bool array of the same length
 
         Returns:
             True if enough samples accumulated for next window
         """
-        # Add samples to circular buffer
-        self.buffer.extend(samples)
-        self.samples_since_last_slide += len(samples)
+        n = len(samples)
+        window = self.window_size
+
+        if n >= window:
+            # Chunk alone covers the whole window - keep only its tail
+            self._ring[:window] = samples[-window:]
+            self._speech[:window] = (
+                speech if np.isscalar(speech) else speech[-window:]
+            )
+            self._end = window
+        else:
+            if self._end + n > self._capacity:
+                # Compact: move the current window back to the front
+                self._ring[:window] = self._ring[self._end - window : self._end]
+                self._speech[:window] = self._speech[self._end - window : self._end]
+                self._end = window
+            self._ring[self._end : self._end + n] = samples
+            self._speech[self._end : self._end + n] = speech
+            self._end += n
+
+        self._count = min(self._count + n, window)
+        self.samples_since_last_slide += n
 
         # Check if we should process next window
         should_process = self.samples_since_last_slide >= self.slide_size
@@ -74,20 +109,65 @@ class RollingAudioBuffer:
 
         return should_process
 
-    def get_window(self) -> np.ndarray:
+    def set_window_duration(self, window_duration_ms: int):
+        """
+        Resize the window, keeping the newest samples (and their VAD
+        decisions) that still fit. Invalidates views from ``get_window()``.
+        """
+        window = int((window_duration_ms / 1000) * self.sample_rate)
+        if window == self.window_size:
+            return
+        keep = min(self._count, window)
+        samples = self._ring[self._end - keep : self._end].copy()
+        speech = self._speech[self._end - keep : self._end].copy()
+
+        self.window_duration_ms = window_duration_ms
+        self.window_size = window
+        self._capacity = window * 2
+        self._ring = np.zeros(self._capacity, dtype=np.int16)
+        self._speech = np.zeros(self._capacity, dtype=bool)
+        self._ring[window - keep : window] = samples
+        self._speech[window - keep : window] = speech
+        self._end = window
+        self._count = keep
+        logger.debug(f"Buffer window resized to {window_duration_ms}ms")
+
+    def get_window(self, copy: bool = False) -> np.ndarray:
         """
         Get current audio window as NumPy array.
 
+        Args:
+            copy: Return an independent array instead of a view
+
         Returns:
-            Array of shape (window_size,) with audio samples (int16)
+            Array of shape (window_size,) with audio samples (int16),
+            zero-padded at the front if the buffer is not full yet.
+            Without ``copy`` this is a read-only view that is only valid
+            until the next ``add_samples``/``clear`` call.
+        """
+        view = self._ring[self._end - self.window_size : self._end]
+        if copy:
+            return view.copy()
+        view.flags.writeable = False
+        return view
+
+    def get_window_speech_mask(self) -> np.ndarray:
+        """
+        Per-sample VAD decisions aligned with ``get_window()`` (read-only
+        view, same lifetime rules). Zero padding is marked as non-speech.
         """
-        if len(self.buffer) < self.window_size:
-            # Pad with zeros if buffer not full yet
-            window = np.zeros(self.window_size, dtype=np.int16)
-            window[-len(self.buffer) :] = list(self.buffer)
-            return window
+        view = self._speech[self._end - self.window_size : self._end]
+        view.flags.writeable = False
+        return view
 
-        return np.array(self.buffer, dtype=np.int16)
+    def get_window_view(self) -> memoryview:
+        """
+        Get current window as a zero-copy byte view.
+
+        Same lifetime rules as ``get_window()``: valid until the next
+        ``add_samples``/``clear`` call.
+        """
+        return memoryview(self.get_window()).cast("B")
 
     def get_window_bytes(self) -> bytes:
         """
@@ -100,23 +180,26 @@ class RollingAudioBuffer:
 
     def get_buffer_duration_ms(self) -> float:
         """Get current buffer duration in milliseconds"""
-        return (len(self.buffer) / self.sample_rate) * 1000
+        return (self._count / self.sample_rate) * 1000
 
     def is_buffer_full(self) -> bool:
         """Check if buffer has reached minimum viable window size (90% of target)"""
         # Use 90% threshold to avoid edge cases where buffer never fully fills
         min_viable_size = int(self.window_size * 0.9)
-        return len(self.buffer) >= min_viable_size
+        return self._count >= min_viable_size
 
     def get_all_samples_bytes(self) -> bytes:
         """
         Get all samples currently in the buffer as raw bytes.
         Useful for flushing remaining audio.
         """
-        return np.array(self.buffer, dtype=np.int16).tobytes()
+        return self._ring[self._end - self._count : self._end].tobytes()
 
     def clear(self):
         """Clear the buffer"""
-        self.buffer.clear()
+        self._ring[: self.window_size] = 0
+        self._speech[: self.window_size] = False
+        self._end = self.window_size
+        self._count = 0
         self.samples_since_last_slide = 0
         logger.debug("Buffer cleared")
@@ -0,0 +1,228 @@
+"""
+Adaptive transcription cadence for StreamingTranscriptionManager.
+
+The window length (6s), the interval between windows (3s) and the max
+buffer timeout were hand-tuned against Groq 429s. With
+ADAPTIVE_CADENCE=true, CadenceController adjusts them from what each
+window's round-trip shows:
+
+- 429 → double the interval (and no speed-ups for a cool-down period)
+- smoothed latency above CADENCE_TARGET_LATENCY → interval x1.25
+- fast API (latency under half the target) and dense speech in the
+  window → interval -0.25s
+- sparse speech → drift the interval back to its configured value
+- low confidence or a hallucination-filtered result → window +1s;
+  after 5 good results in a row → window -0.5s, down to its configured
+  value
+
+Interval and window always stay inside their CADENCE_* bounds, and the
+interval never exceeds window - 1s so consecutive windows keep enough
+overlap for dedup. The max-buffer timeout follows the window. Every change
+is kept (last 20) with its reason and shows up in get_stats().
+
+Disabled, the controller still tracks latency so the stats show what it
+would be reacting to.
+"""
+
+import logging
+import os
+from collections import deque
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ADAPTIVE_CADENCE = os.getenv("ADAPTIVE_CADENCE", "false").lower() == "true"
+CADENCE_MIN_INTERVAL = float(os.getenv("CADENCE_MIN_INTERVAL", "1.5"))
+CADENCE_MAX_INTERVAL = float(os.getenv("CADENCE_MAX_INTERVAL", "10"))
+CADENCE_MIN_WINDOW_MS = int(os.getenv("CADENCE_MIN_WINDOW_MS", "4000"))
+CADENCE_MAX_WINDOW_MS = int(os.getenv("CADENCE_MAX_WINDOW_MS", "12000"))
+CADENCE_TARGET_LATENCY = float(os.getenv("CADENCE_TARGET_LATENCY", "1.5"))
+CADENCE_LOW_CONFIDENCE = float(os.getenv("CADENCE_LOW_CONFIDENCE", "0.5"))
+
+# Seconds without speed-ups after a 429
+RATE_LIMIT_COOLDOWN = 30.0
+# Speech fraction of a window considered dense / sparse
+DENSE_SPEECH = 0.5
+SPARSE_SPEECH = 0.2
+# Consecutive good results before the window shrinks again
+RECOVERY_RESULTS = 5
+# Minimum overlap between consecutive windows (seconds)
+MIN_OVERLAP = 1.0
+
+
+class CadenceController:
+    """Per-session interval/window controller; see module docstring."""
+
+    def __init__(
+        self,
+        interval: float,
+        window_ms: int,
+        enabled: bool = ADAPTIVE_CADENCE,
+        min_interval: float = CADENCE_MIN_INTERVAL,
+        max_interval: float = CADENCE_MAX_INTERVAL,
+        min_window_ms: int = CADENCE_MIN_WINDOW_MS,
+        max_window_ms: int = CADENCE_MAX_WINDOW_MS,
+        target_latency: float = CADENCE_TARGET_LATENCY,
+        low_confidence: float = CADENCE_LOW_CONFIDENCE,
+    ):
+        """
+        Args:
+            interval: Configured seconds between windows (the starting point)
+            window_ms: Configured window length (the starting point)
+            enabled: Apply changes (otherwise only observe)
+        """
+        self.enabled = enabled
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.min_window_ms = min_window_ms
+        self.max_window_ms = max_window_ms
+        self.target_latency = target_latency
+        self.low_confidence = low_confidence
+
+        self.base_window_ms = self._clamp(window_ms, min_window_ms, max_window_ms)
+        self.window_ms = self.base_window_ms
+        self.base_interval = self._clamp_interval(interval)
+        self.interval = self.base_interval
+
+        self.latency_ewma: Optional[float] = None
+        self._cooldown_until = 0.0
+        self._good_streak = 0
+
+        self.results = 0
+        self.rate_limited = 0
+        self.filtered = 0
+        self.low_confidence_results = 0
+        self.decisions: Deque[dict] = deque(maxlen=20)
+        self.decision_counts: Dict[str, int] = {}
+
+    @staticmethod
+    def _clamp(value, low, high):
+        return max(low, min(high, value))
+
+    def _clamp_interval(self, interval: float) -> float:
+        ceiling = min(self.max_interval, self.window_ms / 1000 - MIN_OVERLAP)
+        return round(max(self.min_interval, min(ceiling, interval)), 3)
+
+    def _decide(self, now: float, interval: float, window_ms: int, reason: str) -> bool:
+        if not self.enabled:
+            return False
+        window_ms = int(self._clamp(window_ms, self.min_window_ms, self.max_window_ms))
+        old_interval, old_window = self.interval, self.window_ms
+        self.window_ms = window_ms
+        self.interval = self._clamp_interval(interval)
+        if (self.interval, self.window_ms) == (old_interval, old_window):
+            return False
+
+        self.decision_counts[reason] = self.decision_counts.get(reason, 0) + 1
+        self.decisions.append(
+            {
+                "at": round(now, 3),
+                "reason": reason,
+                "interval_s": self.interval,
+                "window_ms": self.window_ms,
+                "latency_ewma_s": round(self.latency_ewma, 3)
+                if self.latency_ewma is not None
+                else None,
+            }
+        )
+        logger.info(
+            f"🎚️ Cadence ({reason}): interval {old_interval}s→{self.interval}s, "
+            f"window {old_window}ms→{self.window_ms}ms"
+        )
+        return True
+
+    def on_result(
+        self,
+        now: float,
+        latency: float,
+        rate_limited: bool = False,
+        confidence: Optional[float] = None,
+        speech_density: Optional[float] = None,
+    ) -> bool:
+        """
+        Feed one window's outcome.
+
+        Args:
+            now: Current time.monotonic()
+            latency: Seconds from window trigger to result (scheduler + API)
+            rate_limited: The request ended in a 429
+            confidence: Result confidence (None if unknown)
+            speech_density: Fraction of the window VAD marked as speech
+
+        Returns:
+            True if interval or window changed.
+        """
+        self.results += 1
+
+        if rate_limited:
+            self.rate_limited += 1
+            self._cooldown_until = now + RATE_LIMIT_COOLDOWN
+            return self._decide(now, self.interval * 2, self.window_ms, "rate_limited")
+
+        self.latency_ewma = (
+            latency if self.latency_ewma is None else 0.7 * self.latency_ewma + 0.3 * latency
+        )
+
+        window_ms = self.window_ms
+        window_reason = None
+        if confidence is not None and confidence < self.low_confidence:
+            self.low_confidence_results += 1
+            self._good_streak = 0
+            window_ms += 1000
+            window_reason = "low_confidence"
+        else:
+            self._good_streak += 1
+            if self._good_streak >= RECOVERY_RESULTS and window_ms > self.base_window_ms:
+                self._good_streak = 0
+                window_ms = max(self.base_window_ms, window_ms - 500)
+                window_reason = "recovered"
+
+        interval = self.interval
+        interval_reason = None
+        if self.latency_ewma > self.target_latency:
+            interval *= 1.25
+            interval_reason = "slow_api"
+        elif (
+            self.latency_ewma < self.target_latency / 2
+            and speech_density is not None
+            and speech_density >= DENSE_SPEECH
+            and now >= self._cooldown_until
+        ):
+            interval -= 0.25
+            interval_reason = "fast_dense"
+        elif (
+            speech_density is not None
+            and speech_density < SPARSE_SPEECH
+            and interval < self.base_interval
+        ):
+            interval = min(self.base_interval, interval + 0.25)
+            interval_reason = "sparse"
+
+        reason = "+".join(r for r in (interval_reason, window_reason) if r)
+        if not reason:
+            return False
+        return self._decide(now, interval, window_ms, reason)
+
+    def on_filtered(self, now: float) -> bool:
+        """A result was dropped as a hallucination: give Whisper more context."""
+        self.filtered += 1
+        self._good_streak = 0
+        return self._decide(now, self.interval, self.window_ms + 1000, "hallucination")
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval_s": self.interval,
+            "window_ms": self.window_ms,
+            "base_interval_s": self.base_interval,
+            "base_window_ms": self.base_window_ms,
+            "latency_ewma_s": round(self.latency_ewma, 3)
+            if self.latency_ewma is not None
+            else None,
+            "results": self.results,
+            "rate_limited": self.rate_limited,
+            "hallucinations_filtered": self.filtered,
+            "low_confidence_results": self.low_confidence_results,
+            "decision_counts": dict(self.decision_counts),
+            "recent_decisions": list(self.decisions),
+        }
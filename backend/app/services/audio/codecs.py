@@ -0,0 +1,216 @@
+"""
+Compressed audio transport for the streaming websocket.
+
+Raw 16kHz int16 PCM costs 32 KB/s per participant upstream. Clients may
+instead send Opus or FLAC and the server decodes back to the PCM the rest
+of the pipeline expects.
+
+Negotiation rides on the existing handshake: the client lists codecs it
+can send in the `codecs` query parameter (preference order, e.g.
+"opus,flac"), and the server answers with the chosen `codec` in its
+`connected` message. Clients that send nothing get "pcm" and the legacy
+protocol is unchanged.
+
+Binary messages keep the 8-byte little-endian float64 timestamp prefix;
+the rest of the message is:
+
+- pcm:  raw interleaved int16 samples at the declared rate/channels
+- opus: one or more Opus packets, each prefixed with its uint16 LE length
+        (decoded straight to 16kHz mono; decoder state is kept per session)
+- flac: a complete FLAC stream (16-bit, declared rate/channels)
+
+Decoded audio that is not 16kHz mono goes through the resample/downmix
+stage (services/audio/resample.py) before VAD.
+
+Decoding runs in a shared thread pool so the event loop only awaits it.
+Opus needs `opuslib` (and libopus), FLAC needs `soundfile` (libsndfile);
+a codec whose library is missing is simply not offered.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CODEC_PCM = "pcm"
+CODEC_OPUS = "opus"
+CODEC_FLAC = "flac"
+
+SAMPLE_RATE = 16000
+
+AUDIO_DECODE_WORKERS = int(os.getenv("AUDIO_DECODE_WORKERS", "4"))
+
+# Largest Opus frame (120ms) at 16kHz
+_OPUS_MAX_FRAME_SAMPLES = SAMPLE_RATE * 120 // 1000
+
+
+class PCMDecoder:
+    """Legacy path: payload already is int16 PCM."""
+
+    codec = CODEC_PCM
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = 1):
+        self.output_format = (sample_rate, channels)
+
+    def decode(self, payload: bytes) -> bytes:
+        return payload
+
+
+class OpusDecoder:
+    """Stateful Opus decoder for one stream of length-prefixed packets."""
+
+    codec = CODEC_OPUS
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = 1):
+        import opuslib
+
+        # libopus resamples/downmixes internally, whatever the source format
+        self._decoder = opuslib.Decoder(SAMPLE_RATE, 1)
+        self.output_format = (SAMPLE_RATE, 1)
+
+    def decode(self, payload: bytes) -> bytes:
+        pcm = bytearray()
+        pos = 0
+        while pos + 2 <= len(payload):
+            (length,) = struct.unpack_from("<H", payload, pos)
+            pos += 2
+            if pos + length > len(payload):
+                raise ValueError("Truncated Opus packet")
+            pcm += self._decoder.decode(payload[pos : pos + length], _OPUS_MAX_FRAME_SAMPLES)
+            pos += length
+        if pos != len(payload):
+            raise ValueError("Trailing bytes after Opus packets")
+        return bytes(pcm)
+
+
+class FLACDecoder:
+    """Decodes self-contained FLAC streams (one per message)."""
+
+    codec = CODEC_FLAC
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = 1):
+        import soundfile
+
+        self._soundfile = soundfile
+        self.output_format = (sample_rate, channels)
+
+    def decode(self, payload: bytes) -> bytes:
+        samples, sample_rate = self._soundfile.read(
+            io.BytesIO(payload), dtype="int16", always_2d=True
+        )
+        if (sample_rate, samples.shape[1]) != self.output_format:
+            raise ValueError(
+                f"FLAC stream is {sample_rate}Hz/{samples.shape[1]}ch, "
+                f"expected {self.output_format[0]}Hz/{self.output_format[1]}ch"
+            )
+        # Interleaved int16, like raw PCM
+        return np.ascontiguousarray(samples).tobytes()
+
+
+_DECODERS = {
+    CODEC_PCM: PCMDecoder,
+    CODEC_OPUS: OpusDecoder,
+    CODEC_FLAC: FLACDecoder,
+}
+
+_available: Optional[List[str]] = None
+
+
+def available_codecs() -> List[str]:
+    """Codecs this server can decode (pcm always; others if their library loads)."""
+    global _available
+    if _available is None:
+        _available = []
+        for codec, decoder_class in _DECODERS.items():
+            try:
+                decoder_class()
+                _available.append(codec)
+            except Exception as e:
+                logger.info(f"Audio codec '{codec}' unavailable: {e}")
+    return _available
+
+
+def negotiate_codec(requested: Optional[str]) -> str:
+    """
+    Pick the first codec from the client's comma-separated preference list
+    that the server supports, falling back to pcm.
+    """
+    if not requested:
+        return CODEC_PCM
+    supported = available_codecs()
+    for codec in requested.lower().split(","):
+        codec = codec.strip()
+        if codec in supported:
+            return codec
+    return CODEC_PCM
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_decode_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for audio decoding."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=AUDIO_DECODE_WORKERS, thread_name_prefix="audio-decode"
+        )
+    return _executor
+
+
+class StreamDecoder:
+    """
+    Per-session decoder. Messages must be decoded in arrival order (Opus is
+    stateful), which the websocket receive loop guarantees by awaiting each
+    decode before reading the next message.
+    """
+
+    def __init__(self, codec: str = CODEC_PCM, sample_rate: int = SAMPLE_RATE, channels: int = 1):
+        """
+        Args:
+            codec: Negotiated codec
+            sample_rate: Sample rate declared by the client
+            channels: Channel count declared by the client
+        """
+        self.codec = codec
+        self._decoder = _DECODERS[codec](sample_rate, channels)
+        # (rate, channels) of the decoded PCM
+        self.output_format = self._decoder.output_format
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.decode_errors = 0
+
+    async def decode(self, payload: bytes) -> bytes:
+        """Decode one message payload to int16 PCM."""
+        self.bytes_in += len(payload)
+        if self.codec == CODEC_PCM:
+            pcm = payload
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                pcm = await loop.run_in_executor(
+                    get_decode_executor(), self._decoder.decode, payload
+                )
+            except Exception:
+                self.decode_errors += 1
+                raise
+        self.bytes_out += len(pcm)
+        return pcm
+
+    def get_stats(self) -> dict:
+        return {
+            "codec": self.codec,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "compression_ratio": round(self.bytes_out / self.bytes_in, 2)
+            if self.bytes_in
+            else None,
+            "decode_errors": self.decode_errors,
+        }
@@ -0,0 +1,282 @@
+"""
+Incremental text indexes used by StreamingTranscriptionManager for
+deduplicating overlapping window transcripts.
+"""
+
+import hashlib
+from array import array
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Set
+
+
+class OverlapIndex:
+    """
+    Finds how many leading words of a new transcript repeat the tail of the
+    finalized transcript.
+
+    Keeps the last ``search_window`` finalized words (lowercased) so nothing
+    has to re-split the full transcript. Matching uses the same fuzzy rule as
+    before: the new head of ``k`` words overlaps if the Jaccard similarity of
+    its word set with a ``k``-word tail segment (starting at one of the first
+    ``max_start_offsets`` tail positions, or ending at the tail end) is at
+    least ``similarity_threshold``. The largest such ``k`` wins.
+
+    Instead of rebuilding two sets per (k, offset) pair, each candidate
+    alignment is grown one word at a time while distinct-word and
+    intersection counts are updated in O(1), so a lookup is one pass over
+    the new head per alignment.
+    """
+
+    def __init__(
+        self,
+        search_window: int = 50,
+        max_overlap: int = 20,
+        max_start_offsets: int = 15,
+        similarity_threshold: float = 0.5,
+    ):
+        self.search_window = search_window
+        self.max_overlap = max_overlap
+        self.max_start_offsets = max_start_offsets
+        self.similarity_threshold = similarity_threshold
+        self.tail_words: Deque[str] = deque(maxlen=search_window)
+
+    def add_text(self, text: str):
+        """Record newly finalized text."""
+        self.tail_words.extend(w.lower() for w in text.split())
+
+    def clear(self):
+        self.tail_words.clear()
+
+    def __bool__(self) -> bool:
+        return bool(self.tail_words)
+
+    def find_overlap(self, new_words: List[str]) -> int:
+        """
+        Return the number of leading ``new_words`` that overlap the tail
+        (0 if none).
+        """
+        if len(new_words) < 4 or not self.tail_words:
+            return 0
+
+        max_k = min(self.max_overlap, len(new_words) // 2 + 5)
+        if max_k < 3:
+            return 0
+
+        head = [w.lower() for w in new_words[:max_k]]
+        tail = list(self.tail_words)
+        window = len(tail)
+
+        best = 0
+        # Segments starting at fixed offsets, growing to the right
+        for start in range(min(self.max_start_offsets, window)):
+            best = max(best, self._best_k(head, tail, start, 1, max_k, window - start))
+        # Segment ending at the tail end, growing to the left
+        best = max(best, self._best_k(head, tail, window - 1, -1, max_k, window))
+        return best
+
+    def _best_k(
+        self, head: List[str], tail: List[str], pos: int, step: int, max_k: int, room: int
+    ) -> int:
+        """
+        Grow head[:k] and a tail segment (from ``pos`` in direction ``step``)
+        together, returning the largest k >= 3 meeting the threshold.
+        """
+        head_counts: Dict[str, int] = {}
+        tail_counts: Dict[str, int] = {}
+        distinct_head = distinct_tail = intersection = 0
+        best = 0
+
+        for k in range(1, min(max_k, room) + 1):
+            # Short heads stop growing while the tail segment keeps going
+            if k <= len(head):
+                word = head[k - 1]
+                if head_counts.get(word, 0) == 0:
+                    distinct_head += 1
+                    if tail_counts.get(word, 0) > 0:
+                        intersection += 1
+                head_counts[word] = head_counts.get(word, 0) + 1
+
+            word = tail[pos + step * (k - 1)]
+            if tail_counts.get(word, 0) == 0:
+                distinct_tail += 1
+                if head_counts.get(word, 0) > 0:
+                    intersection += 1
+            tail_counts[word] = tail_counts.get(word, 0) + 1
+
+            if k >= 3:
+                union = distinct_head + distinct_tail - intersection
+                if intersection / union >= self.similarity_threshold:
+                    best = k
+
+        return best
+
+
+def hash_ngram(words: Iterable[str]) -> int:
+    """Stable signed 64-bit hash of an n-gram (same value in every process)."""
+    digest = hashlib.blake2b(" ".join(words).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class NgramIndex:
+    """
+    Sliding-window multiset of hashed word n-grams over the most recent
+    finalized words.
+
+    Only ``horizon_words`` words are covered, so memory per session is
+    constant however long the meeting runs. N-grams are stored as 64-bit
+    hashes in a fixed-size ring (``array('q')``) plus a count per hash;
+    adding text is O(new words) and a lookup is one hash per n-gram of the
+    candidate text.
+    """
+
+    def __init__(self, n: int = 3, horizon_words: int = 100):
+        self.n = n
+        self.horizon_words = horizon_words
+        self.capacity = max(1, horizon_words - n + 1)
+        self._ring = array("q", bytes(8 * self.capacity))
+        self._start = 0
+        self._size = 0
+        self._counts: Dict[int, int] = {}
+        # Last n-1 words, so n-grams can span finalized segments
+        self._carry: Deque[str] = deque(maxlen=n - 1)
+
+    def add_text(self, text: str):
+        """Index newly finalized text, evicting n-grams past the horizon."""
+        for word in text.lower().split():
+            if len(self._carry) == self.n - 1:
+                self._push(hash_ngram((*self._carry, word)))
+            self._carry.append(word)
+
+    def _push(self, value: int):
+        if self._size == self.capacity:
+            evicted = self._ring[self._start]
+            remaining = self._counts[evicted] - 1
+            if remaining:
+                self._counts[evicted] = remaining
+            else:
+                del self._counts[evicted]
+            self._ring[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._ring[(self._start + self._size) % self.capacity] = value
+            self._size += 1
+        self._counts[value] = self._counts.get(value, 0) + 1
+
+    def ngram_hashes(self, text: str) -> Set[int]:
+        """Distinct hashed n-grams of ``text`` (normalized the same way)."""
+        words = text.lower().split()
+        return {hash_ngram(words[i : i + self.n]) for i in range(len(words) - self.n + 1)}
+
+    def overlap_ratio(self, text: str) -> float:
+        """Fraction of the distinct n-grams in ``text`` already indexed."""
+        if not self._counts:
+            return 0.0
+        grams = self.ngram_hashes(text)
+        if not grams:
+            return 0.0
+        return sum(1 for g in grams if g in self._counts) / len(grams)
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+        self._counts.clear()
+        self._carry.clear()
+
+    def __bool__(self) -> bool:
+        return bool(self._counts)
+
+
+class RecentHashSet:
+    """Set that remembers only the ``maxlen`` most recently added items."""
+
+    def __init__(self, maxlen: int = 512):
+        self._order: Deque[str] = deque()
+        self._items: Set[str] = set()
+        self.maxlen = maxlen
+
+    def add(self, item: str):
+        if item in self._items:
+            return
+        self._items.add(item)
+        self._order.append(item)
+        if len(self._order) > self.maxlen:
+            self._items.discard(self._order.popleft())
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        self._order.clear()
+        self._items.clear()
+
+    def snapshot(self) -> List[str]:
+        """Items, oldest first (JSON-serializable)."""
+        return list(self._order)
+
+    def restore(self, items: Iterable[str]):
+        self.clear()
+        for item in items:
+            self.add(item)
+
+
+class TranscriptTail:
+    """
+    Bounded view of the finalized transcript.
+
+    Replaces an ever-growing ``last_final_text`` string: keeps the last
+    ``max_words`` word tokens and the last ``max_chars`` characters (for
+    prompt context), plus running totals for stats. Appends cost
+    O(new text + max_chars) regardless of meeting length.
+    """
+
+    def __init__(self, max_words: int = 100, max_chars: int = 1000):
+        self.max_chars = max_chars
+        self.words: Deque[str] = deque(maxlen=max_words)
+        self.text = ""
+        self.total_chars = 0
+        self.total_words = 0
+        self.segments = 0
+
+    def append(self, text: str):
+        """Add a finalized segment (joined with a space, as before)."""
+        self.text = (self.text + " " + text)[-self.max_chars :]
+        tokens = text.split()
+        self.words.extend(tokens)
+        self.total_chars += 1 + len(text)
+        self.total_words += len(tokens)
+        self.segments += 1
+
+    def prompt(self, chars: int = 100):
+        """Last ``chars`` characters for the Whisper prompt (None if empty)."""
+        return self.text[-chars:] if self.text else None
+
+    def clear(self):
+        self.words.clear()
+        self.text = ""
+        self.total_chars = 0
+        self.total_words = 0
+        self.segments = 0
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state (see restore)."""
+        return {
+            "text": self.text,
+            "words": list(self.words),
+            "total_chars": self.total_chars,
+            "total_words": self.total_words,
+            "segments": self.segments,
+        }
+
+    def restore(self, state: dict):
+        self.words.clear()
+        self.words.extend(state.get("words", []))
+        self.text = state.get("text", "")[-self.max_chars :]
+        self.total_chars = state.get("total_chars", len(self.text))
+        self.total_words = state.get("total_words", len(self.words))
+        self.segments = state.get("segments", 0)
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
@@ -17,24 +17,36 @@ import httpx
 import logging
 import os
 import json
-import aiofiles
-from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass
 
 try:
     from .recorder import AudioRecorder
     from .groq_client import GroqTranscriptionClient
+    from .scheduler import get_transcription_scheduler, PRIORITY_POST
     from .alignment import AlignmentEngine
+    from .audio_source import AudioSource, open_meeting_audio
 except (ImportError, ValueError):
     from services.audio.recorder import AudioRecorder
     from services.audio.groq_client import GroqTranscriptionClient
+    from services.audio.scheduler import get_transcription_scheduler, PRIORITY_POST
     from services.audio.alignment import AlignmentEngine
+    from services.audio.audio_source import AudioSource, open_meeting_audio
 
 logger = logging.getLogger(__name__)
 
 
+def _upload_content(
+    audio_data: Union[bytes, AudioSource]
+) -> Tuple[object, Dict[str, str]]:
+    """Request body and extra headers for uploading audio to a provider."""
+    if isinstance(audio_data, AudioSource):
+        # Streamed from the memory map; Content-Length avoids chunked encoding
+        return audio_data.wav_body(), {"Content-Length": str(audio_data.wav_size())}
+    return audio_data, {}
+
+
 @dataclass
 class SpeakerSegment:
     """Represents a speaker segment with timing and text."""
@@ -102,17 +114,29 @@ class DiarizationService:
             f"DiarizationService initialized (provider={provider}, enabled={self.enabled})"
         )
 
-    async def transcribe_with_whisper(self, audio_data: bytes) -> List[Dict]:
+    async def transcribe_with_whisper(
+        self, audio_data: Union[bytes, AudioSource], meeting_id: Optional[str] = None
+    ) -> List[Dict]:
         """
         Run high-fidelity Whisper transcription on the full meeting audio.
         Returns segments for alignment.
+
+        The job is scheduled under the meeting's session id, so concurrent
+        diarization jobs for different meetings get fair shares instead of
+        queueing behind each other in one shared "diarization" lane.
         """
         if not self.groq:
             logger.error("No Groq API key provided for high-fidelity transcription")
             return []
 
         logger.info("💎 Running Gold Standard Whisper transcription...")
-        result = await self.groq.transcribe_full_audio(audio_data)
+        result = await get_transcription_scheduler().submit(
+            meeting_id or "diarization",
+            self.groq.api_key,
+            audio_data,
+            priority=PRIORITY_POST,
+            method="transcribe_full_audio",
+        )
 
         if result.get("error"):
             logger.error(f"Gold transcription failed: {result['error']}")
@@ -171,12 +195,13 @@ class DiarizationService:
         audio_data: bytes = None,
         audio_url: str = None,
         user_email: str = None,
+        audio: Optional[AudioSource] = None,
     ) -> DiarizationResult:
         """
         Run speaker diarization on a meeting's recorded audio.
 
         This is the main entry point for diarization. It:
-        1. Merges audio chunks (or uses provided audio_data)
+        1. Maps the recording (or uses provided audio / audio_data)
         2. Sends to cloud API
         3. Processes results
         4. Returns speaker segments
@@ -187,6 +212,7 @@ class DiarizationService:
             provider: Override default provider
             audio_data: Optional pre-loaded audio bytes (PCM or WAV)
             user_email: Optional user email for fetching API keys
+            audio: Optional opened AudioSource (left open for the caller)
 
         Returns:
             DiarizationResult with speaker segments
@@ -217,51 +243,21 @@ class DiarizationService:
                 error=f"No API key configured for {provider}. Set {provider.upper()}_API_KEY environment variable.",
             )
 
+        opened_audio = None
         try:
             logger.info(
                 f"🎯 Starting diarization for meeting {meeting_id} with {provider}"
             )
 
-            # Step 1: Get Audio Data (or URL)
+            # Step 1: Get Audio (or URL)
             if audio_url:
                 logger.info("📎 Using audio URL for diarization (no local download)")
-            elif audio_data is None:
-                # Try to find existing merged files first (Imported)
-                recording_dir = Path(storage_path) / meeting_id
-                merged_pcm = recording_dir / "merged_recording.pcm"
-                merged_wav = recording_dir / "merged_recording.wav"
-
-                if merged_pcm.exists():
-                    logger.info(f"📂 Found existing merged PCM file for {meeting_id}")
-                    async with aiofiles.open(merged_pcm, "rb") as f:
-                        audio_data = await f.read()
-                elif merged_wav.exists():
-                    logger.info(f"📂 Found existing merged WAV file for {meeting_id}")
-                    async with aiofiles.open(merged_wav, "rb") as f:
-                        audio_data = await f.read()
-                else:
-                    # Fallback to merging chunks
-                    logger.info(
-                        f"⚠️ Merged audio missing for {meeting_id}, attempting to merge chunks locally..."
-                    )
-                    audio_data = await AudioRecorder.merge_chunks(
-                        meeting_id, storage_path
-                    )
-
-            # If still no audio, check for any chunks and try harder
-            if not audio_data and not audio_url:
-                recording_dir = Path(storage_path) / meeting_id
-                if recording_dir.exists():
-                    chunks = list(recording_dir.glob("chunk_*.pcm"))
-                    if chunks:
-                        logger.info(
-                            f"⚠️ explicit chunk merge triggered for {len(chunks)} chunks"
-                        )
-                        audio_data = await AudioRecorder.merge_chunks(
-                            meeting_id, storage_path
-                        )
+            elif audio is None and audio_data is None:
+                # Imported merged file, merged recording or live chunks,
+                # memory-mapped rather than read into memory
+                audio = opened_audio = await open_meeting_audio(meeting_id, storage_path)
 
-            if not audio_data and not audio_url:
+            if not audio_data and not audio and not audio_url:
                 return DiarizationResult(
                     status="failed",
                     meeting_id=meeting_id,
@@ -272,7 +268,8 @@ class DiarizationService:
                     error="No audio data found for this meeting. Ensure recording was enabled.",
                 )
 
-            # Step 2: Convert to WAV (bytes path only)
+            # Step 2: Convert to WAV (bytes path only; an AudioSource
+            # streams itself as WAV)
             wav_data = None
             if audio_data:
                 is_wav = audio_data.startswith(b"RIFF")
@@ -285,6 +282,11 @@ class DiarizationService:
                     logger.info("📦 Converted PCM to WAV")
 
                 logger.info(f"📦 Audio prepared: {len(wav_data)} bytes")
+            elif audio:
+                wav_data = audio
+                logger.info(
+                    f"📦 Audio mapped: {audio.path} ({audio.duration_seconds:.1f}s)"
+                )
 
             # Step 3: Send to diarization API
             if provider == "deepgram":
@@ -332,10 +334,13 @@ class DiarizationService:
                 provider=provider,
                 error=str(e),
             )
+        finally:
+            if opened_audio is not None:
+                opened_audio.close()
 
     async def _diarize_with_deepgram(
         self,
-        audio_data: Optional[bytes],
+        audio_data: Optional[Union[bytes, AudioSource]],
         meeting_id: str,
         api_key: str,
         audio_url: Optional[str] = None,
@@ -346,7 +351,7 @@ class DiarizationService:
         Uses Deepgram Nova-2 model with diarization enabled.
 
         Args:
-            audio_data: WAV audio bytes
+            audio_data: WAV audio bytes or an AudioSource
 
         Returns:
             List of SpeakerSegment objects
@@ -357,7 +362,7 @@ class DiarizationService:
 
         # Determine content type based on header
         content_type = "audio/wav"
-        if audio_data:
+        if isinstance(audio_data, bytes):
             if audio_data.startswith(b"ID3") or audio_data.startswith(b"\xff\xfb"):
                 content_type = "audio/mp3"
             elif audio_data.startswith(b"OggS"):
@@ -392,11 +397,14 @@ class DiarizationService:
                             json={"url": audio_url},
                         )
                     else:
+                        # Fresh body per attempt (a stream is consumed once)
+                        content, extra_headers = _upload_content(audio_data)
                         response = await client.post(
                             self.deepgram_url,
                             headers={
                                 "Authorization": f"Token {api_key}",
                                 "Content-Type": content_type,
+                                **extra_headers,
                             },
                             params={
                                 "model": "nova-2",
@@ -405,7 +413,7 @@ class DiarizationService:
                                 "utterances": "true",
                                 "smart_format": "false",
                             },
-                            content=audio_data,
+                            content=content,
                         )
 
                     if response.status_code != 200:
@@ -530,7 +538,7 @@ class DiarizationService:
 
     async def _diarize_with_assemblyai(
         self,
-        audio_data: Optional[bytes],
+        audio_data: Optional[Union[bytes, AudioSource]],
         meeting_id: str,
         api_key: str,
         audio_url: Optional[str] = None,
@@ -542,7 +550,7 @@ class DiarizationService:
         Note: AssemblyAI uses a two-step process (upload then transcribe).
 
         Args:
-            audio_data: WAV audio bytes
+            audio_data: WAV audio bytes or an AudioSource
 
         Returns:
             List of SpeakerSegment objects
@@ -550,13 +558,15 @@ class DiarizationService:
         async with httpx.AsyncClient(timeout=600.0) as client:
             if not audio_url:
                 # Step 1: Upload audio file
+                content, extra_headers = _upload_content(audio_data)
                 upload_response = await client.post(
                     f"{self.assemblyai_url}/upload",
                     headers={
                         "authorization": api_key,
                         "content-type": "application/octet-stream",
+                        **extra_headers,
                     },
-                    content=audio_data,
+                    content=content,
                 )
 
                 if upload_response.status_code != 200:
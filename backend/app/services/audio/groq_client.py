@@ -1,35 +1,178 @@
 """
 Groq API client for streaming Whisper transcription.
 Supports Hindi + English with low latency.
+
+All requests go through the async Groq SDK. One keep-alive HTTP connection
+pool is shared per API key across every session in the process, so 100
+concurrent meetings on the same key reuse a handful of TLS connections
+instead of spinning up a client (and worker threads) each.
 """
 
-from groq import Groq, RateLimitError
+from groq import AsyncGroq, RateLimitError
+import httpx
 import os
 import logging
 import io
+import math
 import wave
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Connection pool configuration (per API key)
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+GROQ_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "10"))
+GROQ_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30"))
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+GROQ_REQUEST_TIMEOUT = float(os.getenv("GROQ_REQUEST_TIMEOUT", "30"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+
+
+class GroqClientPool:
+    """
+    Process-wide registry of AsyncGroq clients, one per API key.
+
+    Each client owns an httpx.AsyncClient with bounded, keep-alive
+    connections. Clients are created lazily and closed on app shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = GROQ_MAX_CONNECTIONS,
+        max_keepalive_connections: int = GROQ_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = GROQ_KEEPALIVE_EXPIRY,
+        connect_timeout: float = GROQ_CONNECT_TIMEOUT,
+        request_timeout: float = GROQ_REQUEST_TIMEOUT,
+        max_retries: int = GROQ_MAX_RETRIES,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(request_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self._clients: Dict[str, AsyncGroq] = {}
+
+    def get(self, api_key: str) -> AsyncGroq:
+        """Get (or lazily create) the shared client for an API key."""
+        client = self._clients.get(api_key)
+        if client is None:
+            http_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            client = AsyncGroq(
+                api_key=api_key,
+                http_client=http_client,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+            )
+            self._clients[api_key] = client
+            logger.info(
+                f"✅ Groq connection pool created "
+                f"(max_connections={self.limits.max_connections}, pools={len(self._clients)})"
+            )
+        return client
+
+    async def close(self):
+        """Close all pooled connections."""
+        for client in self._clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Groq client: {e}")
+        self._clients.clear()
+
+
+_client_pool: Optional[GroqClientPool] = None
+
+
+def get_groq_client_pool() -> GroqClientPool:
+    """Get the process-wide Groq client pool."""
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = GroqClientPool()
+    return _client_pool
+
+
+async def close_groq_client_pool():
+    """Close the process-wide Groq client pool (call on shutdown)."""
+    global _client_pool
+    if _client_pool is not None:
+        await _client_pool.close()
+        _client_pool = None
+
+
+def _rate_limit_headers(headers) -> dict:
+    """Extract Groq rate-limit headers (x-ratelimit-*, retry-after)."""
+    if not headers:
+        return {}
+    return {
+        k.lower(): v
+        for k, v in headers.items()
+        if k.lower().startswith("x-ratelimit-") or k.lower() == "retry-after"
+    }
+
+
+def _segment_confidence(result) -> float:
+    """
+    Confidence from verbose_json segments: exp of the mean avg_logprob
+    (1.0 when the response has no segments).
+    """
+    logprobs = []
+    for segment in getattr(result, "segments", None) or []:
+        value = (
+            segment.get("avg_logprob")
+            if isinstance(segment, dict)
+            else getattr(segment, "avg_logprob", None)
+        )
+        if value is not None:
+            logprobs.append(value)
+    if not logprobs:
+        return 1.0
+    return round(min(1.0, math.exp(sum(logprobs) / len(logprobs))), 3)
+
+
+def _pcm_to_wav(audio_data: bytes) -> bytes:
+    """Wrap raw PCM (16kHz, mono, 16-bit) in a WAV container."""
+    wav_buffer = io.BytesIO()
+    with wave.open(wav_buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)  # Mono
+        wav_file.setsampwidth(2)  # 16-bit
+        wav_file.setframerate(16000)  # 16kHz
+        wav_file.writeframes(audio_data)
+    return wav_buffer.getvalue()
+
+
 class GroqTranscriptionClient:
     """
     Groq API client for streaming Whisper transcription.
     Supports Hindi + English with low latency (~0.5-1s).
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, timeout: Optional[float] = None):
+        """
+        Args:
+            api_key: Groq API key (falls back to GROQ_API_KEY)
+            timeout: Per-request timeout in seconds (defaults to the pool's)
+        """
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         if not self.api_key:
             raise ValueError("GROQ_API_KEY not found in environment")
 
-        self.client = Groq(api_key=self.api_key)
+        self.timeout = timeout
+        self.client = get_groq_client_pool().get(self.api_key)
         logger.info("✅ Groq client initialized")
 
+    def _request_options(self, timeout: Optional[float]) -> dict:
+        timeout = timeout if timeout is not None else self.timeout
+        return {"timeout": timeout} if timeout is not None else {}
+
     async def transcribe_audio(
         self,
         audio_data: bytes,
         language: str = "hi",
-        prompt: str = None
+        prompt: str = None,
+        translate_to_english: bool = False,
+        timeout: Optional[float] = None,
     ) -> dict:
         """
         Transcribe audio using Groq Whisper Large v3.
@@ -38,78 +181,20 @@ class GroqTranscriptionClient:
             audio_data: Raw PCM audio (16kHz, mono, 16-bit)
             language: Language code (hi, en, or auto)
             prompt: Context prompt for better accuracy
+            translate_to_english: If True, uses direct translation (better for code-switching)
+            timeout: Per-request timeout in seconds
 
         Returns:
             {
                 "text": "transcribed text",
                 "confidence": 0.95,
                 "language": "hi",
-                "duration": 2.5
+                ...
             }
         """
         try:
-            # Convert PCM to WAV format for Groq API
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(16000)  # 16kHz
-                wav_file.writeframes(audio_data)
-
-            wav_buffer.seek(0)
-
-            # Call Groq API (synchronous, but fast ~0.5s)
-            transcription = self.client.audio.transcriptions.create(
-                file=("audio.wav", wav_buffer.read()),
-                model="whisper-large-v3",
-                language=language if language != "auto" else None,
-                prompt=prompt or "This is a business meeting in Hindi and English.",
-                response_format="verbose_json",  # Get confidence scores
-                temperature=0.0  # Deterministic output
-            )
-
-            return {
-                "text": transcription.text.strip(),
-                "confidence": 1.0,  # Groq doesn't return confidence in current API
-                "language": getattr(transcription, 'language', language),
-                "duration": getattr(transcription, 'duration', 0.0)
-            }
-
-        except Exception as e:
-            logger.error(f"❌ Groq transcription error: {e}")
-            return {
-                "text": "",
-                "confidence": 0.0,
-                "error": str(e)
-            }
-
-    def transcribe_audio_sync(
-        self,
-        audio_data: bytes,
-        language: str = "hi",
-        prompt: str = None,
-        translate_to_english: bool = True
-    ) -> dict:
-        """
-        Synchronous version of transcribe_audio.
-        Use this in async contexts with run_in_executor if needed.
-
-        Args:
-            audio_data: Raw PCM audio (16kHz, mono, 16-bit)
-            language: Language code (hi, en, or auto)
-            prompt: Context prompt for better accuracy
-            translate_to_english: If True, uses direct translation (better for code-switching)
-        """
-        try:
-            # Convert PCM to WAV format
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(16000)
-                wav_file.writeframes(audio_data)
-
-            wav_buffer.seek(0)
+            wav_bytes = _pcm_to_wav(audio_data)
+            options = self._request_options(timeout)
 
             # TRANSLATION MODE: Convert any language directly to English
             # This avoids Urdu script and provides clean English output
@@ -118,13 +203,15 @@ class GroqTranscriptionClient:
 
                 # Use the translations endpoint instead of transcriptions
                 # This translates Hindi/Urdu/any language directly to English
-                translation = self.client.audio.translations.create(
-                    file=("audio.wav", wav_buffer.read()),
+                raw = await self.client.audio.translations.with_raw_response.create(
+                    file=("audio.wav", wav_bytes),
                     model="whisper-large-v3",
                     response_format="verbose_json",
-                    temperature=0.0
+                    temperature=0.0,
                     # No language param - auto-detect source, output is always English
+                    **options,
                 )
+                translation = await raw.parse()
 
                 text = translation.text.strip()
                 detected_lang = getattr(translation, 'language', 'auto')
@@ -133,43 +220,47 @@ class GroqTranscriptionClient:
 
                 return {
                     "text": text,
-                    "confidence": 1.0,
+                    "confidence": _segment_confidence(translation),
                     "language": "en",  # Output is always English
                     "translated": True,
-                    "source_language": detected_lang
+                    "source_language": detected_lang,
+                    "rate_limit": _rate_limit_headers(raw.headers),
                 }
 
-            # TRANSCRIPTION-ONLY MODE: If translation disabled
-            else:
-                wav_buffer.seek(0)
-                transcription = self.client.audio.transcriptions.create(
-                    file=("audio.wav", wav_buffer.read()),
-                    model="whisper-large-v3",
-                    language=None,  # Auto-detect
-                    prompt=prompt or "This is a business meeting.",
-                    response_format="verbose_json",
-                    temperature=0.0
-                )
+            # TRANSCRIPTION-ONLY MODE
+            raw = await self.client.audio.transcriptions.with_raw_response.create(
+                file=("audio.wav", wav_bytes),
+                model="whisper-large-v3",
+                language=language if language != "auto" else None,
+                prompt=prompt or "This is a business meeting in Hindi and English.",
+                response_format="verbose_json",  # Get confidence scores
+                temperature=0.0,  # Deterministic output
+                **options,
+            )
+            transcription = await raw.parse()
 
-                text = transcription.text.strip()
-                detected_language = getattr(transcription, 'language', 'unknown')
+            text = transcription.text.strip()
+            detected_language = getattr(transcription, 'language', language)
 
-                logger.info(f"🔍 Transcribed: {detected_language} → '{text[:50]}...'")
+            logger.info(f"🔍 Transcribed: {detected_language} → '{text[:50]}...'")
 
-                return {
-                    "text": text,
-                    "confidence": 1.0,
-                    "language": detected_language,
-                    "translated": False,
-                    "original_text": None
-                }
+            return {
+                "text": text,
+                "confidence": _segment_confidence(transcription),
+                "language": detected_language,
+                "duration": getattr(transcription, 'duration', 0.0),
+                "translated": False,
+                "original_text": None,
+                "rate_limit": _rate_limit_headers(raw.headers),
+            }
 
         except RateLimitError as e:
             logger.error(f"❌ Groq Rate Limit Reached: {e}")
             return {
                 "text": "",
                 "confidence": 0.0,
-                "error": "rate_limit_exceeded"
+                "error": "rate_limit_exceeded",
+                "rate_limit": _rate_limit_headers(getattr(e.response, "headers", None)),
             }
         except Exception as e:
             logger.error(f"❌ Groq transcription error: {e}")
@@ -178,36 +269,39 @@ class GroqTranscriptionClient:
                 "confidence": 0.0,
                 "error": str(e)
             }
+
     async def transcribe_full_audio(
         self,
-        audio_data: bytes,
+        audio_data,
         language: str = "en",
-        prompt: str = None
+        prompt: str = None,
+        timeout: Optional[float] = None,
     ) -> dict:
         """
         Transcribe a large audio file and return detailed segments.
         Used for post-meeting 'Gold Standard' recovery.
+
+        Args:
+            audio_data: Raw PCM bytes, or an AudioSource (streamed from its
+                memory map instead of copied into a WAV in memory)
         """
         try:
-            # Convert PCM to WAV format
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(16000)
-                wav_file.writeframes(audio_data)
-
-            wav_buffer.seek(0)
+            if hasattr(audio_data, "wav_file"):
+                wav_file = audio_data.wav_file()
+            else:
+                wav_file = _pcm_to_wav(audio_data)
 
             # Use translation/transcription based on requirements
             # For gold-standard, we prioritize English output for consistency
-            result = self.client.audio.translations.create(
-                file=("audio.wav", wav_buffer.read()),
+            raw = await self.client.audio.translations.with_raw_response.create(
+                file=("audio.wav", wav_file),
                 model="whisper-large-v3",
                 response_format="verbose_json",
                 temperature=0.0,
-                prompt=prompt or "This is a business meeting transcript."
+                prompt=prompt or "This is a business meeting transcript.",
+                **self._request_options(timeout),
             )
+            result = await raw.parse()
 
             # Extract segments for precise alignment
             segments = []
@@ -219,14 +313,23 @@ class GroqTranscriptionClient:
                         "end": s.get("end", 0.0),
                         "confidence": s.get("avg_logprob", 1.0) # Using logprob as confidence proxy
                     })
-            
+
             return {
                 "text": result.text.strip(),
                 "segments": segments,
                 "language": "en",
-                "duration": getattr(result, 'duration', 0.0)
+                "duration": getattr(result, 'duration', 0.0),
+                "rate_limit": _rate_limit_headers(raw.headers),
             }
 
+        except RateLimitError as e:
+            logger.error(f"❌ Groq Rate Limit Reached: {e}")
+            return {
+                "text": "",
+                "segments": [],
+                "error": "rate_limit_exceeded",
+                "rate_limit": _rate_limit_headers(getattr(e.response, "headers", None)),
+            }
         except Exception as e:
             logger.error(f"❌ Groq full transcription error: {e}")
             return {"text": "", "segments": [], "error": str(e)}
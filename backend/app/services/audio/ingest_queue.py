@@ -0,0 +1,172 @@
+"""
+Bounded ingest queue between the streaming websocket receiver and the
+transcription worker.
+
+The receiver hands every chunk to AudioRecorder first, so overload policies
+here only affect what reaches transcription - never what gets recorded.
+
+Policies when the queue is full:
+- block:       the receiver waits for space (backpressure to the client)
+- coalesce:    merge the chunk into the newest queued chunk (adjacent PCM),
+               blocking only once that chunk reaches max_coalesced_bytes
+- drop_oldest: discard the oldest queued chunk so transcription stays live
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POLICY_BLOCK = "block"
+POLICY_COALESCE = "coalesce"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICIES = (POLICY_BLOCK, POLICY_COALESCE, POLICY_DROP_OLDEST)
+
+AUDIO_QUEUE_MAXSIZE = int(os.getenv("AUDIO_QUEUE_MAXSIZE", "50"))
+AUDIO_QUEUE_POLICY = os.getenv("AUDIO_QUEUE_POLICY", POLICY_COALESCE).lower()
+if AUDIO_QUEUE_POLICY not in POLICIES:
+    logger.warning(
+        f"Unknown AUDIO_QUEUE_POLICY '{AUDIO_QUEUE_POLICY}', using '{POLICY_COALESCE}'"
+    )
+    AUDIO_QUEUE_POLICY = POLICY_COALESCE
+AUDIO_QUEUE_MAX_COALESCED_BYTES = int(
+    os.getenv("AUDIO_QUEUE_MAX_COALESCED_BYTES", str(32000 * 2))  # 2s of PCM
+)
+
+
+class AudioIngestQueue:
+    """
+    Bounded FIFO of (pcm_bytes, client_timestamp, received_at) items.
+
+    received_at is the time.monotonic() at which the chunk reached the
+    server. get() returns None once close() has been called and the queue
+    is drained. Time spent queued is reported to `latency` (a
+    LatencyTracker) when one is attached.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = AUDIO_QUEUE_MAXSIZE,
+        policy: str = AUDIO_QUEUE_POLICY,
+        max_coalesced_bytes: int = AUDIO_QUEUE_MAX_COALESCED_BYTES,
+        latency=None,
+    ):
+        if policy not in POLICIES:
+            logger.warning(
+                f"Unknown audio queue policy '{policy}', using '{AUDIO_QUEUE_POLICY}'"
+            )
+            policy = AUDIO_QUEUE_POLICY
+
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.max_coalesced_bytes = max_coalesced_bytes
+
+        # (chunk, client_timestamp, received_at, enqueued_at)
+        self._items: Deque[Tuple[bytes, Optional[float], float, float]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+        self.latency = latency
+
+        # Metrics
+        self.high_water = 0
+        self.enqueued_chunks = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.coalesced_chunks = 0
+        self.blocked_puts = 0
+        self.blocked_time = 0.0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def _append(self, chunk: bytes, timestamp: Optional[float], received_at: float):
+        self._items.append((chunk, timestamp, received_at, time.monotonic()))
+        self.enqueued_chunks += 1
+        self.high_water = max(self.high_water, len(self._items))
+        self._not_empty.set()
+        if len(self._items) >= self.maxsize:
+            self._not_full.clear()
+
+    async def put(
+        self,
+        chunk: bytes,
+        timestamp: Optional[float] = None,
+        received_at: Optional[float] = None,
+    ):
+        """Enqueue a chunk, applying the overload policy if full."""
+        if self._closed:
+            return
+        if received_at is None:
+            received_at = time.monotonic()
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == POLICY_DROP_OLDEST:
+                dropped = self._items.popleft()[0]
+                self.dropped_chunks += 1
+                self.dropped_bytes += len(dropped)
+                if self.dropped_chunks % 50 == 1:
+                    logger.warning(
+                        f"⚠️ Audio queue full, dropped {self.dropped_chunks} chunks so far"
+                    )
+                self._append(chunk, timestamp, received_at)
+                return
+
+            if self.policy == POLICY_COALESCE:
+                tail, tail_ts, _, tail_enqueued = self._items[-1]
+                if len(tail) + len(chunk) <= self.max_coalesced_bytes:
+                    # The merged item is as fresh as its newest audio
+                    self._items[-1] = (tail + chunk, tail_ts, received_at, tail_enqueued)
+                    self.coalesced_chunks += 1
+                    return
+
+            # block (or coalesce with a full tail): wait for the worker
+            self.blocked_puts += 1
+            started = time.monotonic()
+            while len(self._items) >= self.maxsize and not self._closed:
+                await self._not_full.wait()
+            self.blocked_time += time.monotonic() - started
+            if self._closed:
+                return
+
+        self._append(chunk, timestamp, received_at)
+
+    async def get(self) -> Optional[Tuple[bytes, Optional[float], float]]:
+        """Dequeue the next chunk; None once closed and drained."""
+        while not self._items:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        chunk, timestamp, received_at, enqueued_at = self._items.popleft()
+        if len(self._items) < self.maxsize:
+            self._not_full.set()
+        if self.latency is not None:
+            self.latency.observe("queue_wait", time.monotonic() - enqueued_at)
+        return chunk, timestamp, received_at
+
+    def close(self):
+        """Stop accepting chunks; the consumer drains what is left."""
+        self._closed = True
+        self._not_empty.set()
+        self._not_full.set()
+
+    def get_stats(self) -> dict:
+        return {
+            "queue_depth": len(self._items),
+            "queue_high_water": self.high_water,
+            "queue_maxsize": self.maxsize,
+            "queue_policy": self.policy,
+            "enqueued_chunks": self.enqueued_chunks,
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_bytes": self.dropped_bytes,
+            "coalesced_chunks": self.coalesced_chunks,
+            "blocked_puts": self.blocked_puts,
+            "blocked_time_ms": round(self.blocked_time * 1000, 1),
+        }
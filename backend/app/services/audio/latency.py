@@ -0,0 +1,151 @@
+"""
+Stage latency histograms for the live transcription pipeline.
+
+Each chunk and each transcription window is timed through the pipeline:
+
+    receive      websocket message → chunk queued (decode, resample, recorder)
+    queue_wait   queued → picked up by the session's audio worker
+    vad          StreamingVADSession.process
+    buffer       RollingAudioBuffer.add_samples
+    groq         window triggered → transcription result (scheduler + Groq)
+    dedup        result → final ready (in-order merge, dedup, triggers)
+    send         on_final (websocket send, hub publish, write-behind)
+    end_to_end   newest audio of the segment received → final sent
+
+Per-chunk stages are unlabeled ("all"). Window and final stages are
+labeled by trigger reason (silence, punctuation, timeout, stability,
+sentence_complete), or "no_final" for windows that did not finalize.
+
+Histograms use fixed millisecond buckets, so memory is constant however
+long a session runs. Each manager has its own LatencyTracker (reported in
+get_stats) that also feeds the process-wide one behind /streaming/metrics
+and /streaming/latency.
+"""
+
+import bisect
+from typing import Dict, Optional, Tuple
+
+STAGES = ("receive", "queue_wait", "vad", "buffer", "groq", "dedup", "send", "end_to_end")
+
+LABEL_ALL = "all"
+LABEL_NO_FINAL = "no_final"
+
+# Upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (
+    0.5,
+    1,
+    2,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    1500,
+    2000,
+    3000,
+    5000,
+    7500,
+    10000,
+    15000,
+    30000,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in milliseconds."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """Estimate (linear within the bucket, capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(estimate, self.max_ms)
+            seen += n
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class LatencyTracker:
+    """Histograms per (stage, label); observations also go to `parent`."""
+
+    def __init__(self, parent: Optional["LatencyTracker"] = None):
+        self.parent = parent
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def observe(self, stage: str, seconds: float, label: Optional[str] = None):
+        """Record one duration (seconds) for a stage."""
+        key = (stage, label or LABEL_ALL)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+        histogram.observe(max(0.0, seconds) * 1000)
+        if self.parent is not None:
+            self.parent.observe(stage, seconds, label)
+
+    def summary(self) -> dict:
+        """{stage: {label: count/avg/p50/p95/p99/max}} in pipeline order."""
+        result: Dict[str, dict] = {}
+        for stage, label in sorted(self._histograms, key=_stage_order):
+            result.setdefault(stage, {})[label] = self._histograms[(stage, label)].summary()
+        return result
+
+    def histograms(self) -> dict:
+        """Raw bucket counts, for plotting or external aggregation."""
+        result: Dict[str, dict] = {}
+        for stage, label in sorted(self._histograms, key=_stage_order):
+            histogram = self._histograms[(stage, label)]
+            result.setdefault(stage, {})[label] = {
+                "counts": list(histogram.counts),
+                "sum_ms": round(histogram.total_ms, 1),
+                "count": histogram.count,
+            }
+        return {"buckets_ms": list(BUCKETS_MS), "stages": result}
+
+
+def _stage_order(key: Tuple[str, str]):
+    stage, label = key
+    return (STAGES.index(stage) if stage in STAGES else len(STAGES), stage, label)
+
+
+_pipeline_latency: Optional[LatencyTracker] = None
+
+
+def get_pipeline_latency() -> LatencyTracker:
+    """Get the process-wide tracker (aggregate of all sessions)."""
+    global _pipeline_latency
+    if _pipeline_latency is None:
+        _pipeline_latency = LatencyTracker()
+    return _pipeline_latency
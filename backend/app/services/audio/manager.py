@@ -2,6 +2,13 @@
 Streaming transcription manager.
 Orchestrates: Audio → VAD → Rolling Buffer → Groq API → Partial/Final transcripts
 
+PIPELINE:
+- Ingest stage (process_audio_chunk): VAD, buffering and silence triggers.
+  Never waits on the network, so per-chunk latency stays in the ms range.
+- Inference stage: each triggered window is sent to Groq in a background
+  task (bounded in-flight per session). Results are merged back strictly in
+  window order, so dedup state sees them in audio-time order.
+
 QUALITY IMPROVEMENTS (Phase 3):
 - Better deduplication with sentence hashing
 - Silero VAD for accurate speech detection (with SimpleVAD fallback)
@@ -13,54 +20,87 @@ QUALITY IMPROVEMENTS (Phase 3):
 import asyncio
 import numpy as np
 import logging
+import os
 import time
 import hashlib
-from typing import Optional, Callable, Set
-from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Callable, Set, Dict
 from .groq_client import GroqTranscriptionClient
+from .scheduler import (
+    TranscriptionScheduler,
+    get_transcription_scheduler,
+    PRIORITY_LIVE,
+    PRIORITY_FLUSH,
+)
 from .buffer import RollingAudioBuffer
-from .vad import SimpleVAD, SileroVAD, TenVAD
+from .dedup import OverlapIndex, NgramIndex, RecentHashSet, TranscriptTail
+from .speech_window import extract_speech, SpeechTimeMap, MODES, MODE_OFF
+from .vad import StreamingVADSession
+from .vad_pool import VADPool, get_vad_pool
+from .latency import LABEL_NO_FINAL, LatencyTracker, get_pipeline_latency
+from .cadence import CadenceController
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _InferenceWindow:
+    """Snapshot of one triggered window, taken at ingest time."""
+
+    seq: int
+    audio: bytes
+    prompt: Optional[str]
+    speech_start_time: float
+    speech_end_time: float
+    time_map: Optional[SpeechTimeMap]
+    on_partial: Optional[Callable]
+    on_final: Optional[Callable]
+    on_error: Optional[Callable]
+    triggered_at: float = 0.0  # time.monotonic() at trigger
+    received_at: Optional[float] = None  # Newest audio in the window reached the server
+    result_at: Optional[float] = None  # Transcription result arrived
+    speech_density: Optional[float] = None  # Fraction of the window VAD marked as speech
+
+
 class StreamingTranscriptionManager:
     """
     Orchestrates real-time transcription pipeline:
     Audio → VAD → Rolling Buffer → Groq API → Partial/Final
     """
 
-    def __init__(self, groq_api_key: str):
+    def __init__(
+        self,
+        groq_api_key: str,
+        session_id: Optional[str] = None,
+        scheduler: Optional[TranscriptionScheduler] = None,
+        vad_pool: Optional[VADPool] = None,
+        vad=None,
+    ):
         """
         Args:
             groq_api_key: Groq API key for Whisper Large v3
+            session_id: Streaming session ID (scheduler fairness/coalescing key)
+            scheduler: Transcription scheduler (defaults to the process-wide one)
+            vad_pool: VAD pool (defaults to the process-wide one)
+            vad: Instance already checked out of vad_pool (see create());
+                acquired here, blocking, when omitted
         """
         self.groq = GroqTranscriptionClient(groq_api_key)
-
-        # VAD Initialization Strategy: ONLY TenVAD
-        self.vad = None
-
-        # 1. TenVAD (High Performance C++) - STRICT enforcement
-        try:
-            self.vad = TenVAD(threshold=0.5)
-            logger.info("✅ Using TenVAD (C++ based) with threshold 0.5")
-        except Exception as e:
-            logger.error(f"❌ TenVAD failed to load: {e}")
-            raise RuntimeError("TenVAD is required but failed to load. Aborting.")
-
-        # COMMENTED OUT: No fallbacks allowed per user request
-        # 2. Try SileroVAD (ML based, PyTorch)
-        # if self.vad is None:
-        #     try:
-        #         self.vad = SileroVAD(threshold=0.3)
-        #         logger.info("✅ Using SileroVAD (ML-based)")
-        #     except Exception as e:
-        #         logger.warning(f"⚠️ SileroVAD failed to load: {e}")
-
-        # 3. Fallback to SimpleVAD (Amplitude based)
-        # if self.vad is None:
-        #     self.vad = SimpleVAD(threshold=0.08)
-        #     logger.info("ℹ️ Using SimpleVAD (Fallback)")
+        self.session_id = session_id or str(id(self))
+        self.scheduler = scheduler or get_transcription_scheduler()
+
+        # VAD: preloaded instance from the process-wide pool (backend and
+        # threshold come from VAD_BACKEND / VAD_THRESHOLD, default TenVAD 0.5)
+        self.vad_pool = vad_pool or get_vad_pool()
+        if vad is None:
+            try:
+                vad = self.vad_pool.acquire()
+            except Exception as e:
+                raise self._vad_load_error(self.vad_pool, e)
+        self.vad = vad
+
+        # Stream-aligned VAD state: leftover samples, smoothing, hysteresis
+        self.vad_stream = StreamingVADSession(self.vad)
 
         # IMPROVED: Optimized for real-time responsiveness
         # 6s window provides enough context for grammar, but is short enough to fail fast
@@ -71,23 +111,57 @@ class StreamingTranscriptionManager:
 
         # Transcript state
         self.last_partial_text = ""
-        self.last_final_text = ""
+        # Bounded tail of the finalized transcript (prompt context + totals)
+        self.final_tail = TranscriptTail(max_words=100, max_chars=1000)
         self.silence_duration_ms = 0
         self.same_text_count = 0
         self.is_speaking = False
 
         # IMPROVED: Track finalized sentence hashes to prevent duplicates
-        self.finalized_hashes: Set[str] = set()
-        self.finalized_words: Set[str] = (
-            set()
-        )  # Track individual words for overlap detection
-
-        # Thread pool for Groq API calls (blocking)
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # (bounded: only recent sentences can realistically repeat)
+        self.finalized_hashes = RecentHashSet(maxlen=512)
+
+        # Normalized tail of finalized words for overlap removal
+        self.overlap_index = OverlapIndex()
+
+        # Hashed 3-grams of recent finalized words for near-duplicate checks
+        self.ngram_horizon_words = 100
+        self.ngram_index = NgramIndex(n=3, horizon_words=self.ngram_horizon_words)
+
+        # Inference stage: background Groq requests, merged back in window order
+        self.max_in_flight = 2
+        self._inference_tasks: Set[asyncio.Task] = set()
+        self._next_window_seq = 0
+        self._next_merge_seq = 0
+        self._pending_results: Dict[int, tuple] = {}
+        self._merge_lock = asyncio.Lock()
+
+        # Websocket ingest queue and codec decoder feeding this manager
+        # (set by the router)
+        self.ingest_queue = None
+        self.stream_decoder = None
+
+        # Speech-only upload: drop silence from windows before sending
+        # ('off', 'trim' leading/trailing, 'compact' also long pauses)
+        self.speech_window_mode = os.getenv("SPEECH_WINDOW_MODE", MODE_OFF).lower()
+        if self.speech_window_mode not in MODES:
+            logger.warning(f"Unknown SPEECH_WINDOW_MODE '{self.speech_window_mode}', using 'off'")
+            self.speech_window_mode = MODE_OFF
+        self.speech_pad_ms = 200
+        self.speech_keep_gap_ms = 300
+        self.buffer_end_time = 0.0  # Client time just past the newest buffered sample
+        self.upload_bytes = 0
+        self.upload_bytes_saved = 0
+        self.windows_skipped_silent = 0
 
         # Performance metrics
         self.total_chunks_processed = 0
         self.total_transcriptions = 0
+        # Stage latency histograms (see latency.py), also fed to the
+        # process-wide tracker
+        self.latency = LatencyTracker(parent=get_pipeline_latency())
+        self._last_received_at: Optional[float] = None  # Newest chunk's arrival
+        self._speech_end_received_at: Optional[float] = None  # Last speech chunk's
 
         # SMART TIMER CONFIG
         self.session_start_time = (
@@ -112,6 +186,13 @@ class StreamingTranscriptionManager:
             3.0  # Check every 3.0s (less frequency to avoid Groq 429)
         )
 
+        # Adaptive interval/window (ADAPTIVE_CADENCE, see cadence.py); the
+        # values above are its starting point and resting values
+        self.cadence = CadenceController(
+            interval=self.min_transcription_interval,
+            window_ms=self.buffer.window_duration_ms,
+        )
+
         logger.info(
             "✅ StreamingTranscriptionManager initialized (SMART TIMER: 1.0s silence, 6s max)"
         )
@@ -123,6 +204,7 @@ class StreamingTranscriptionManager:
         on_partial: Optional[Callable] = None,
         on_final: Optional[Callable] = None,
         on_error: Optional[Callable] = None,
+        received_at: Optional[float] = None,
     ):
         """
         Process incoming audio chunk with client-provided timestamp for precision.
@@ -134,7 +216,11 @@ class StreamingTranscriptionManager:
             on_partial: Callback for partial transcripts
             on_final: Callback for final transcripts
             on_error: Callback for error messages
+            received_at: time.monotonic() when the chunk reached the server
+                         (for end-to-end latency; defaults to now)
         """
+        self._last_received_at = received_at or time.monotonic()
+
         # Use client timestamp as source of truth (prevents network jitter)
         if client_timestamp is None:
             # Fallback: estimate based on session start (legacy mode)
@@ -171,34 +257,45 @@ class StreamingTranscriptionManager:
         # Convert bytes to numpy array
         audio_samples = np.frombuffer(audio_data, dtype=np.int16)
 
-        # Check for speech
-        is_speech = self.vad.is_speech(audio_samples)
+        # Check for speech (frame-aligned across chunks, with hysteresis)
+        stage_start = time.monotonic()
+        vad_result = self.vad_stream.process(audio_samples)
+        vad_done = time.monotonic()
+        self.latency.observe("vad", vad_done - stage_start)
 
         # CRITICAL FIX: Always add to buffer to maintain time continuity
         # Previously, silence was dropped, causing the buffer to never fill if speech was sparse
-        self.buffer.add_samples(audio_samples)
+        self.buffer.add_samples(audio_samples, vad_result.speech_mask)
+        self.buffer_end_time = current_end_time
+        self.latency.observe("buffer", time.monotonic() - vad_done)
+
+        # Exact speech boundaries (sample offsets → client time)
+        for kind, offset in vad_result.events:
+            event_time = timestamp + vad_result.relative_time(offset)
+            if kind == "start":
+                if not self.is_speaking:
+                    logger.debug(f"🎤 Speech started at {event_time:.3f}s")
+                    self.is_speaking = True
+                    self.speech_start_time = event_time
+            else:
+                self.speech_end_time = event_time
 
-        if is_speech:
+        if vad_result.any_speech:
             self.last_speech_time = time.time()
-            if not self.is_speaking:
-                logger.debug(f"🎤 Speech started at {timestamp:.3f}s")
-                self.is_speaking = True
-                self.speech_start_time = timestamp
 
+        if vad_result.in_speech:
             # Update end time continuously while speaking
             self.speech_end_time = current_end_time
             self.silence_duration_ms = 0
+            self._speech_end_received_at = self._last_received_at
 
-        else:
-            # Silence detected
-            if self.is_speaking:
-                self.silence_duration_ms += chunk_duration * 1000  # Use actual duration
-
-                # SMART TRIGGER: Finalize if silence > 1200ms
-                if (
-                    self.silence_duration_ms > self.silence_threshold_ms
-                    and self.last_partial_text
-                ):
+        elif self.is_speaking:
+            # Silence measured from the true end of speech, not chunk counts
+            self.silence_duration_ms = (current_end_time - self.speech_end_time) * 1000
+
+            # SMART TRIGGER: Finalize if silence > 1000ms
+            if self.silence_duration_ms > self.silence_threshold_ms:
+                if self.last_partial_text:
                     # Hash-based deduplication check
                     sentence_hash = self._get_sentence_hash(self.last_partial_text)
 
@@ -208,7 +305,8 @@ class StreamingTranscriptionManager:
                         )
 
                         if on_final:
-                            await on_final(
+                            await self._emit_final(
+                                on_final,
                                 {
                                     "text": self.last_partial_text,
                                     "confidence": 1.0,
@@ -217,11 +315,11 @@ class StreamingTranscriptionManager:
                                     "audio_end_time": self.speech_end_time,
                                     "duration": self.speech_end_time
                                     - self.speech_start_time,
-                                }
+                                },
+                                received_at=self._speech_end_received_at,
                             )
 
-                        self.finalized_hashes.add(sentence_hash)
-                        self.last_final_text += " " + self.last_partial_text
+                        self._record_final(self.last_partial_text, sentence_hash)
                     else:
                         logger.debug(
                             f"⏭️  Skipping duplicate (silence): '{self.last_partial_text[:50]}...'"
@@ -229,8 +327,11 @@ class StreamingTranscriptionManager:
 
                     self.last_partial_text = ""
                     self.same_text_count = 0
-                    self.is_speaking = False
-                    self.speech_start_time = 0  # Reset speech timer
+
+                # Segment is over either way (noise bursts leave no partial),
+                # so the next onset starts a fresh segment
+                self.is_speaking = False
+                self.speech_start_time = 0  # Reset speech timer
 
         # Check triggers regardless of current speech state (since buffer is filling)
         buffer_duration = self.buffer.get_buffer_duration_ms()
@@ -249,51 +350,18 @@ class StreamingTranscriptionManager:
 
         if is_full and time_since_last >= self.min_transcription_interval:
             if has_recent_speech:
-                logger.info(
-                    f"🚀 Transcription triggered (buffer={buffer_duration:.0f}ms)"
-                )
-
-                # Get window and transcribe
-                window_bytes = self.buffer.get_window_bytes()
-                self.last_transcription_time = current_time
-
-                # Transcribe with Groq (run in thread pool since it's blocking)
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    self.executor,
-                    self.groq.transcribe_audio_sync,
-                    window_bytes,
-                    "auto",  # Auto-detect language
-                    self.last_final_text[-100:] if self.last_final_text else None,
-                    True,  # translate_to_english=True
-                )
-
-                if result.get("error") == "rate_limit_exceeded":
-                    logger.warning("⚠️ Groq Rate Limit Exceeded")
-                    if on_error:
-                        await on_error(
-                            "Groq API Rate Limit Reached. Please wait a moment or check your plan.",
-                            code="GROQ_RATE_LIMIT",
-                        )
-                elif result.get("error") and (
-                    "401" in str(result.get("error"))
-                    or "invalid_api_key" in str(result.get("error"))
-                ):
-                    logger.error("❌ Groq Invalid API Key")
-                    if on_error:
-                        await on_error(
-                            "Groq API Key is invalid or missing. Please check your settings.",
-                            code="GROQ_KEY_REQUIRED",
-                        )
-                elif result["text"]:
-                    self.total_transcriptions += 1
-                    await self._handle_transcript(
-                        text=result["text"],
-                        confidence=result.get("confidence", 1.0),
-                        on_partial=on_partial,
-                        on_final=on_final,
-                        metadata=result,
+                if len(self._inference_tasks) >= self.max_in_flight:
+                    # Inference stage saturated - retry on a later chunk
+                    # (leave last_transcription_time so we re-trigger ASAP)
+                    logger.debug(
+                        f"⏳ {len(self._inference_tasks)} windows in flight, deferring"
+                    )
+                else:
+                    logger.info(
+                        f"🚀 Transcription triggered (buffer={buffer_duration:.0f}ms)"
                     )
+                    self.last_transcription_time = current_time
+                    self._start_inference(on_partial, on_final, on_error)
             else:
                 # Buffer is full but it's just silence.
                 # Update timestamp to prevent spinning, but don't call API.
@@ -307,70 +375,218 @@ class StreamingTranscriptionManager:
         if processing_time > 0.1:  # Log if taking >100ms
             logger.debug(f"⏱️  Chunk processing: {processing_time * 1000:.1f}ms")
 
-    def _word_similarity(self, words1: list, words2: list) -> float:
-        """Calculate similarity between two word lists (0.0 to 1.0)."""
-        if not words1 or not words2:
-            return 0.0
-        # Count matching words
-        set1 = set(w.lower() for w in words1)
-        set2 = set(w.lower() for w in words2)
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
-        return intersection / union if union > 0 else 0.0
-
-    def _remove_overlap(self, new_text: str) -> str:
+    def _snapshot_window(self):
         """
-        Remove overlapping text using fuzzy matching.
-        Handles Whisper's slight wording variations in overlapping audio.
+        Current window bytes, optionally reduced to speech only.
 
-        Uses word-level similarity to detect overlaps even when exact text differs.
+        Returns:
+            (audio_bytes, time_map) - audio_bytes is empty if speech-only
+            mode found nothing to send.
         """
-        if not self.last_final_text:
-            return new_text
-
-        final_words = self.last_final_text.split()
-        new_words = new_text.split()
-
-        if len(new_words) < 4:
-            return new_text
-
-        # Look for overlaps in the first 40% of new text (overlap window)
-        max_overlap_check = min(20, len(new_words) // 2 + 5)
+        if self.speech_window_mode == MODE_OFF:
+            return self.buffer.get_window_bytes(), None
+
+        window = self.buffer.get_window()
+        window_start_time = self.buffer_end_time - len(window) / self.buffer.sample_rate
+        samples, time_map = extract_speech(
+            window,
+            self.buffer.get_window_speech_mask(),
+            window_start_time,
+            sample_rate=self.buffer.sample_rate,
+            mode=self.speech_window_mode,
+            pad_ms=self.speech_pad_ms,
+            keep_gap_ms=self.speech_keep_gap_ms,
+        )
+        self.upload_bytes_saved += (len(window) - len(samples)) * 2
+        return samples.tobytes(), time_map
 
-        # Get last 30 words of previous transcript for comparison
-        search_window = min(
-            50, len(final_words)
-        )  # Increased from 30 to catch more context
-        final_tail_words = final_words[-search_window:]
+    def _start_inference(
+        self,
+        on_partial: Optional[Callable],
+        on_final: Optional[Callable],
+        on_error: Optional[Callable],
+    ):
+        """Snapshot the current window and transcribe it in the background."""
+        audio, time_map = self._snapshot_window()
+        # Need at least ~0.3s of speech for Whisper to be worth calling
+        if len(audio) < self.buffer.sample_rate * 2 * 0.3:
+            self.windows_skipped_silent += 1
+            logger.debug("⏭️  Window has no speech after extraction, skipping")
+            return
+        self.upload_bytes += len(audio)
+
+        window = _InferenceWindow(
+            seq=self._next_window_seq,
+            audio=audio,
+            prompt=self.final_tail.prompt(100),
+            speech_start_time=self.speech_start_time,
+            speech_end_time=self.speech_end_time,
+            time_map=time_map,
+            on_partial=on_partial,
+            on_final=on_final,
+            on_error=on_error,
+            triggered_at=time.monotonic(),
+            received_at=self._last_received_at,
+            speech_density=float(self.buffer.get_window_speech_mask().mean()),
+        )
+        self._next_window_seq += 1
 
-        best_overlap = 0
-        similarity_threshold = 0.5  # Lowered from 0.6 to catch more overlaps
+        task = asyncio.create_task(self._run_inference(window))
+        self._inference_tasks.add(task)
+        task.add_done_callback(self._inference_tasks.discard)
 
-        # Try different overlap sizes, largest first
-        for overlap_size in range(max_overlap_check, 2, -1):
-            new_head = new_words[:overlap_size]
+    async def _run_inference(self, window: _InferenceWindow):
+        """Inference stage: one Groq round-trip, then in-order merge."""
+        try:
+            # Transcribe with Groq via the shared scheduler (rate limited,
+            # coalesced if this session falls behind)
+            result = await self.scheduler.submit(
+                self.session_id,
+                self.groq.api_key,
+                window.audio,
+                priority=PRIORITY_LIVE,
+                kwargs={
+                    "language": "auto",  # Auto-detect language
+                    "prompt": window.prompt,
+                    "translate_to_english": True,
+                },
+            )
+        except Exception as e:
+            logger.error(f"❌ Window {window.seq} transcription failed: {e}")
+            result = {"text": "", "confidence": 0.0, "error": str(e)}
+        window.result_at = time.monotonic()
+
+        if window.seq < self._next_merge_seq:
+            return  # Window was dropped by reset()
+        self._pending_results[window.seq] = (window, result)
+
+        # Merge strictly in window order; a slow earlier window holds back
+        # later ones so dedup state always advances in audio time
+        async with self._merge_lock:
+            while self._next_merge_seq in self._pending_results:
+                ready_window, ready_result = self._pending_results.pop(
+                    self._next_merge_seq
+                )
+                self._next_merge_seq += 1
+                try:
+                    await self._apply_result(ready_window, ready_result)
+                except Exception as e:
+                    logger.error(f"❌ Failed to merge window {ready_window.seq}: {e}")
+
+    async def _apply_result(self, window: _InferenceWindow, result: dict):
+        """Surface errors or hand the transcript to the trigger logic."""
+        on_error = window.on_error
+        finalized = None
+        self._observe_cadence(window, result)
+
+        if result.get("error") == "rate_limit_exceeded":
+            logger.warning("⚠️ Groq Rate Limit Exceeded")
+            if on_error:
+                await on_error(
+                    "Groq API Rate Limit Reached. Please wait a moment or check your plan.",
+                    code="GROQ_RATE_LIMIT",
+                )
+        elif result.get("error") and (
+            "401" in str(result.get("error"))
+            or "invalid_api_key" in str(result.get("error"))
+        ):
+            logger.error("❌ Groq Invalid API Key")
+            if on_error:
+                await on_error(
+                    "Groq API Key is invalid or missing. Please check your settings.",
+                    code="GROQ_KEY_REQUIRED",
+                )
+        elif result["text"]:
+            self.total_transcriptions += 1
+            finalized = await self._handle_transcript(
+                text=result["text"],
+                confidence=result.get("confidence", 1.0),
+                on_partial=window.on_partial,
+                on_final=window.on_final,
+                metadata=result,
+                speech_start_time=window.speech_start_time,
+                speech_end_time=window.speech_end_time,
+                time_map=window.time_map,
+                window=window,
+            )
 
-            # Check similarity against different positions in final tail
-            for start in range(0, min(15, search_window)):
-                if start + overlap_size > search_window:
-                    break
+        if not finalized and window.result_at is not None:
+            self.latency.observe(
+                "groq", window.result_at - window.triggered_at, LABEL_NO_FINAL
+            )
 
-                final_segment = final_tail_words[start : start + overlap_size]
-                similarity = self._word_similarity(new_head, final_segment)
+    def _observe_cadence(self, window: _InferenceWindow, result: dict):
+        """Feed a window's round-trip to the cadence controller."""
+        rate_limited = bool(
+            result.get("error") == "rate_limit_exceeded"
+            or result.get("rate_limit_retries")
+        )
+        if not rate_limited and (
+            result.get("coalesced") or result.get("expired") or result.get("error")
+        ):
+            return  # Skipped or failed: says nothing about API latency
+        changed = self.cadence.on_result(
+            now=time.monotonic(),
+            latency=window.result_at - window.triggered_at,
+            rate_limited=rate_limited,
+            confidence=result.get("confidence") if result.get("text") else None,
+            speech_density=window.speech_density,
+        )
+        if changed:
+            self._apply_cadence()
+
+    def _apply_cadence(self):
+        """Adopt the controller's interval and window."""
+        self.min_transcription_interval = self.cadence.interval
+        if self.cadence.window_ms != self.buffer.window_duration_ms:
+            self.buffer.set_window_duration(self.cadence.window_ms)
+            # Force-finalize timeout matches the window
+            self.max_buffer_duration_ms = self.cadence.window_ms
+
+    async def _emit_final(
+        self,
+        on_final: Callable,
+        final_data: dict,
+        received_at: Optional[float] = None,
+        window: Optional[_InferenceWindow] = None,
+    ):
+        """Send a final, timing the stages that led to it by trigger reason."""
+        reason = final_data.get("reason")
+        send_start = time.monotonic()
+        if window is not None and window.result_at is not None:
+            self.latency.observe("groq", window.result_at - window.triggered_at, reason)
+            self.latency.observe("dedup", send_start - window.result_at, reason)
+
+        await on_final(final_data)
+
+        sent = time.monotonic()
+        self.latency.observe("send", sent - send_start, reason)
+        if received_at is not None:
+            self.latency.observe("end_to_end", sent - received_at, reason)
+
+    async def wait_for_inference(self, timeout: float = 10.0):
+        """Wait for in-flight windows to be transcribed and merged."""
+        if not self._inference_tasks:
+            return
+        done, pending = await asyncio.wait(
+            set(self._inference_tasks), timeout=timeout
+        )
+        if pending:
+            logger.warning(f"⚠️ {len(pending)} windows still in flight after {timeout}s")
 
-                if similarity >= similarity_threshold:
-                    best_overlap = max(best_overlap, overlap_size)
-                    break
+    def _remove_overlap(self, new_text: str) -> str:
+        """
+        Remove overlapping text using fuzzy matching.
+        Handles Whisper's slight wording variations in overlapping audio.
 
-            # Also check if new_head matches the END of final_tail
-            if overlap_size <= search_window:
-                final_end = final_tail_words[-overlap_size:]
-                similarity = self._word_similarity(new_head, final_end)
-                if similarity >= similarity_threshold:
-                    best_overlap = max(best_overlap, overlap_size)
+        Uses word-level similarity to detect overlaps even when exact text
+        differs (see OverlapIndex for the matching rule).
+        """
+        if not self.overlap_index:
+            return new_text
 
-            if best_overlap > 0:
-                break
+        new_words = new_text.split()
+        best_overlap = self.overlap_index.find_overlap(new_words)
 
         # Remove overlapping words
         if best_overlap > 0:
@@ -393,54 +609,23 @@ class StreamingTranscriptionManager:
         sentence_endings = (".", "!", "?", "。", "？", "！", "।")
         return text.endswith(sentence_endings)
 
-    def _extract_new_words(self, text: str) -> str:
-        """Remove words already seen in finalized transcripts."""
-        words = text.split()
-        new_words = []
-        for word in words:
-            word_lower = word.lower().strip(".,!?;:")
-            if word_lower and word_lower not in self.finalized_words:
-                new_words.append(word)
-                self.finalized_words.add(word_lower)
-        return " ".join(new_words)
-
-    def _get_ngrams(self, text: str, n: int = 4) -> set:
-        """Get n-grams (word sequences) from text for similarity matching."""
-        words = text.lower().split()
-        if len(words) < n:
-            return {" ".join(words)} if words else set()
-        return {" ".join(words[i : i + n]) for i in range(len(words) - n + 1)}
+    @property
+    def last_final_text(self) -> str:
+        """Recent finalized text (capped; see TranscriptTail)."""
+        return self.final_tail.text
 
     def _is_near_duplicate(self, text: str, threshold: float = 0.5) -> bool:
         """Check if text is a near-duplicate of already finalized content.
 
         Uses n-gram matching to catch phrases like 'we can jump on the call'
         that appear in both old and new text even if exact hash differs.
+        3-grams of the last ngram_horizon_words finalized words are kept
+        hashed in self.ngram_index, so this is one lookup per 3-gram.
         """
-        if not self.last_final_text or len(text.split()) < 5:
-            return False
-
-        # Get 3-grams from new text (changed from 4 for finer detection)
-        new_ngrams = self._get_ngrams(text, n=3)
-        if not new_ngrams:
+        if not self.ngram_index or len(text.split()) < 5:
             return False
 
-        # Get 3-grams from last portion of finalized text
-        final_words = self.last_final_text.split()
-        # Only check last ~100 words for performance
-        recent_final = (
-            " ".join(final_words[-100:])
-            if len(final_words) > 100
-            else self.last_final_text
-        )
-        final_ngrams = self._get_ngrams(recent_final, n=3)
-
-        if not final_ngrams:
-            return False
-
-        # Calculate overlap ratio
-        overlap = len(new_ngrams & final_ngrams)
-        overlap_ratio = overlap / len(new_ngrams)
+        overlap_ratio = self.ngram_index.overlap_ratio(text)
 
         if overlap_ratio >= threshold:
             logger.debug(
@@ -450,6 +635,13 @@ class StreamingTranscriptionManager:
 
         return False
 
+    def _record_final(self, text: str, sentence_hash: str):
+        """Update all dedup state with newly finalized text."""
+        self.finalized_hashes.add(sentence_hash)
+        self.final_tail.append(text)
+        self.overlap_index.add_text(text)
+        self.ngram_index.add_text(text)
+
     def _is_hallucination(self, text: str) -> bool:
         """Check for common Whisper hallucinations."""
         text = text.strip().lower()
@@ -490,14 +682,31 @@ class StreamingTranscriptionManager:
         on_partial: Optional[Callable],
         on_final: Optional[Callable],
         metadata: Optional[dict] = None,
-    ):
+        speech_start_time: Optional[float] = None,
+        speech_end_time: Optional[float] = None,
+        time_map: Optional[SpeechTimeMap] = None,
+        window: Optional[_InferenceWindow] = None,
+    ) -> Optional[str]:
         """Handle partial vs final transcript logic with improved deduplication.
 
         QUALITY IMPROVEMENTS:
         - Hash-based duplicate detection
         - Sentence boundary detection
         - Debounced final emissions
+
+        speech_start_time/speech_end_time are the speech bounds snapshotted
+        when the window was sent (default: the current ones). With
+        speech-only upload, time_map narrows the reported audio times to the
+        audio that was actually sent. window (if given) is used for stage
+        latency.
+
+        Returns:
+            The trigger reason if a final was emitted, else None.
         """
+        if speech_start_time is None:
+            speech_start_time = self.speech_start_time
+        if speech_end_time is None:
+            speech_end_time = self.speech_end_time
 
         # Skip empty or very short text
         if not text or len(text.strip()) < 2:
@@ -506,6 +715,8 @@ class StreamingTranscriptionManager:
         # HALLUCINATION FILTER
         if self._is_hallucination(text):
             logger.info(f"👻 Filtered hallucination: '{text}'")
+            if self.cadence.on_filtered(time.monotonic()):
+                self._apply_cadence()
             return
 
         # IMPROVED: Remove overlapping words from start
@@ -555,8 +766,8 @@ class StreamingTranscriptionManager:
 
         # Calculate speech duration (using client-synced timestamps)
         speech_duration_ms = (
-            (self.speech_end_time - self.speech_start_time) * 1000
-            if self.speech_start_time > 0
+            (speech_end_time - speech_start_time) * 1000
+            if speech_start_time > 0
             else 0
         )
 
@@ -604,8 +815,13 @@ class StreamingTranscriptionManager:
                 )
 
                 # Calculate timing (using accurate client timestamps)
-                audio_start = self.speech_start_time
-                audio_end = self.speech_end_time
+                audio_start = speech_start_time
+                audio_end = speech_end_time
+                if time_map is not None and time_map.pieces:
+                    clipped_start = max(audio_start, time_map.start_time)
+                    clipped_end = min(audio_end, time_map.end_time)
+                    if clipped_start < clipped_end:
+                        audio_start, audio_end = clipped_start, clipped_end
                 duration = audio_end - audio_start
 
                 final_data = {
@@ -624,15 +840,23 @@ class StreamingTranscriptionManager:
                     if metadata.get("translated"):
                         final_data["translated"] = metadata["translated"]
 
-                await on_final(final_data)
+                await self._emit_final(
+                    on_final,
+                    final_data,
+                    received_at=window.received_at if window else None,
+                    window=window,
+                )
 
                 # Track finalized text
-                self.finalized_hashes.add(sentence_hash)
-                self.last_final_text += " " + text
+                self._record_final(text, sentence_hash)
                 self.last_partial_text = ""
                 self.same_text_count = 0
-                # Reset for next segment (continue from where we left off)
-                self.speech_start_time = self.speech_end_time
+                # Reset for next segment (continue from where we left off).
+                # Ingest may have moved on while the window was in flight,
+                # so never move the start backwards or revive a closed segment.
+                if self.speech_start_time and self.speech_start_time < audio_end:
+                    self.speech_start_time = audio_end
+                return trigger_reason
 
     def get_stats(self) -> dict:
         """Get performance statistics"""
@@ -641,28 +865,128 @@ class StreamingTranscriptionManager:
             "transcriptions": self.total_transcriptions,
             "buffer_duration_ms": self.buffer.get_buffer_duration_ms(),
             "is_speaking": self.is_speaking,
-            "final_text_length": len(self.last_final_text),
+            "final_text_length": self.final_tail.total_chars,
+            "final_word_count": self.final_tail.total_words,
             "partial_text": self.last_partial_text,
+            "inference_in_flight": len(self._inference_tasks),
+            "speech_window_mode": self.speech_window_mode,
+            "upload_bytes": self.upload_bytes,
+            "upload_bytes_saved": self.upload_bytes_saved,
+            "windows_skipped_silent": self.windows_skipped_silent,
+            "scheduler_queue_depth": self.scheduler.get_metrics()["queue_depth"],
+            "ingest_queue": self.ingest_queue.get_stats()
+            if self.ingest_queue
+            else None,
+            "decoder": self.stream_decoder.get_stats()
+            if self.stream_decoder
+            else None,
+            "latency": self.latency.summary(),
+            # Knobs the latency numbers are tuned against
+            "trigger_config": {
+                "silence_threshold_ms": self.silence_threshold_ms,
+                "window_duration_ms": self.buffer.window_duration_ms,
+                "min_transcription_interval_s": self.min_transcription_interval,
+                "max_buffer_duration_ms": self.max_buffer_duration_ms,
+            },
+            "cadence": self.cadence.get_stats(),
+        }
+
+    def snapshot_state(self) -> dict:
+        """
+        JSON-serializable state needed to resume the session on another
+        worker: finalized tail and dedup history, and the client clock.
+        Audio buffer and in-flight windows are not included (force_flush
+        drains them before a session is handed off).
+        """
+        return {
+            "final_tail": self.final_tail.snapshot(),
+            "finalized_hashes": self.finalized_hashes.snapshot(),
+            "last_chunk_timestamp": self.last_chunk_timestamp,
+            "total_chunks_processed": self.total_chunks_processed,
+            "total_transcriptions": self.total_transcriptions,
         }
 
+    def restore_state(self, state: dict):
+        """Load a snapshot_state() taken by this or another worker."""
+        self.final_tail.restore(state.get("final_tail", {}))
+        self.finalized_hashes.restore(state.get("finalized_hashes", []))
+        # Overlap and n-gram indexes only look at the last 100 finalized
+        # words, which the tail keeps, so rebuilding them is exact
+        self.overlap_index.clear()
+        self.ngram_index.clear()
+        tail_words = " ".join(self.final_tail.words)
+        self.overlap_index.add_text(tail_words)
+        self.ngram_index.add_text(tail_words)
+        self.last_chunk_timestamp = state.get("last_chunk_timestamp", 0.0)
+        self.total_chunks_processed = state.get("total_chunks_processed", 0)
+        self.total_transcriptions = state.get("total_transcriptions", 0)
+        logger.info(
+            f"🔄 Restored session {self.session_id} "
+            f"({self.final_tail.segments} finalized segments)"
+        )
+
     def reset(self):
         """Reset manager state for new recording"""
         self.buffer.clear()
+        self.vad_stream.reset()
         self.last_partial_text = ""
-        self.last_final_text = ""
+        self.final_tail.clear()
         self.silence_duration_ms = 0
         self.same_text_count = 0
         self.is_speaking = False
         self.total_chunks_processed = 0
         self.total_transcriptions = 0
+        # Drop in-flight windows from the previous recording
+        for task in self._inference_tasks:
+            task.cancel()
+        self._pending_results.clear()
+        self._next_merge_seq = self._next_window_seq
         # Clear deduplication tracking
         self.finalized_hashes.clear()
-        self.finalized_words.clear()
+        self.overlap_index.clear()
+        self.ngram_index.clear()
         logger.info("🔄 Manager reset")
 
+    @classmethod
+    async def create(
+        cls,
+        groq_api_key: str,
+        session_id: Optional[str] = None,
+        vad_pool: Optional[VADPool] = None,
+        **kwargs,
+    ) -> "StreamingTranscriptionManager":
+        """
+        Build a manager without blocking the event loop: the VAD instance
+        comes from VADPool.acquire_async(), which loads a model in a worker
+        thread if the pool is empty.
+        """
+        vad_pool = vad_pool or get_vad_pool()
+        try:
+            vad = await vad_pool.acquire_async()
+        except Exception as e:
+            raise cls._vad_load_error(vad_pool, e)
+        try:
+            return cls(groq_api_key, session_id=session_id, vad_pool=vad_pool, vad=vad, **kwargs)
+        except Exception:
+            vad_pool.release(vad)
+            raise
+
+    @staticmethod
+    def _vad_load_error(vad_pool: VADPool, error: Exception) -> RuntimeError:
+        logger.error(f"❌ VAD ({vad_pool.backend}) failed to load: {error}")
+        return RuntimeError(
+            f"VAD backend '{vad_pool.backend}' is required but failed to load. Aborting."
+        )
+
     def cleanup(self):
         """Cleanup resources"""
-        self.executor.shutdown(wait=False)
+        # Groq connections are pooled per API key and outlive the session
+        for task in self._inference_tasks:
+            task.cancel()
+        # Hand the (stateful) VAD instance back for the next session
+        if self.vad is not None:
+            self.vad_pool.release(self.vad)
+            self.vad = None
         logger.info("🧹 Manager cleanup complete")
 
     async def force_flush(self):
@@ -672,6 +996,9 @@ class StreamingTranscriptionManager:
         """
         logger.info("🚨 Force flush triggered")
 
+        # Let in-flight windows land first so their finals are not lost
+        await self.wait_for_inference()
+
         # Get remaining audio
         remaining_bytes = self.buffer.get_all_samples_bytes()
 
@@ -679,23 +1006,42 @@ class StreamingTranscriptionManager:
             logger.info(f"Flushing {len(remaining_bytes)} bytes of remaining audio")
 
             # Transcribe final chunk
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,  # Use default executor
-                self.groq.transcribe_audio_sync,
+            result = await self.scheduler.submit(
+                self.session_id,
+                self.groq.api_key,
                 remaining_bytes,
-                "auto",
-                self.last_final_text[-100:] if self.last_final_text else None,
-                True,
+                priority=PRIORITY_FLUSH,
+                kwargs={
+                    "language": "auto",
+                    "prompt": self.final_tail.prompt(100),
+                    "translate_to_english": True,
+                },
             )
 
             if result["text"]:
                 logger.info(f"✅ Flushed final segment: '{result['text'][:50]}...'")
+
+                # Timing (client timestamps): the current speech span (still
+                # open if the client was cut off mid-speech), clipped to the
+                # flushed audio
+                buffer_start = self.buffer_end_time - (
+                    len(remaining_bytes) / 2 / self.buffer.sample_rate
+                )
+                speech_end = self.buffer_end_time if self.is_speaking else self.speech_end_time
+                audio_start = max(self.speech_start_time, buffer_start)
+                audio_end = min(speech_end, self.buffer_end_time)
+                if audio_start >= audio_end:
+                    # No speech span inside the buffer: use the whole buffer
+                    audio_start, audio_end = buffer_start, self.buffer_end_time
+
                 # Emit as final
                 return {
                     "text": result["text"],
                     "confidence": result.get("confidence", 1.0),
                     "is_flush": True,
+                    "audio_start_time": audio_start,
+                    "audio_end_time": audio_end,
+                    "duration": audio_end - audio_start,
                 }
 
         return None
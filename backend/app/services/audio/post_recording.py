@@ -2,8 +2,7 @@
 Post-Recording Service
 
 Orchestrates post-meeting audio processing:
-1. Merge PCM chunks into a single file
-2. Convert to WAV format
+1-2. Merge PCM chunks into a WAV file (streamed, see wav_merge.py)
 3. Upload to GCP (if configured)
 4. Clean up local PCM chunks
 5. Optionally trigger diarization
@@ -17,10 +16,10 @@ from pathlib import Path
 from typing import Optional, Dict
 
 try:
-    from .recorder import AudioRecorder
+    from .wav_merge import merge_to_storage_wav, merge_to_wav_file
     from ..storage import StorageService
 except (ImportError, ValueError):
-    from services.audio.recorder import AudioRecorder
+    from services.audio.wav_merge import merge_to_storage_wav, merge_to_wav_file
     from services.storage import StorageService
 
 logger = logging.getLogger(__name__)
@@ -39,7 +38,8 @@ class PostRecordingService:
 
     def __init__(self, storage_path: str = "./data/recordings"):
         self.storage_path = Path(storage_path)
-        self.storage_type = os.getenv("STORAGE_TYPE", "local").lower()
+        # Object store (GCS/memory backend) vs chunk files under storage_path
+        self.object_store = not StorageService.is_local()
         self.delete_local_after_upload = (
             os.getenv("DELETE_LOCAL_AFTER_UPLOAD", "true").lower() == "true"
         )
@@ -79,8 +79,8 @@ class PostRecordingService:
         try:
             recording_dir = self.storage_path / meeting_id
 
-            if self.storage_type == "gcp":
-                logger.info(f"☁️ GCP mode: merging PCM in backend for {meeting_id}")
+            if self.object_store:
+                logger.info(f"☁️ Object storage mode: merging PCM in backend for {meeting_id}")
                 merged = await self._merge_gcp_chunks_to_wav(meeting_id)
                 if not merged:
                     result["status"] = "merge_failed"
@@ -112,23 +112,14 @@ class PostRecordingService:
                 logger.warning(f"No recording directory found: {recording_dir}")
                 return result
 
-            # Step 1: Merge PCM chunks
-            logger.info(f"📼 Step 1: Merging PCM chunks for meeting {meeting_id}")
-            merged_pcm = await self._merge_chunks(meeting_id)
-
-            if not merged_pcm:
-                # RECOVERY ATTEMPT: Check if we have chunks but merge failed silently
-                logger.warning(
-                    f"Merge returned None, attempting manual chunk scan for {meeting_id}"
-                )
-                chunk_dir = self.storage_path / meeting_id
-                if chunk_dir.exists() and list(chunk_dir.glob("chunk_*.pcm")):
-                    logger.info("Found orphan chunks, retrying merge...")
-                    merged_pcm = await AudioRecorder.merge_chunks(
-                        meeting_id, str(self.storage_path)
-                    )
+            # Step 1-2: Stream PCM chunks into recording.wav
+            logger.info(f"📼 Step 1: Merging PCM chunks into WAV for meeting {meeting_id}")
+            wav_path = await self._merge_to_wav(meeting_id)
 
-            if not merged_pcm:
+            if wav_path:
+                result["merged_locally"] = True
+                result["local_path"] = str(wav_path)
+            else:
                 # Final check: Maybe it was already merged and converted?
                 wav_path = self.storage_path / meeting_id / "recording.wav"
                 if wav_path.exists():
@@ -143,19 +134,6 @@ class PostRecordingService:
                     )
                     return result
 
-            # Step 2: Convert to WAV (if we have new PCM)
-            if merged_pcm:
-                logger.info(f"🎵 Step 2: Converting to WAV format")
-                wav_path = await self._convert_to_wav(meeting_id, merged_pcm)
-
-                if not wav_path:
-                    result["status"] = "conversion_failed"
-                    result["error"] = "Failed to convert to WAV"
-                    return result
-
-                result["merged_locally"] = True
-                result["local_path"] = str(wav_path)
-
             # Ensure we have a path before proceeding
             if not result.get("local_path"):
                 result["status"] = "error"
@@ -165,7 +143,7 @@ class PostRecordingService:
             wav_path = Path(result["local_path"])
 
             # Step 3: Upload to GCP (if configured)
-            if self.storage_type == "gcp":
+            if self.object_store:
                 logger.info(f"☁️ Step 3: Uploading to GCP")
                 gcp_path = await self._upload_to_gcp(meeting_id, wav_path)
 
@@ -200,99 +178,44 @@ class PostRecordingService:
 
     async def _merge_gcp_chunks_to_wav(self, meeting_id: str) -> bool:
         """
-        Merge PCM chunks stored in GCS into a WAV file, upload to GCS.
-        No local disk usage; uses in-memory buffering.
+        Merge PCM chunks in object storage into recording.wav next to them
+        (composed on the server, or streamed a few chunks at a time).
         """
         try:
-            try:
-                from ..storage import StorageService
-            except (ImportError, ValueError):
-                from services.storage import StorageService
-
-            prefix = f"{meeting_id}/{self.chunk_prefix}/"
-            files = await StorageService.list_files(prefix)
-            chunk_files = sorted([f for f in files if f.endswith(".pcm")])
-
-            if not chunk_files:
-                logger.error(f"No PCM chunks found in GCS for {meeting_id}")
-                return False
-
-            import io
-            import wave
-
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, "wb") as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(16000)
-
-                for blob_name in chunk_files:
-                    chunk = await StorageService.download_bytes(blob_name)
-                    if chunk:
-                        wav_file.writeframes(chunk)
-
-            wav_buffer.seek(0)
-            wav_bytes = wav_buffer.read()
-
-            uploaded = await StorageService.upload_bytes(
-                wav_bytes, f"{meeting_id}/recording.wav", content_type="audio/wav"
-            )
-            if not uploaded:
-                logger.error("Failed to upload merged WAV to GCS")
-                return False
-
-            logger.info(
-                f"✅ Uploaded merged WAV for {meeting_id} ({len(wav_bytes) / 1024 / 1024:.2f} MB)"
-            )
-            return True
+            return await merge_to_storage_wav(meeting_id, f"{meeting_id}/recording.wav")
         except Exception as e:
             logger.error(f"Merge PCM in backend failed: {e}", exc_info=True)
             return False
 
     async def _cleanup_gcp_chunks(self, meeting_id: str) -> bool:
         try:
-            try:
-                from ..storage import StorageService
-            except (ImportError, ValueError):
-                from services.storage import StorageService
-
             prefix = f"{meeting_id}/{self.chunk_prefix}/"
             return await StorageService.delete_prefix(prefix)
         except Exception as e:
             logger.error(f"GCS cleanup failed: {e}")
             return False
 
-    async def _merge_chunks(self, meeting_id: str) -> Optional[bytes]:
-        """Merge all PCM chunks for a meeting."""
-        try:
-            pcm_data = await AudioRecorder.merge_chunks(
-                meeting_id, str(self.storage_path)
-            )
-            return pcm_data
-        except Exception as e:
-            logger.error(f"Failed to merge chunks: {e}")
-            return None
-
-    async def _convert_to_wav(self, meeting_id: str, pcm_data: bytes) -> Optional[Path]:
-        """Convert PCM to WAV and save locally."""
-        try:
-            wav_data = AudioRecorder.convert_pcm_to_wav(pcm_data)
-
-            wav_path = self.storage_path / meeting_id / "recording.wav"
-
-            import aiofiles
-
-            async with aiofiles.open(wav_path, "wb") as f:
-                await f.write(wav_data)
-
+    async def _merge_to_wav(self, meeting_id: str) -> Optional[Path]:
+        """
+        WAV for a local recording: an imported merged_recording.wav as is,
+        otherwise merged_recording.pcm or the PCM chunks streamed into
+        recording.wav.
+        """
+        recording_dir = self.storage_path / meeting_id
+        merged_wav = recording_dir / "merged_recording.wav"
+        if merged_wav.exists():
+            logger.info(f"Found existing merged WAV file: {merged_wav}")
+            return merged_wav
+
+        wav_path = await merge_to_wav_file(
+            meeting_id, recording_dir / "recording.wav", str(self.storage_path)
+        )
+        if wav_path:
             logger.info(
-                f"WAV file saved: {wav_path} ({len(wav_data) / 1024 / 1024:.2f} MB)"
+                f"WAV file saved: {wav_path} "
+                f"({wav_path.stat().st_size / 1024 / 1024:.2f} MB)"
             )
-            return wav_path
-
-        except Exception as e:
-            logger.error(f"Failed to convert to WAV: {e}")
-            return None
+        return wav_path
 
     async def _upload_to_gcp(
         self, meeting_id: str, local_wav_path: Path
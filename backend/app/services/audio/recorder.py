@@ -9,6 +9,19 @@ Features:
 - Chunk-based storage for crash resilience
 - Async file I/O for non-blocking operations
 - Automatic directory management
+
+Persistence runs in a per-recorder background worker: add_chunk only
+appends to the buffer and, every chunk_duration_seconds of audio, queues the
+completed chunk. The worker writes chunks in order, retrying failed writes
+with exponential backoff (RECORDER_UPLOAD_RETRY_BASE .. _MAX seconds) until
+they succeed. While the store is slow, chunks beyond RECORDER_MAX_PENDING
+are spilled to local disk (RECORDER_SPILL_PATH) instead of held in memory,
+and uploaded from there when the worker catches up.
+
+When a streaming session ends, the recorder is sealed (no more audio, final
+chunk queued) and its snapshot, which lists the still-queued chunks, goes
+into the session handoff before stop() drains the queue. Draining can take
+up to RECORDER_DRAIN_TIMEOUT seconds and must not hold the session lease.
 """
 
 import asyncio
@@ -16,14 +29,41 @@ import aiofiles
 import logging
 import os
 import time
+from dataclasses import dataclass
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Deque, Optional, Dict, List
 from datetime import datetime
 import struct
 import uuid
 
+try:
+    from ..storage import StorageService
+except (ImportError, ValueError):
+    from services.storage import StorageService
+
 logger = logging.getLogger(__name__)
 
+RECORDER_MAX_PENDING = int(os.getenv("RECORDER_MAX_PENDING", "4"))
+RECORDER_UPLOAD_RETRY_BASE = float(os.getenv("RECORDER_UPLOAD_RETRY_BASE", "1"))
+RECORDER_UPLOAD_RETRY_MAX = float(os.getenv("RECORDER_UPLOAD_RETRY_MAX", "30"))
+RECORDER_DRAIN_TIMEOUT = float(os.getenv("RECORDER_DRAIN_TIMEOUT", "60"))
+RECORDER_SPILL_PATH = os.getenv("RECORDER_SPILL_PATH", "./data/recorder_spill")
+
+
+@dataclass
+class _PendingChunk:
+    """A completed chunk waiting for the persistence worker."""
+
+    index: int
+    data: Optional[bytes]  # None once spilled to disk
+    start_time: float
+    end_time: float
+    size: int
+    queued_at: float
+    spill_path: Optional[Path] = None
+    spilling: Optional[asyncio.Task] = None
+
 
 class AudioRecorder:
     """
@@ -50,12 +90,15 @@ class AudioRecorder:
         """
         self.meeting_id = meeting_id
         self.storage_path = Path(storage_path) / meeting_id
-        self.storage_type = os.getenv("STORAGE_TYPE", "local").lower()
+        # Object store (GCS/memory backend) vs chunk files under storage_path
+        self.object_store = not StorageService.is_local()
         self.chunk_prefix = os.getenv("AUDIO_CHUNK_PREFIX", "pcm_chunks")
         self.chunk_duration_seconds = chunk_duration_seconds
 
         # Recording state
         self.is_recording = False
+        self.sealed = False  # seal() ran and stop() has not finished yet
+        self.abandoned = False  # abandon() ran: another worker owns the session
         self.chunk_index = 0
         self.recording_start_time: Optional[float] = None
         self.chunk_start_time: Optional[float] = None
@@ -79,8 +122,17 @@ class AudioRecorder:
         # Chunk metadata for reconstruction
         self.chunks_metadata: List[Dict] = []
 
-        # NEW: Lock to serialize background saves and prevent race conditions
-        self._lock = asyncio.Lock()
+        # Background persistence (see module docstring)
+        self.max_pending = RECORDER_MAX_PENDING
+        self.spill_dir = Path(RECORDER_SPILL_PATH) / meeting_id
+        self._pending: Deque[_PendingChunk] = deque()
+        self._persisting: Optional[_PendingChunk] = None  # Chunk being written now
+        self._withheld: List[_PendingChunk] = []  # Not uploaded, see abandon()
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self.upload_failures = 0
+        self.chunks_spilled = 0
+        self.last_upload_error: Optional[str] = None
 
         # Feature flag check
         self.enabled = os.getenv("ENABLE_AUDIO_RECORDING", "true").lower() == "true"
@@ -102,22 +154,15 @@ class AudioRecorder:
             return False
 
         try:
-            if self.storage_type == "gcp":
-                try:
-                    from ..storage import get_gcp_bucket
-                except (ImportError, ValueError):
-                    from services.storage import get_gcp_bucket
-
-                bucket = get_gcp_bucket()
-                if not bucket:
-                    logger.error(
-                        "GCS storage is enabled but bucket initialization failed. "
-                        "Check STORAGE_TYPE, GCP_BUCKET_NAME, and credentials."
-                    )
-                    return False
+            if self.object_store and not await StorageService.is_ready():
+                logger.error(
+                    "Object storage is enabled but backend initialization failed. "
+                    "Check STORAGE_TYPE, GCP_BUCKET_NAME, and credentials."
+                )
+                return False
 
             # Create storage directory for local mode only
-            if self.storage_type != "gcp":
+            if not self.object_store:
                 self.storage_path.mkdir(parents=True, exist_ok=True)
 
             self.is_recording = True
@@ -126,6 +171,8 @@ class AudioRecorder:
             self.chunk_index = 0
             self.current_chunk_buffer = bytearray()
             self.chunks_metadata = []
+            if self._worker is None or self._worker.done():
+                self._worker = asyncio.create_task(self._persist_loop())
 
             logger.info(f"🎙️ Audio recording started for meeting {self.meeting_id}")
             logger.info(f"   Storage path: {self.storage_path}")
@@ -138,32 +185,52 @@ class AudioRecorder:
             self.is_recording = False
             return False
 
-    async def add_chunk(self, audio_data: bytes) -> Optional[str]:
+    def snapshot(self) -> Dict:
+        """
+        Chunk numbering and metadata, so a resumed session keeps appending.
+
+        "chunks" accounts for every index below chunk_index: the persisted
+        chunks, then the ones still queued here (marked "pending"), which
+        this worker keeps persisting after handing the session off.
+        """
+        pending = [{**self._chunk_metadata(c), "pending": True} for c in self._pending]
+        return {
+            "chunk_index": self.chunk_index,
+            "recording_start_time": self.recording_start_time,
+            "chunks": list(self.chunks_metadata) + pending,
+        }
+
+    def restore(self, state: Dict):
+        """Continue a recording started earlier (possibly on another worker)."""
+        self.chunk_index = state.get("chunk_index", 0)
+        self.recording_start_time = (
+            state.get("recording_start_time") or self.recording_start_time
+        )
+        self.chunks_metadata = list(state.get("chunks", []))
+        logger.info(
+            f"🎙️ Resuming recording for meeting {self.meeting_id} at chunk {self.chunk_index}"
+        )
+
+    def add_chunk(self, audio_data: bytes) -> Optional[str]:
         """
-        Add audio data to the recording buffer.
-        When buffer reaches target size, saves to disk.
+        Add audio data to the recording buffer. Never waits on I/O: a
+        completed chunk is handed to the persistence worker.
+
+        Returns:
+            Storage path the queued chunk will be written to, if one was
+            completed by this call
         """
         if not self.is_recording or not self.enabled:
             return None
 
         try:
-            # Synchronous extension: no await here ensures no race during addition
             self.current_chunk_buffer.extend(audio_data)
 
-            # Check if we should save the chunk
             if len(self.current_chunk_buffer) >= self.target_chunk_bytes:
-                # IMPORTANT: Swap buffer immediately to prevent data loss during 'await'
-                data_to_save = bytes(self.current_chunk_buffer)
-                self.current_chunk_buffer = bytearray()
-
-                # Update chunk start time for calculations before background save
                 current_time = time.time()
-                old_chunk_start = self.chunk_start_time
+                chunk_start = self.chunk_start_time
                 self.chunk_start_time = current_time
-
-                return await self._actually_save_chunk(
-                    data_to_save, old_chunk_start, current_time
-                )
+                return self._queue_current_chunk(chunk_start, current_time)
 
             return None
 
@@ -171,85 +238,233 @@ class AudioRecorder:
             logger.error(f"Error adding audio chunk: {e}")
             return None
 
-    async def _actually_save_chunk(
-        self, data: bytes, chunk_start: float, chunk_end: float
-    ) -> Optional[str]:
-        """Internal method to perform the actual file I/O safely"""
-        async with self._lock:  # NEW: Serialize all saves to disk
-            try:
-                chunk_filename = f"chunk_{self.chunk_index:05d}.pcm"
-                chunk_rel_path = f"{self.meeting_id}/{self.chunk_prefix}/{chunk_filename}"
-
-                # Calculate timing relative to meeting start
-                start_offset = chunk_start - self.recording_start_time
-                end_offset = chunk_end - self.recording_start_time
-                duration = len(data) / (self.sample_rate * self.bytes_per_sample)
-
-                # Save audio data (GCS or local)
-                if self.storage_type == "gcp":
-                    try:
-                        from ..storage import StorageService
-                    except (ImportError, ValueError):
-                        from services.storage import StorageService
-
-                    success = await StorageService.upload_bytes(
-                        data, chunk_rel_path, content_type="application/octet-stream"
-                    )
-                    if not success:
-                        raise RuntimeError("Failed to upload chunk to GCS")
-                else:
-                    chunk_path = self.storage_path / chunk_filename
-                    async with aiofiles.open(chunk_path, "wb") as f:
-                        await f.write(data)
-
-                # Record metadata
-                metadata = {
-                    "chunk_index": self.chunk_index,
-                    "filename": chunk_filename,
-                    "storage_path": chunk_rel_path,
-                    "start_time_seconds": start_offset,
-                    "end_time_seconds": end_offset,
-                    "duration_seconds": duration,
-                    "size_bytes": len(data),
-                    "created_at": datetime.utcnow().isoformat(),
-                }
-                self.chunks_metadata.append(metadata)
+    def seal(self):
+        """
+        Stop taking audio and queue the partial chunk, so chunk numbering is
+        final. A session handoff snapshots the recorder here, before the
+        (possibly slow) drain in stop().
+        """
+        if not self.is_recording:
+            return
+        self.is_recording = False
+        self.sealed = True
+        if self.current_chunk_buffer:
+            self._queue_current_chunk(self.chunk_start_time, time.time())
 
-                logger.info(
-                    f"💾 Saved audio chunk {self.chunk_index} ({duration:.1f}s)"
-                )
-                self.chunk_index += 1
-                return chunk_rel_path
+    def abandon(self, keep_below: int = 0):
+        """
+        Another worker took the session over: stop taking audio and drop
+        the partial chunk instead of queuing it.
+
+        Queued chunks numbered keep_below (the chunk_index of the last
+        snapshot the new owner can have loaded) or higher would collide
+        with the new owner's chunks, so they are withheld from storage and
+        only spilled locally by stop(). stop() still persists the others
+        and leaves metadata.json to the new owner.
+        """
+        self.is_recording = False
+        self.sealed = True
+        self.abandoned = True
+        self.current_chunk_buffer = bytearray()
+        kept: Deque[_PendingChunk] = deque()
+        for chunk in self._pending:
+            if chunk.index >= keep_below and chunk is not self._persisting:
+                self._withheld.append(chunk)
+            else:
+                kept.append(chunk)
+        self._pending = kept
+        logger.warning(
+            f"🎙️ Recorder for {self.meeting_id} abandoned to another worker, "
+            f"withholding {len(self._withheld)} queued chunks"
+        )
 
-            except Exception as e:
-                logger.error(f"Failed to save audio chunk: {e}")
-                return None
+    def _chunk_filename(self, index: int) -> str:
+        return f"chunk_{index:05d}.pcm"
 
-    async def _save_current_chunk(self):
-        """Standard wrapper for saving the remaining buffer at the end"""
-        if not self.current_chunk_buffer:
-            return None
+    def _chunk_rel_path(self, index: int) -> str:
+        return f"{self.meeting_id}/{self.chunk_prefix}/{self._chunk_filename(index)}"
+
+    def _queue_current_chunk(self, chunk_start: float, chunk_end: float) -> str:
+        """Move the buffer into the persistence queue (numbered in order)."""
         data = bytes(self.current_chunk_buffer)
         self.current_chunk_buffer = bytearray()
-        return await self._actually_save_chunk(data, self.chunk_start_time, time.time())
 
-    async def stop(self) -> Dict:
+        chunk = _PendingChunk(
+            index=self.chunk_index,
+            data=data,
+            start_time=chunk_start,
+            end_time=chunk_end,
+            size=len(data),
+            queued_at=time.monotonic(),
+        )
+        self.chunk_index += 1
+        self._pending.append(chunk)
+
+        # Store is behind: keep only max_pending chunks in memory
+        in_memory = sum(1 for c in self._pending if c.data is not None and not c.spilling)
+        if in_memory > self.max_pending:
+            chunk.spilling = asyncio.create_task(self._spill(chunk))
+
+        self._wakeup.set()
+        return self._chunk_rel_path(chunk.index)
+
+    async def _spill(self, chunk: _PendingChunk, directory: Optional[Path] = None):
+        """Park a queued chunk on local disk until the worker gets to it."""
+        path = (directory or self.spill_dir) / self._chunk_filename(chunk.index)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(path, "wb") as f:
+                await f.write(chunk.data)
+            chunk.spill_path = path
+            chunk.data = None
+            self.chunks_spilled += 1
+            logger.warning(
+                f"💽 Recorder for {self.meeting_id} is behind, spilled chunk {chunk.index} to disk"
+            )
+        except Exception as e:
+            # Keep it in memory rather than lose it
+            logger.error(f"Failed to spill audio chunk {chunk.index}: {e}")
+
+    async def _persist_loop(self):
+        """Write queued chunks in order; a failing chunk is retried with backoff."""
+        delay = RECORDER_UPLOAD_RETRY_BASE
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            chunk = self._pending[0]
+            self._persisting = chunk
+            try:
+                await self._persist_chunk(chunk)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.upload_failures += 1
+                self.last_upload_error = str(e)
+                logger.error(
+                    f"Failed to save audio chunk {chunk.index}, retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECORDER_UPLOAD_RETRY_MAX)
+                continue
+
+            delay = RECORDER_UPLOAD_RETRY_BASE
+            self._pending.popleft()
+            self._persisting = None
+
+    async def _persist_chunk(self, chunk: _PendingChunk):
+        """Write one chunk (object store or local) and record its metadata."""
+        if chunk.spilling:
+            await chunk.spilling
+            chunk.spilling = None
+
+        data = chunk.data
+        if data is None:
+            async with aiofiles.open(chunk.spill_path, "rb") as f:
+                data = await f.read()
+
+        chunk_filename = self._chunk_filename(chunk.index)
+        chunk_rel_path = self._chunk_rel_path(chunk.index)
+
+        if self.object_store:
+            success = await StorageService.upload_bytes(
+                data, chunk_rel_path, content_type="application/octet-stream"
+            )
+            if not success:
+                raise RuntimeError("Failed to upload chunk to object storage")
+        else:
+            chunk_path = self.storage_path / chunk_filename
+            async with aiofiles.open(chunk_path, "wb") as f:
+                await f.write(data)
+
+        if chunk.spill_path is not None:
+            try:
+                chunk.spill_path.unlink()
+            except OSError:
+                pass
+
+        metadata = self._chunk_metadata(chunk)
+        metadata["created_at"] = datetime.utcnow().isoformat()
+        self.chunks_metadata.append(metadata)
+        logger.info(f"💾 Saved audio chunk {chunk.index} ({metadata['duration_seconds']:.1f}s)")
+
+    def _chunk_metadata(self, chunk: _PendingChunk) -> Dict:
+        return {
+            "chunk_index": chunk.index,
+            "filename": self._chunk_filename(chunk.index),
+            "storage_path": self._chunk_rel_path(chunk.index),
+            # Timing relative to meeting start
+            "start_time_seconds": chunk.start_time - self.recording_start_time,
+            "end_time_seconds": chunk.end_time - self.recording_start_time,
+            "duration_seconds": chunk.size / (self.sample_rate * self.bytes_per_sample),
+            "size_bytes": chunk.size,
+        }
+
+    async def _drain(self, timeout: float = RECORDER_DRAIN_TIMEOUT) -> bool:
+        """Wait for the worker to persist everything queued, then stop it."""
+        deadline = time.monotonic() + timeout
+        while self._pending and self._worker and not self._worker.done():
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+        drained = not self._pending
+
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._worker = None
+
+        if not drained:
+            # Leave nothing only in memory: the spill files are the recovery copy
+            for chunk in self._pending:
+                if chunk.spilling:
+                    await chunk.spilling
+                elif chunk.data is not None:
+                    await self._spill(chunk)
+            logger.error(
+                f"❌ {len(self._pending)} audio chunks for {self.meeting_id} not persisted, "
+                f"left in {self.spill_dir}"
+            )
+        return drained
+
+    async def stop(self, write_metadata: bool = True) -> Dict:
         """
         Finalize recording session.
         Saves any remaining audio and returns metadata.
 
+        Args:
+            write_metadata: Also write metadata.json. A session that may have
+                resumed elsewhere passes False and calls write_metadata()
+                only if it turns out to be the last owner.
+
         Returns:
             Dict containing recording metadata
         """
-        if not self.is_recording:
+        if not self.is_recording and not self.sealed:
             return {"status": "not_recording"}
 
         try:
-            self.is_recording = False
-
-            # Save any remaining audio in buffer
-            if self.current_chunk_buffer:
-                await self._save_current_chunk()
+            # Queue any remaining audio and wait for the worker to catch up
+            self.seal()
+            await self._drain()
+            self.sealed = False
+            # Apart from the spill files the new owner may write for the same indexes
+            withheld_dir = self.spill_dir / f"abandoned-{int(time.time())}"
+            for chunk in self._withheld:
+                if chunk.spilling:
+                    await chunk.spilling
+                if chunk.data is not None:
+                    await self._spill(chunk, withheld_dir)
+                elif chunk.spill_path and chunk.spill_path.parent != withheld_dir:
+                    withheld_dir.mkdir(parents=True, exist_ok=True)
+                    chunk.spill_path = chunk.spill_path.replace(
+                        withheld_dir / chunk.spill_path.name
+                    )
 
             recording_metadata = {
                 "meeting_id": self.meeting_id,
@@ -264,6 +479,11 @@ class AudioRecorder:
                 else 0,
                 "chunk_count": len(self.chunks_metadata),
                 "storage_path": str(self.storage_path),
+                "unpersisted_chunks": [
+                    {"chunk_index": c.index, "spill_path": str(c.spill_path)}
+                    for c in list(self._pending) + self._withheld
+                ],
+                "abandoned": self.abandoned,
                 "audio_format": {
                     "sample_rate": self.sample_rate,
                     "channels": self.channels,
@@ -273,14 +493,35 @@ class AudioRecorder:
                 "chunks": self.chunks_metadata,
             }
 
-            import json
+            if self.abandoned:
+                logger.info(
+                    f"🎙️ Audio recording for meeting {self.meeting_id} handed to another worker, "
+                    f"{len(self.chunks_metadata)} chunks persisted here"
+                )
+                return recording_metadata
+
+            if write_metadata:
+                await self.write_metadata(recording_metadata)
+
+            logger.info(
+                f"🎙️ Audio recording stopped for meeting {self.meeting_id}: "
+                f"{len(self.chunks_metadata)} chunks, "
+                f"{recording_metadata['total_duration_seconds']:.1f}s total"
+            )
+
+            return recording_metadata
+
+        except Exception as e:
+            logger.error(f"Error stopping audio recording: {e}")
+            return {"status": "error", "error": str(e), "meeting_id": self.meeting_id}
 
-            if self.storage_type == "gcp":
-                try:
-                    from ..storage import StorageService
-                except (ImportError, ValueError):
-                    from services.storage import StorageService
+    async def write_metadata(self, recording_metadata: Dict):
+        """Write stop()'s metadata as metadata.json next to the chunks."""
+        import json
 
+        await self._settle_restored()
+        try:
+            if self.object_store:
                 metadata_path = f"{self.meeting_id}/{self.chunk_prefix}/metadata.json"
                 await StorageService.upload_bytes(
                     json.dumps(recording_metadata, indent=2).encode("utf-8"),
@@ -291,18 +532,37 @@ class AudioRecorder:
                 metadata_path = self.storage_path / "metadata.json"
                 async with aiofiles.open(metadata_path, "w") as f:
                     await f.write(json.dumps(recording_metadata, indent=2))
+        except Exception as e:
+            logger.error(f"Failed to write recording metadata for {self.meeting_id}: {e}")
 
-            logger.info(
-                f"🎙️ Audio recording stopped for meeting {self.meeting_id}: "
-                f"{len(self.chunks_metadata)} chunks, "
-                f"{recording_metadata['total_duration_seconds']:.1f}s total"
-            )
-
-            return recording_metadata
-
+    async def _settle_restored(self):
+        """
+        Clear the "pending" mark on restored chunks (see snapshot()) that
+        the previous owner has persisted by now. Ones still missing keep it.
+        """
+        restored = [c for c in self.chunks_metadata if c.get("pending")]
+        if not restored:
+            return
+        try:
+            if self.object_store:
+                stored = await StorageService.list_file_sizes(
+                    f"{self.meeting_id}/{self.chunk_prefix}/"
+                )
+                persisted = [c for c in restored if c["storage_path"] in stored]
+            else:
+                persisted = [
+                    c for c in restored if (self.storage_path / c["filename"]).exists()
+                ]
         except Exception as e:
-            logger.error(f"Error stopping audio recording: {e}")
-            return {"status": "error", "error": str(e), "meeting_id": self.meeting_id}
+            logger.warning(f"Could not check restored chunks for {self.meeting_id}: {e}")
+            return
+        for chunk in persisted:
+            chunk.pop("pending", None)
+        if len(persisted) < len(restored):
+            logger.warning(
+                f"{len(restored) - len(persisted)} restored chunks for {self.meeting_id} "
+                f"not persisted by the previous worker yet"
+            )
 
     @staticmethod
     async def merge_chunks(
@@ -311,6 +571,7 @@ class AudioRecorder:
         """
         Merge all audio chunks for a meeting into a single audio buffer.
         If chunks are missing but a merged file exists, returns that.
+        Holds the whole meeting in memory; prefer merge_chunks_to_wav.
 
         Args:
             meeting_id: Meeting ID to merge chunks for
@@ -320,15 +581,9 @@ class AudioRecorder:
             Optional[bytes]: Merged audio data or None if failed
         """
         try:
-            storage_type = os.getenv("STORAGE_TYPE", "local").lower()
             chunk_prefix = os.getenv("AUDIO_CHUNK_PREFIX", "pcm_chunks")
 
-            if storage_type == "gcp":
-                try:
-                    from ..storage import StorageService
-                except (ImportError, ValueError):
-                    from services.storage import StorageService
-
+            if not StorageService.is_local():
                 prefix = f"{meeting_id}/{chunk_prefix}/"
                 files = await StorageService.list_files(prefix)
                 chunk_files = sorted([f for f in files if f.endswith(".pcm")])
@@ -338,8 +593,7 @@ class AudioRecorder:
                     return None
 
                 merged_audio = bytearray()
-                for blob_name in chunk_files:
-                    data = await StorageService.download_bytes(blob_name)
+                async for _, data in StorageService.download_many(chunk_files):
                     if data:
                         merged_audio.extend(data)
 
@@ -393,6 +647,24 @@ class AudioRecorder:
             logger.error(f"Failed to merge audio chunks: {e}")
             return None
 
+    @staticmethod
+    async def merge_chunks_to_wav(
+        meeting_id: str, target_path: str, storage_path: str = "./data/recordings"
+    ) -> Optional[Path]:
+        """
+        Merge all audio chunks for a meeting straight into a WAV file,
+        streaming (peak memory is one chunk, not the whole meeting).
+
+        Returns:
+            Optional[Path]: target_path, or None if failed
+        """
+        try:
+            from .wav_merge import merge_to_wav_file
+        except (ImportError, ValueError):
+            from services.audio.wav_merge import merge_to_wav_file
+
+        return await merge_to_wav_file(meeting_id, target_path, storage_path)
+
     @staticmethod
     def convert_pcm_to_wav(pcm_data: bytes, sample_rate: int = 16000) -> bytes:
         """
@@ -440,6 +712,20 @@ class AudioRecorder:
             "duration_seconds": current_duration,
             "chunks_saved": len(self.chunks_metadata),
             "buffer_duration": buffer_duration,
+            **self.get_upload_stats(),
+        }
+
+    def get_upload_stats(self) -> Dict:
+        """Persistence backlog: pending chunks and how far uploads lag."""
+        oldest = self._pending[0].queued_at if self._pending else None
+        return {
+            "pending_chunks": len(self._pending),
+            "pending_bytes": sum(c.size for c in self._pending),
+            "spilled_pending": sum(1 for c in self._pending if c.spill_path is not None),
+            "upload_lag_seconds": round(time.monotonic() - oldest, 2) if oldest else 0.0,
+            "chunks_spilled": self.chunks_spilled,
+            "upload_failures": self.upload_failures,
+            "last_upload_error": self.last_upload_error,
         }
 
     @staticmethod
@@ -451,15 +737,8 @@ class AudioRecorder:
         """
         import shutil
 
-        storage_type = os.getenv("STORAGE_TYPE", "local").lower()
-
-        if storage_type == "gcp":
+        if not StorageService.is_local():
             try:
-                try:
-                    from ..storage import StorageService
-                except (ImportError, ValueError):
-                    from services.storage import StorageService
-
                 old_prefix = f"{old_id}/"
                 new_prefix = f"{new_id}/"
                 files = await StorageService.list_files(old_prefix)
@@ -467,11 +746,15 @@ class AudioRecorder:
                 if not files:
                     return False
 
-                for f in files:
-                    new_path = f.replace(old_prefix, new_prefix, 1)
-                    await StorageService.copy_file(f, new_path)
+                copied = await StorageService.copy_many(
+                    (f, f.replace(old_prefix, new_prefix, 1)) for f in files
+                )
+                if not copied:
+                    # Keep the originals; the copies are harmless duplicates
+                    logger.error(f"Failed to copy some files from {old_prefix}")
+                    return False
 
-                await StorageService.delete_prefix(old_prefix)
+                await StorageService.delete_many(files)
                 logger.info(f"☁️ Renamed GCS prefix: {old_id} -> {new_id}")
                 return True
             except Exception as e:
@@ -505,7 +788,9 @@ active_recorders: Dict[str, AudioRecorder] = {}
 
 
 async def get_or_create_recorder(
-    meeting_id: str, storage_path: str = "./data/recordings"
+    meeting_id: str,
+    storage_path: str = "./data/recordings",
+    resume_state: Optional[Dict] = None,
 ) -> AudioRecorder:
     """
     Get existing recorder or create new one for a meeting.
@@ -513,13 +798,16 @@ async def get_or_create_recorder(
     Args:
         meeting_id: Meeting ID
         storage_path: Base storage path
+        resume_state: AudioRecorder.snapshot() of an earlier connection, used
+            when a new recorder has to be created
 
     Returns:
         AudioRecorder instance
     """
     if meeting_id not in active_recorders:
         recorder = AudioRecorder(meeting_id, storage_path)
-        await recorder.start()
+        if await recorder.start() and resume_state:
+            recorder.restore(resume_state)
         active_recorders[meeting_id] = recorder
 
     return active_recorders[meeting_id]
@@ -535,10 +823,26 @@ async def stop_recorder(meeting_id: str) -> Optional[Dict]:
     Returns:
         Recording metadata or None if no recorder found
     """
-    if meeting_id in active_recorders:
-        recorder = active_recorders[meeting_id]
-        metadata = await recorder.stop()
-        del active_recorders[meeting_id]
-        return metadata
+    recorder = active_recorders.pop(meeting_id, None)
+    if recorder:
+        return await recorder.stop()
 
     return None
+
+
+def seal_recorder(meeting_id: str) -> Optional[AudioRecorder]:
+    """
+    Seal a meeting's recorder (see AudioRecorder.seal) and take it out of
+    the registry, so a session resuming while it drains gets a new recorder
+    restored from the handoff snapshot. Finish it with recorder.stop().
+
+    Args:
+        meeting_id: Meeting ID
+
+    Returns:
+        The sealed recorder or None if no recorder found
+    """
+    recorder = active_recorders.pop(meeting_id, None)
+    if recorder:
+        recorder.seal()
+    return recorder
@@ -0,0 +1,165 @@
+"""
+Server-side sample-rate conversion and downmix for streaming audio.
+
+The pipeline (RollingAudioBuffer, VAD, Groq upload, AudioRecorder) works on
+16kHz mono int16. Clients on 44.1/48kHz or stereo devices can declare their
+format on the websocket and send it as-is; AudioFormatConverter turns each
+chunk into 16kHz mono before VAD.
+
+PolyphaseResampler is a rational (L/M) windowed-sinc resampler that keeps
+its state between chunks:
+
+- the last K-1 input samples (filter history), so there are no clicks at
+  chunk boundaries
+- the exact integer position of the next output sample in the upsampled
+  time base, so there is no drift over long sessions
+
+Each chunk is processed in one vectorized pass (gather + per-phase dot
+product). The filter's group delay is compensated, so output sample n lines
+up with input time n * M / L; the last few input samples (about 1ms) are
+emitted with the next chunk.
+"""
+
+import logging
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+
+# Client formats accepted on the websocket
+MIN_INPUT_RATE = 8000
+MAX_INPUT_RATE = 192000
+MAX_INPUT_CHANNELS = 8
+
+
+class PolyphaseResampler:
+    """Stateful rational resampler for a mono stream."""
+
+    def __init__(
+        self,
+        input_rate: int,
+        output_rate: int = TARGET_SAMPLE_RATE,
+        zero_crossings: int = 16,
+        rolloff: float = 0.92,
+        kaiser_beta: float = 8.0,
+    ):
+        """
+        Args:
+            input_rate: Input sample rate in Hz
+            output_rate: Output sample rate in Hz
+            zero_crossings: Sinc lobes kept on each side (quality vs. cost)
+            rolloff: Cutoff as a fraction of the lower Nyquist frequency
+            kaiser_beta: Kaiser window shape (stopband attenuation)
+        """
+        g = gcd(input_rate, output_rate)
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.up = output_rate // g  # L
+        self.down = input_rate // g  # M
+
+        # Lowpass in the upsampled domain (cutoff normalized to its Nyquist)
+        max_rate = max(self.up, self.down)
+        half_len = zero_crossings * max_rate
+        n = np.arange(-half_len, half_len + 1)
+        cutoff = rolloff / max_rate
+        h = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), kaiser_beta)
+        h *= self.up  # Zero-stuffing gain
+
+        # Polyphase split: phase p uses h[p], h[p + L], h[p + 2L], ...
+        self.taps = -(-len(h) // self.up)  # K taps per phase
+        h = np.concatenate([h, np.zeros(self.taps * self.up - len(h))])
+        phases = h.reshape(self.taps, self.up).T
+        # Reversed so taps line up with ascending input indices
+        self._filters = np.ascontiguousarray(phases[:, ::-1], dtype=np.float32)
+
+        self._delay = half_len
+        self.reset()
+
+    def reset(self):
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        # Upsampled-time position of the next output, relative to the
+        # first sample of the next chunk (starts at the group delay)
+        self._t = self._delay
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next chunk of the stream.
+
+        Args:
+            samples: Mono float32 samples (any scale)
+
+        Returns:
+            float32 output samples (roughly len(samples) * L / M of them)
+        """
+        n_in = len(samples)
+        ext = np.concatenate([self._history, samples.astype(np.float32, copy=False)])
+
+        limit = n_in * self.up
+        if self._t < limit:
+            positions = np.arange(self._t, limit, self.down)
+            bases = positions // self.up
+            phases = positions % self.up
+            windows = sliding_window_view(ext, self.taps)[bases]
+            out = np.einsum("ij,ij->i", windows, self._filters[phases])
+            self._t = int(positions[-1]) + self.down - limit
+        else:
+            out = np.zeros(0, dtype=np.float32)
+            self._t -= limit
+
+        self._history = ext[len(ext) - (self.taps - 1) :].copy()
+        return out
+
+
+class AudioFormatConverter:
+    """
+    Interleaved int16 PCM at any rate/channel count → 16kHz mono int16.
+
+    Chunks may end mid-frame; leftover bytes are carried to the next call.
+    """
+
+    def __init__(
+        self,
+        input_rate: int,
+        input_channels: int = 1,
+        output_rate: int = TARGET_SAMPLE_RATE,
+    ):
+        self.input_rate = input_rate
+        self.input_channels = input_channels
+        self.output_rate = output_rate
+        self._frame_bytes = 2 * input_channels
+        self._leftover = b""
+        self._resampler = (
+            PolyphaseResampler(input_rate, output_rate)
+            if input_rate != output_rate
+            else None
+        )
+
+    @property
+    def is_passthrough(self) -> bool:
+        return self._resampler is None and self.input_channels == 1
+
+    def convert(self, pcm: bytes) -> bytes:
+        """Convert one chunk; returns 16kHz mono int16 bytes."""
+        if self.is_passthrough:
+            return pcm
+
+        if self._leftover:
+            pcm = self._leftover + pcm
+        usable = len(pcm) - len(pcm) % self._frame_bytes
+        self._leftover = pcm[usable:]
+
+        samples = np.frombuffer(pcm, dtype=np.int16, count=usable // 2)
+        if self.input_channels > 1:
+            mono = samples.reshape(-1, self.input_channels).mean(axis=1, dtype=np.float32)
+        else:
+            mono = samples.astype(np.float32)
+
+        if self._resampler is not None:
+            mono = self._resampler.process(mono)
+
+        return np.clip(np.rint(mono), -32768, 32767).astype(np.int16).tobytes()
@@ -0,0 +1,625 @@
+"""
+Process-wide transcription scheduler.
+
+Every StreamingTranscriptionManager submits its windows here instead of
+calling Groq directly. Per API key the scheduler keeps:
+
+- A token bucket fed from Groq rate-limit response headers (and retry-after
+  on 429s), so we slow down before Groq starts rejecting requests.
+- Priority classes: live windows go ahead of force_flush, which goes ahead
+  of post-meeting jobs. Within the live class jobs are served
+  earliest-deadline-first; other classes round-robin across sessions.
+- Coalescing: a session has at most one pending live window. A newer window
+  supersedes the queued one, so a session that falls behind only ever sends
+  its latest audio.
+
+StubTranscriber stands in for Groq so the scheduler can be load-tested
+offline (see benchmarks/bench_transcription_scheduler.py).
+"""
+
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Priority classes (lower runs first)
+PRIORITY_LIVE = 0
+PRIORITY_FLUSH = 1
+PRIORITY_POST = 2
+
+PRIORITY_NAMES = {PRIORITY_LIVE: "live", PRIORITY_FLUSH: "flush", PRIORITY_POST: "post"}
+
+# Default deadlines (seconds after submission) per priority class
+DEFAULT_DEADLINES = {PRIORITY_LIVE: 6.0, PRIORITY_FLUSH: 30.0, PRIORITY_POST: 600.0}
+
+# Scheduler configuration
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "20"))
+GROQ_REQUEST_BURST = int(os.getenv("GROQ_REQUEST_BURST", "5"))
+GROQ_MAX_IN_FLIGHT_PER_KEY = int(os.getenv("GROQ_MAX_IN_FLIGHT_PER_KEY", "8"))
+
+# Result returned to callers whose window was superseded or expired
+_SKIPPED_RESULT = {"text": "", "confidence": 0.0}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse Groq reset durations such as "2m59.56s", "7.66s" or "120ms".
+
+    Returns:
+        Seconds as float, or None if the value cannot be parsed.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Short, non-reversible label for an API key (safe for logs/metrics)."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:8]
+
+
+class TokenBucket:
+    """
+    Request token bucket for one API key.
+
+    Refills continuously at ``rate`` tokens/sec up to ``capacity``. Groq
+    response headers can lower the effective rate (remaining quota spread
+    over the reset window) or pause the bucket outright (retry-after,
+    quota exhausted).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.paused_until = 0.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        """Take one token if available."""
+        now = time.monotonic() if now is None else now
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def time_until_available(self, now: Optional[float] = None) -> float:
+        """Seconds until the next token can be acquired."""
+        now = time.monotonic() if now is None else now
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        if self.rate <= 0:
+            return 1.0
+        return (1.0 - self.tokens) / self.rate
+
+    def pause(self, seconds: float, now: Optional[float] = None):
+        """Stop handing out tokens for ``seconds``."""
+        now = time.monotonic() if now is None else now
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated_at = now
+
+    def observe_headers(self, headers: Dict[str, str], now: Optional[float] = None):
+        """
+        Feed Groq rate-limit headers into the bucket.
+
+        Uses ``retry-after`` and ``x-ratelimit-{remaining,reset}-requests``.
+        """
+        if not headers:
+            return
+        now = time.monotonic() if now is None else now
+
+        retry_after = parse_reset_duration(headers.get("retry-after"))
+        if retry_after is not None:
+            self.pause(retry_after, now)
+
+        try:
+            remaining = int(float(headers["x-ratelimit-remaining-requests"]))
+        except (KeyError, TypeError, ValueError):
+            return
+        reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+
+        self._refill(now)
+        if remaining <= 0:
+            self.pause(reset if reset is not None else 1.0, now)
+            return
+
+        # Never hold more tokens than the server says we have left
+        self.tokens = min(self.tokens, float(remaining))
+
+        # Spread the remaining quota over the reset window if that is
+        # slower than our configured rate
+        if reset and reset > 0:
+            self.rate = min(self.base_rate, remaining / reset)
+        else:
+            self.rate = self.base_rate
+
+
+@dataclass
+class TranscriptionJob:
+    """One unit of work submitted to the scheduler."""
+
+    session_id: str
+    api_key: str
+    audio_data: bytes
+    priority: int
+    deadline: float
+    kwargs: dict = field(default_factory=dict)
+    method: str = "transcribe_audio"
+    submitted_at: float = field(default_factory=time.monotonic)
+    seq: int = 0
+    attempts: int = 0
+    future: Optional[asyncio.Future] = None
+
+
+# transcriber(api_key, method, audio_data, kwargs) -> result dict
+Transcriber = Callable[[str, str, bytes, dict], Awaitable[dict]]
+
+
+# Wrappers around the GroqClientPool's connections, one per API key
+_groq_clients: Dict[str, object] = {}
+
+
+async def groq_transcriber(api_key: str, method: str, audio_data: bytes, kwargs: dict) -> dict:
+    """Default transcriber: the pooled async Groq client."""
+    from .groq_client import GroqTranscriptionClient, get_groq_client_pool
+
+    client = _groq_clients.get(api_key)
+    # The pool hands out a new connection after close_groq_client_pool()
+    if client is None or client.client is not get_groq_client_pool().get(api_key):
+        client = _groq_clients[api_key] = GroqTranscriptionClient(api_key)
+    return await getattr(client, method)(audio_data, **kwargs)
+
+
+class StubTranscriber:
+    """
+    Offline stand-in for Groq.
+
+    Sleeps for ``latency`` (+ uniform ``jitter``) seconds and emulates a
+    requests-per-minute limit, returning Groq-style rate-limit headers and
+    ``rate_limit_exceeded`` errors when it is exceeded.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        requests_per_minute: Optional[float] = None,
+        text: str = "stub transcript",
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_per_minute = requests_per_minute
+        self.text = text
+        self.calls = 0
+        self.rejected = 0
+        self._random = random.Random(0)
+        self._history: Deque[float] = deque()
+
+    def _rate_limit_headers(self, now: float) -> dict:
+        while self._history and now - self._history[0] > 60.0:
+            self._history.popleft()
+        limit = int(self.requests_per_minute)
+        remaining = max(0, limit - len(self._history))
+        reset = 60.0 - (now - self._history[0]) if self._history else 0.0
+        return {
+            "x-ratelimit-limit-requests": str(limit),
+            "x-ratelimit-remaining-requests": str(remaining),
+            "x-ratelimit-reset-requests": f"{reset:.2f}s",
+        }
+
+    async def __call__(self, api_key: str, method: str, audio_data: bytes, kwargs: dict) -> dict:
+        self.calls += 1
+        now = time.monotonic()
+
+        headers = {}
+        if self.requests_per_minute:
+            headers = self._rate_limit_headers(now)
+            if int(headers["x-ratelimit-remaining-requests"]) <= 0:
+                self.rejected += 1
+                headers["retry-after"] = headers["x-ratelimit-reset-requests"]
+                return {
+                    "text": "",
+                    "confidence": 0.0,
+                    "error": "rate_limit_exceeded",
+                    "rate_limit": headers,
+                }
+            self._history.append(now)
+            headers = self._rate_limit_headers(now)
+
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        return {
+            "text": self.text,
+            "confidence": 1.0,
+            "language": "en",
+            "audio_seconds": len(audio_data) / 32000.0,
+            "rate_limit": headers,
+        }
+
+
+class _KeyState:
+    """Queues, bucket and dispatcher for one API key."""
+
+    def __init__(self, api_key: str, bucket: TokenBucket, max_in_flight: int):
+        self.api_key = api_key
+        self.label = key_fingerprint(api_key)
+        self.bucket = bucket
+        # Pending live window per session (coalesced)
+        self.live: Dict[str, TranscriptionJob] = {}
+        # FIFO per session for flush/post jobs
+        self.queued: Dict[int, Dict[str, Deque[TranscriptionJob]]] = {
+            PRIORITY_FLUSH: {},
+            PRIORITY_POST: {},
+        }
+        self.last_served: Dict[str, float] = {}
+        self.in_flight = 0
+        self.max_in_flight = max_in_flight
+        self.wakeup = asyncio.Event()
+        self.dispatcher: Optional[asyncio.Task] = None
+
+    def depth(self) -> Dict[str, int]:
+        return {
+            "live": len(self.live),
+            "flush": sum(len(q) for q in self.queued[PRIORITY_FLUSH].values()),
+            "post": sum(len(q) for q in self.queued[PRIORITY_POST].values()),
+        }
+
+    def has_pending(self) -> bool:
+        return bool(self.live) or any(
+            q for sessions in self.queued.values() for q in sessions.values()
+        )
+
+    def pop_next(self) -> Optional[TranscriptionJob]:
+        """Pick the next job: live EDF, then round-robin flush/post."""
+        if self.live:
+            job = min(self.live.values(), key=lambda j: (j.deadline, j.seq))
+            del self.live[job.session_id]
+            return job
+
+        for priority in (PRIORITY_FLUSH, PRIORITY_POST):
+            sessions = self.queued[priority]
+            if not sessions:
+                continue
+            session_id = min(
+                sessions, key=lambda s: (self.last_served.get(s, 0.0), sessions[s][0].seq)
+            )
+            queue = sessions[session_id]
+            job = queue.popleft()
+            if not queue:
+                del sessions[session_id]
+            return job
+        return None
+
+
+class TranscriptionScheduler:
+    """
+    Central queue between streaming sessions and the transcription API.
+
+    Usage:
+        scheduler = get_transcription_scheduler()
+        result = await scheduler.submit(
+            session_id, api_key, window_bytes,
+            priority=PRIORITY_LIVE,
+            kwargs={"language": "auto", "translate_to_english": True},
+        )
+    """
+
+    def __init__(
+        self,
+        transcriber: Optional[Transcriber] = None,
+        requests_per_minute: float = GROQ_REQUESTS_PER_MINUTE,
+        burst: int = GROQ_REQUEST_BURST,
+        max_in_flight_per_key: int = GROQ_MAX_IN_FLIGHT_PER_KEY,
+        deadlines: Optional[Dict[int, float]] = None,
+        max_rate_limit_retries: int = 1,
+    ):
+        self.transcriber = transcriber or groq_transcriber
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.max_in_flight_per_key = max_in_flight_per_key
+        self.deadlines = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+        self._keys: Dict[str, _KeyState] = {}
+        # Running _run() tasks and their jobs (the loop only keeps weak
+        # references to tasks)
+        self._running: Dict[asyncio.Task, TranscriptionJob] = {}
+        self._seq = itertools.count()
+        self._closed = False
+
+        # Metrics
+        self.submitted = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.rate_limited = 0
+        self._wait_times: Dict[str, Deque[float]] = {
+            name: deque(maxlen=1000) for name in PRIORITY_NAMES.values()
+        }
+
+    def _key_state(self, api_key: str) -> _KeyState:
+        state = self._keys.get(api_key)
+        if state is None:
+            bucket = TokenBucket(self.requests_per_minute / 60.0, self.burst)
+            state = _KeyState(api_key, bucket, self.max_in_flight_per_key)
+            self._keys[api_key] = state
+        if state.dispatcher is None or state.dispatcher.done():
+            state.dispatcher = asyncio.create_task(self._dispatch_loop(state))
+        return state
+
+    async def submit(
+        self,
+        session_id: str,
+        api_key: str,
+        audio_data: bytes,
+        priority: int = PRIORITY_LIVE,
+        kwargs: Optional[dict] = None,
+        method: str = "transcribe_audio",
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """
+        Queue audio for transcription and wait for the result.
+
+        Args:
+            session_id: Submitting session (fairness/coalescing key)
+            api_key: API key whose quota the request is charged to
+            audio_data: Raw PCM audio (16kHz, mono, 16-bit); an AudioSource
+                for transcribe_full_audio
+            priority: PRIORITY_LIVE, PRIORITY_FLUSH or PRIORITY_POST
+            kwargs: Extra arguments for the transcriber method
+            method: Client method ("transcribe_audio" or "transcribe_full_audio")
+            deadline: Seconds from now after which the job is useless
+
+        Returns:
+            The transcriber result. Live windows that were superseded or
+            expired in the queue resolve to an empty result with
+            ``coalesced``/``expired`` set. Results that needed 429 retries
+            carry ``rate_limit_retries``.
+        """
+        if self._closed:
+            raise RuntimeError("TranscriptionScheduler is closed")
+
+        now = time.monotonic()
+        if deadline is None:
+            deadline = self.deadlines[priority]
+
+        job = TranscriptionJob(
+            session_id=session_id,
+            api_key=api_key,
+            audio_data=audio_data,
+            priority=priority,
+            deadline=now + deadline,
+            kwargs=kwargs or {},
+            method=method,
+            submitted_at=now,
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self.submitted += 1
+
+        state = self._key_state(api_key)
+        self._enqueue(state, job)
+        return await job.future
+
+    def _enqueue(self, state: _KeyState, job: TranscriptionJob):
+        if job.priority == PRIORITY_LIVE:
+            previous = state.live.get(job.session_id)
+            if previous is not None:
+                # Session fell behind: only its newest window matters
+                if previous.submitted_at > job.submitted_at:
+                    previous, job = job, previous
+                self.coalesced += 1
+                self._resolve(previous, dict(_SKIPPED_RESULT, coalesced=True))
+            state.live[job.session_id] = job
+        else:
+            state.queued[job.priority].setdefault(job.session_id, deque()).append(job)
+        state.wakeup.set()
+
+    @staticmethod
+    def _resolve(job: TranscriptionJob, result: dict):
+        if job.future is not None and not job.future.done():
+            job.future.set_result(result)
+
+    async def _dispatch_loop(self, state: _KeyState):
+        while not self._closed:
+            if not state.has_pending() or state.in_flight >= state.max_in_flight:
+                state.wakeup.clear()
+                await state.wakeup.wait()
+                continue
+
+            wait = state.bucket.time_until_available()
+            if wait > 0:
+                state.wakeup.clear()
+                try:
+                    # New submissions may change nothing about the bucket,
+                    # but re-check in case a higher-priority job arrived
+                    await asyncio.wait_for(state.wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job = state.pop_next()
+            if job is None:
+                continue
+
+            now = time.monotonic()
+            if job.priority == PRIORITY_LIVE and now > job.deadline:
+                self.expired += 1
+                self._resolve(job, dict(_SKIPPED_RESULT, expired=True))
+                continue
+
+            if not state.bucket.try_acquire(now):
+                # Lost the race with a header update; put it back
+                self._enqueue(state, job)
+                continue
+
+            self._wait_times[PRIORITY_NAMES[job.priority]].append(now - job.submitted_at)
+            state.last_served[job.session_id] = now
+            state.in_flight += 1
+            self.dispatched += 1
+            task = asyncio.create_task(self._run(state, job))
+            self._running[task] = job
+            task.add_done_callback(self._forget_task)
+
+    def _forget_task(self, task: asyncio.Task):
+        self._running.pop(task, None)
+
+    async def _run(self, state: _KeyState, job: TranscriptionJob):
+        try:
+            job.attempts += 1
+            result = await self.transcriber(job.api_key, job.method, job.audio_data, job.kwargs)
+        except Exception as e:
+            logger.error(f"❌ Scheduled transcription failed: {e}")
+            result = {"text": "", "confidence": 0.0, "error": str(e)}
+        finally:
+            state.in_flight -= 1
+            state.wakeup.set()
+
+        state.bucket.observe_headers(result.get("rate_limit") or {})
+
+        if result.get("error") == "rate_limit_exceeded":
+            self.rate_limited += 1
+            if state.bucket.time_until_available() <= 0:
+                state.bucket.pause(1.0)
+            superseded = (
+                job.priority == PRIORITY_LIVE and job.session_id in state.live
+            )
+            if superseded:
+                self.coalesced += 1
+                self._resolve(
+                    job,
+                    dict(_SKIPPED_RESULT, coalesced=True, rate_limit_retries=job.attempts),
+                )
+                return
+            if (
+                job.attempts <= self.max_rate_limit_retries
+                and time.monotonic() + state.bucket.time_until_available() < job.deadline
+            ):
+                logger.warning(
+                    f"⚠️ Rate limited on key {state.label}, requeueing "
+                    f"{PRIORITY_NAMES[job.priority]} job for {job.session_id}"
+                )
+                self._enqueue(state, job)
+                return
+
+        if job.attempts > 1:
+            # Only 429s are retried; lets callers see rate-limit pressure
+            result = dict(result, rate_limit_retries=job.attempts - 1)
+        self._resolve(job, result)
+
+    def get_metrics(self) -> dict:
+        """Queue depth, throughput and wait-time metrics."""
+
+        def summarize(waits: Deque[float]) -> dict:
+            if not waits:
+                return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+            ordered = sorted(waits)
+            return {
+                "count": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+
+        keys: List[dict] = []
+        for state in self._keys.values():
+            keys.append(
+                {
+                    "key": state.label,
+                    "queue_depth": state.depth(),
+                    "in_flight": state.in_flight,
+                    "tokens": round(state.bucket.tokens, 2),
+                    "rate_per_min": round(state.bucket.rate * 60, 2),
+                    "paused_for_s": round(
+                        max(0.0, state.bucket.paused_until - time.monotonic()), 2
+                    ),
+                }
+            )
+
+        return {
+            "submitted": self.submitted,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "expired": self.expired,
+            "rate_limited": self.rate_limited,
+            "queue_depth": sum(sum(k["queue_depth"].values()) for k in keys),
+            "wait_time": {name: summarize(w) for name, w in self._wait_times.items()},
+            "keys": keys,
+        }
+
+    async def close(self):
+        """Stop dispatchers and fail anything still queued or in flight."""
+        self._closed = True
+        running = dict(self._running)
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        for job in running.values():
+            self._resolve(job, dict(_SKIPPED_RESULT, error="scheduler_closed"))
+        for state in self._keys.values():
+            if state.dispatcher:
+                state.dispatcher.cancel()
+            pending = list(state.live.values()) + [
+                job
+                for sessions in state.queued.values()
+                for queue in sessions.values()
+                for job in queue
+            ]
+            for job in pending:
+                self._resolve(job, dict(_SKIPPED_RESULT, error="scheduler_closed"))
+        self._keys.clear()
+
+
+_scheduler: Optional[TranscriptionScheduler] = None
+
+
+def get_transcription_scheduler() -> TranscriptionScheduler:
+    """Get the process-wide transcription scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TranscriptionScheduler()
+    return _scheduler
+
+
+async def close_transcription_scheduler():
+    """Close the process-wide scheduler (call on shutdown)."""
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.close()
+        _scheduler = None
+    _groq_clients.clear()
@@ -0,0 +1,356 @@
+"""
+Streaming session state shared between uvicorn workers.
+
+Managers live in a per-process dict, so a reconnect could only resume its
+session if it landed on the same worker, which pinned us to one worker per
+pod. Sessions are now owned through a lease in a SessionStore, and the
+owning worker keeps a snapshot of what a resume needs there:
+
+- the manager's finalized tail and dedup history
+  (StreamingTranscriptionManager.snapshot_state)
+- the recorder's chunk index and chunk metadata, so a resumed recording
+  appends instead of overwriting chunk_00000
+- meeting_id / user_email of the session
+
+A worker that gets a reconnect for a session it does not hold waits (up to
+SESSION_LEASE_WAIT seconds) for the lease, loads the snapshot and rebuilds
+the manager. If the store itself cannot be reached for that long,
+SessionLease.acquire() raises SessionStoreUnavailable rather than
+reporting the session as held elsewhere.
+
+The owner renews its lease every SESSION_LEASE_TTL / 3 seconds and
+refreshes the snapshot at the same time; only the lease holder can write
+the snapshot, so a worker that lost its lease cannot clobber the new
+owner's state. Snapshots expire SESSION_STATE_TTL seconds after the last
+write.
+
+A lease is lost when a renewal finds another owner, or when the store has
+been unreachable for a whole TTL (another worker may have taken the
+session meanwhile). SessionLease.lost_event is set then, and the streaming
+websocket must stop: it closes the socket with SESSION_MOVED, abandons
+its recorder and leaves finalization to the new owner.
+
+Backends (SESSION_STORE):
+
+    memory  (default) single-process dict, same behaviour as before
+    redis   REDIS_URL; uses only GET/DEL/EVAL, so any Redis-compatible
+            server or client stand-in with Lua support works
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SESSION_STORE_PREFIX = os.getenv("SESSION_STORE_PREFIX", "meetings:session:")
+SESSION_LEASE_TTL = float(os.getenv("SESSION_LEASE_TTL", "15"))
+SESSION_LEASE_WAIT = float(os.getenv("SESSION_LEASE_WAIT", "20"))
+SESSION_STATE_TTL = float(os.getenv("SESSION_STATE_TTL", "3600"))
+
+# Identifies this process as a lease owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SessionStoreUnavailable(Exception):
+    """The session store could not be reached, so lease ownership is unknown."""
+
+
+class InMemorySessionStore:
+    """Process-local store (single worker)."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._leases: Dict[str, Tuple[str, float]] = {}  # session -> (owner, expiry)
+        self._states: Dict[str, Tuple[str, float]] = {}  # session -> (json, expiry)
+
+    def _live(self, table: Dict, session_id: str):
+        entry = table.get(session_id)
+        if entry and entry[1] <= time.monotonic():
+            del table[session_id]
+            return None
+        return entry
+
+    async def acquire_lease(self, session_id: str, owner: str, ttl: float) -> bool:
+        """Take or renew the lease; False if another owner holds it."""
+        entry = self._live(self._leases, session_id)
+        if entry and entry[0] != owner:
+            return False
+        self._leases[session_id] = (owner, time.monotonic() + ttl)
+        return True
+
+    async def release_lease(self, session_id: str, owner: str) -> bool:
+        entry = self._live(self._leases, session_id)
+        if not entry or entry[0] != owner:
+            return False
+        del self._leases[session_id]
+        return True
+
+    async def save_state(self, session_id: str, owner: str, state: dict, ttl: float) -> bool:
+        """Write the snapshot, only while holding the lease."""
+        entry = self._live(self._leases, session_id)
+        if not entry or entry[0] != owner:
+            return False
+        self._states[session_id] = (json.dumps(state), time.monotonic() + ttl)
+        return True
+
+    async def load_state(self, session_id: str) -> Optional[dict]:
+        entry = self._live(self._states, session_id)
+        return json.loads(entry[0]) if entry else None
+
+    async def lease_owner(self, session_id: str) -> Optional[str]:
+        entry = self._live(self._leases, session_id)
+        return entry[0] if entry else None
+
+    async def delete_state(self, session_id: str):
+        self._states.pop(session_id, None)
+
+    async def close(self):
+        pass
+
+
+# KEYS[1] = lease key; ARGV = owner, ttl_ms
+_ACQUIRE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if (not current) or current == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# KEYS[1] = lease key; ARGV = owner
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+return 0
+"""
+
+# KEYS = lease key, state key; ARGV = owner, state json, ttl_ms
+_SAVE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[2], ARGV[2], 'PX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class RedisSessionStore:
+    """
+    Store shared by all workers. Lease checks and fenced writes are single
+    Lua scripts, so they are atomic on the server.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client=None, url: str = REDIS_URL, prefix: str = SESSION_STORE_PREFIX):
+        """
+        Args:
+            client: redis.asyncio-compatible client (decode_responses=True);
+                created from url when omitted
+            url: Redis URL
+            prefix: Key prefix
+        """
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+
+    def _lease_key(self, session_id: str) -> str:
+        return f"{self.prefix}lease:{session_id}"
+
+    def _state_key(self, session_id: str) -> str:
+        return f"{self.prefix}state:{session_id}"
+
+    async def acquire_lease(self, session_id: str, owner: str, ttl: float) -> bool:
+        result = await self.client.eval(
+            _ACQUIRE_LUA, 1, self._lease_key(session_id), owner, int(ttl * 1000)
+        )
+        return bool(result)
+
+    async def release_lease(self, session_id: str, owner: str) -> bool:
+        result = await self.client.eval(_RELEASE_LUA, 1, self._lease_key(session_id), owner)
+        return bool(result)
+
+    async def save_state(self, session_id: str, owner: str, state: dict, ttl: float) -> bool:
+        result = await self.client.eval(
+            _SAVE_LUA,
+            2,
+            self._lease_key(session_id),
+            self._state_key(session_id),
+            owner,
+            json.dumps(state),
+            int(ttl * 1000),
+        )
+        return bool(result)
+
+    async def load_state(self, session_id: str) -> Optional[dict]:
+        raw = await self.client.get(self._state_key(session_id))
+        return json.loads(raw) if raw else None
+
+    async def lease_owner(self, session_id: str) -> Optional[str]:
+        return await self.client.get(self._lease_key(session_id))
+
+    async def delete_state(self, session_id: str):
+        await self.client.delete(self._state_key(session_id))
+
+    async def close(self):
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close:
+            await close()
+
+
+class SessionLease:
+    """
+    This worker's ownership of one streaming session: acquire, keep alive
+    (renewing the lease and refreshing the snapshot), release.
+    """
+
+    def __init__(
+        self,
+        store,
+        session_id: str,
+        owner: str = WORKER_ID,
+        ttl: float = SESSION_LEASE_TTL,
+        state_ttl: float = SESSION_STATE_TTL,
+    ):
+        self.store = store
+        self.session_id = session_id
+        self.owner = owner
+        self.ttl = ttl
+        self.state_ttl = state_ttl
+        self.held = False
+        self.lost = False
+        self.lost_event = asyncio.Event()
+        self.renewed_at = 0.0  # time.monotonic() of the last successful renewal
+        self.last_saved: Optional[dict] = None  # Last snapshot the store accepted
+        self._keepalive: Optional[asyncio.Task] = None
+
+    async def acquire(self, wait: float = SESSION_LEASE_WAIT) -> bool:
+        """
+        Take the lease, waiting up to `wait` seconds for another worker to
+        hand the session off (or for its lease to expire).
+
+        Returns False if another owner still holds it. Raises
+        SessionStoreUnavailable if the store kept failing until the
+        deadline (errors before that are retried like a held lease).
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            try:
+                if await self.store.acquire_lease(self.session_id, self.owner, self.ttl):
+                    self.held = True
+                    self.renewed_at = time.monotonic()
+                    return True
+                error = None
+            except Exception as e:
+                error = e
+                logger.warning(f"Session store error while leasing {self.session_id}: {e}")
+            if time.monotonic() >= deadline:
+                if error is not None:
+                    logger.error(f"❌ Session store unavailable, cannot lease {self.session_id}")
+                    raise SessionStoreUnavailable(str(error)) from error
+                return False
+            await asyncio.sleep(0.25)
+
+    async def load(self) -> Optional[dict]:
+        try:
+            return await self.store.load_state(self.session_id)
+        except Exception as e:
+            logger.error(f"Failed to load state for session {self.session_id}: {e}")
+            return None
+
+    async def save(self, state: Optional[dict]) -> bool:
+        if not state or not self.held or self.lost:
+            return False
+        try:
+            saved = await self.store.save_state(
+                self.session_id, self.owner, state, self.state_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Failed to save state for session {self.session_id}: {e}")
+            return False
+        if saved:
+            self.last_saved = state
+        return saved
+
+    def start(self, snapshot: Callable[[], Optional[dict]]):
+        """Renew the lease and save snapshot() every ttl/3 seconds."""
+        if self._keepalive is None:
+            self._keepalive = asyncio.create_task(self._run_keepalive(snapshot))
+
+    def _mark_lost(self, reason: str):
+        self.lost = True
+        self.lost_event.set()
+        logger.error(f"❌ Lost lease on session {self.session_id}: {reason}")
+
+    async def _run_keepalive(self, snapshot: Callable[[], Optional[dict]]):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                renewed = await self.store.acquire_lease(self.session_id, self.owner, self.ttl)
+            except Exception as e:
+                if time.monotonic() - self.renewed_at >= self.ttl:
+                    # Expired in the store; another worker may own it by now
+                    self._mark_lost(f"session store unreachable for {self.ttl:g}s ({e})")
+                    return
+                # Keep going; the lease survives a blip shorter than its TTL
+                logger.warning(f"Lease renewal failed for session {self.session_id}: {e}")
+                continue
+            if not renewed:
+                self._mark_lost("taken over by another worker")
+                return
+            self.renewed_at = time.monotonic()
+            await self.save(snapshot())
+
+    async def release(self, state: Optional[dict] = None):
+        """Save the final snapshot and give the session up."""
+        if self._keepalive:
+            self._keepalive.cancel()
+            self._keepalive = None
+        if not self.held:
+            return
+        await self.save(state)
+        if not self.lost:
+            try:
+                await self.store.release_lease(self.session_id, self.owner)
+            except Exception as e:
+                logger.warning(f"Failed to release lease on session {self.session_id}: {e}")
+        self.held = False
+
+
+_store = None
+
+
+def get_session_store():
+    """Get the process-wide session store (SESSION_STORE backend)."""
+    global _store
+    if _store is None:
+        if SESSION_STORE == "redis":
+            _store = RedisSessionStore()
+            logger.info("✅ Session store: redis")
+        else:
+            if SESSION_STORE != "memory":
+                logger.warning(f"Unknown SESSION_STORE '{SESSION_STORE}', using memory")
+            _store = InMemorySessionStore()
+    return _store
+
+
+async def close_session_store():
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
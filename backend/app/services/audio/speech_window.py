@@ -0,0 +1,145 @@
+"""
+Speech-only window extraction.
+
+Before a window is uploaded to Whisper, the per-sample VAD mask kept by
+RollingAudioBuffer is used to drop silence:
+
+- trim:    cut leading/trailing silence (keeping ``pad_ms`` around speech)
+- compact: additionally shorten long internal pauses to ``keep_gap_ms``
+
+This cuts upload bytes and billed audio seconds on sparse meetings and
+gives Whisper less silence to hallucinate on. A SpeechTimeMap records where
+each kept piece came from so times in the uploaded audio can be mapped
+back to client (AudioContext) time.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_TRIM = "trim"
+MODE_COMPACT = "compact"
+MODES = (MODE_OFF, MODE_TRIM, MODE_COMPACT)
+
+
+@dataclass
+class SpeechTimeMap:
+    """
+    Maps offsets in extracted audio back to the source window.
+
+    ``pieces`` holds (out_start, src_start, length) in samples.
+    ``source_start_time`` is the client time of the window's first sample.
+    """
+
+    sample_rate: int
+    source_start_time: float
+    pieces: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @property
+    def output_samples(self) -> int:
+        if not self.pieces:
+            return 0
+        out_start, _, length = self.pieces[-1]
+        return out_start + length
+
+    def to_source_time(self, seconds: float) -> float:
+        """Client time for an offset (seconds) into the extracted audio."""
+        sample = int(round(seconds * self.sample_rate))
+        for out_start, src_start, length in self.pieces:
+            if sample < out_start + length:
+                src = src_start + max(0, sample - out_start)
+                return self.source_start_time + src / self.sample_rate
+        if not self.pieces:
+            return self.source_start_time
+        out_start, src_start, length = self.pieces[-1]
+        return self.source_start_time + (src_start + length) / self.sample_rate
+
+    @property
+    def start_time(self) -> float:
+        """Client time of the first extracted sample."""
+        return self.to_source_time(0.0)
+
+    @property
+    def end_time(self) -> float:
+        """Client time just past the last extracted sample."""
+        if not self.pieces:
+            return self.source_start_time
+        _, src_start, length = self.pieces[-1]
+        return self.source_start_time + (src_start + length) / self.sample_rate
+
+
+def _speech_islands(mask: np.ndarray) -> np.ndarray:
+    """(start, end) sample pairs of contiguous True runs, shape (n, 2)."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges.reshape(-1, 2)
+
+
+def extract_speech(
+    window: np.ndarray,
+    speech_mask: np.ndarray,
+    source_start_time: float,
+    sample_rate: int = 16000,
+    mode: str = MODE_TRIM,
+    pad_ms: int = 200,
+    keep_gap_ms: int = 300,
+) -> Tuple[np.ndarray, SpeechTimeMap]:
+    """
+    Extract the speech portions of a window.
+
+    Args:
+        window: int16 samples
+        speech_mask: per-sample VAD decisions, same length as window
+        source_start_time: client time of window[0] (seconds)
+        sample_rate: Audio sample rate in Hz
+        mode: MODE_TRIM or MODE_COMPACT (MODE_OFF returns the window as-is)
+        pad_ms: silence kept before/after each speech island
+        keep_gap_ms: (compact) max silence kept between islands
+
+    Returns:
+        (samples, time_map). samples is empty if the window has no speech.
+    """
+    time_map = SpeechTimeMap(sample_rate, source_start_time)
+    n = len(window)
+
+    if mode == MODE_OFF:
+        time_map.pieces.append((0, 0, n))
+        return window, time_map
+
+    islands = _speech_islands(np.asarray(speech_mask, dtype=bool))
+    if len(islands) == 0:
+        return window[:0], time_map
+
+    pad = int(sample_rate * pad_ms / 1000)
+    # Pad islands and merge any that now touch
+    starts = np.maximum(islands[:, 0] - pad, 0)
+    ends = np.minimum(islands[:, 1] + pad, n)
+
+    if mode == MODE_TRIM:
+        time_map.pieces.append((0, int(starts[0]), int(ends[-1] - starts[0])))
+        return window[starts[0] : ends[-1]], time_map
+
+    # MODE_COMPACT: keep padded islands, shorten gaps between them
+    keep_gap = int(sample_rate * keep_gap_ms / 1000)
+    merged: List[List[int]] = [[int(starts[0]), int(ends[0])]]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - merged[-1][1] <= keep_gap:
+            merged[-1][1] = int(end)
+        else:
+            # Keep keep_gap of the pause, split evenly around the cut
+            half = keep_gap // 2
+            merged[-1][1] += half
+            merged.append([int(start) - (keep_gap - half), int(end)])
+
+    out_start = 0
+    for start, end in merged:
+        time_map.pieces.append((out_start, start, end - start))
+        out_start += end - start
+
+    samples = np.concatenate([window[start:end] for start, end in merged])
+    return samples, time_map
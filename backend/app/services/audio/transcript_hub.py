@@ -0,0 +1,214 @@
+"""
+In-process fan-out of live transcript events to viewer websockets.
+
+The streaming websocket is the only consumer of its manager's partials and
+finals, so other people in the meeting had to poll for the transcript. The
+producer now also publishes each event to a TranscriptHub topic (keyed by
+meeting_id, with the session_id as an alias) and any number of viewers
+subscribe to it over /ws/transcript-subscribe. One Groq stream serves the
+whole room.
+
+- Events are serialized once per publish and shared by all subscribers.
+- Each subscriber has a bounded queue. publish() never waits: a subscriber
+  whose queue is full is evicted (its socket gets SLOW_CONSUMER and is
+  closed) instead of holding back the producer or growing memory. The
+  client can simply reconnect.
+- The last TRANSCRIPT_REPLAY_SIZE finals are kept per topic and replayed to
+  new subscribers so late joiners catch up. Partials are not kept.
+- Several streaming sessions can produce into one meeting's topic (e.g.
+  two devices in the same meeting). Producers are counted per topic and
+  the topic is closed when the last one ends; subscribers then get a
+  `session_ended` event.
+
+Topics live in the memory of the worker that holds the producing
+websocket. With several uvicorn workers a viewer only finds the topic if
+its /ws/transcript-subscribe lands on that worker (route both sockets by
+meeting_id, or run one worker); otherwise it gets SESSION_NOT_FOUND.
+Sharing topics across workers would need a pub/sub channel in the
+session store (services/audio/session_store.py), which this hub does not
+use.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_REPLAY_SIZE = int(os.getenv("TRANSCRIPT_REPLAY_SIZE", "50"))
+TRANSCRIPT_SUBSCRIBER_QUEUE = int(os.getenv("TRANSCRIPT_SUBSCRIBER_QUEUE", "100"))
+
+# Why a subscriber stream ended
+CLOSE_SESSION_ENDED = "session_ended"
+CLOSE_SLOW_CONSUMER = "slow_consumer"
+
+
+class TranscriptSubscriber:
+    """One viewer's bounded queue of serialized events."""
+
+    def __init__(self, maxsize: int):
+        # Bound enforced in offer() so close() can always append its sentinel
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.maxsize = maxsize
+        self.close_reason: Optional[str] = None
+        self.delivered = 0
+
+    def offer(self, message: str) -> bool:
+        """Queue an event without waiting; False if the queue is full."""
+        if self.close_reason:
+            return True
+        if self._queue.qsize() >= self.maxsize:
+            return False
+        self._queue.put_nowait(message)
+        return True
+
+    def close(self, reason: str):
+        """End the stream; slow consumers lose what they had not read yet."""
+        if self.close_reason:
+            return
+        self.close_reason = reason
+        if reason == CLOSE_SLOW_CONSUMER:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Optional[str]:
+        """Next serialized event, or None once the stream is closed."""
+        message = await self._queue.get()
+        if message is not None:
+            self.delivered += 1
+        return message
+
+
+class TranscriptTopic:
+    """Subscribers and replay history of one live session."""
+
+    def __init__(self, key: str, replay_size: int = TRANSCRIPT_REPLAY_SIZE):
+        self.key = key
+        self.history: deque = deque(maxlen=replay_size)
+        self.subscribers: Set[TranscriptSubscriber] = set()
+        self.producers: Set[str] = set()
+        self.published = 0
+        self.evicted = 0
+
+    def publish(self, event: dict, replay: bool = False):
+        """
+        Send an event to every subscriber. Never blocks.
+
+        Args:
+            event: JSON-serializable event (same shape as the producer sees)
+            replay: Keep it for subscribers that join later (finals)
+        """
+        message = json.dumps(event)
+        if replay:
+            self.history.append(message)
+        self.published += 1
+
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(message):
+                self.evicted += 1
+                self.subscribers.discard(subscriber)
+                subscriber.close(CLOSE_SLOW_CONSUMER)
+                logger.warning(f"[TranscriptHub] Evicted slow subscriber from {self.key}")
+
+    def subscribe(self, queue_size: int = TRANSCRIPT_SUBSCRIBER_QUEUE) -> TranscriptSubscriber:
+        """New subscriber, pre-loaded with the replay history."""
+        subscriber = TranscriptSubscriber(queue_size + len(self.history))
+        for message in self.history:
+            subscriber.offer(message)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: TranscriptSubscriber):
+        self.subscribers.discard(subscriber)
+
+    def close(self):
+        self.publish({"type": CLOSE_SESSION_ENDED, "session": self.key})
+        for subscriber in list(self.subscribers):
+            subscriber.close(CLOSE_SESSION_ENDED)
+        self.subscribers.clear()
+
+
+class TranscriptHub:
+    """Process-wide registry of live transcript topics."""
+
+    def __init__(self, replay_size: int = TRANSCRIPT_REPLAY_SIZE):
+        self.replay_size = replay_size
+        self._topics: Dict[str, TranscriptTopic] = {}
+        self._aliases: Dict[str, str] = {}
+        self.total_evicted = 0
+
+    def open_topic(
+        self, key: str, aliases: Iterable[str] = (), producer: Optional[str] = None
+    ) -> TranscriptTopic:
+        """
+        Topic for a producing session (existing one on resume, or when
+        another session of the same meeting already produces into it).
+
+        producer identifies the session (default: key); the topic stays
+        open until every producer has called close_topic().
+        """
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = TranscriptTopic(key, self.replay_size)
+            self._topics[key] = topic
+            logger.info(f"[TranscriptHub] 📡 Opened topic {key}")
+        topic.producers.add(producer or key)
+        for alias in aliases:
+            if alias and alias != key:
+                self._aliases[alias] = key
+        return topic
+
+    def get_topic(self, key: str) -> Optional[TranscriptTopic]:
+        """Look up a topic by meeting_id or session_id."""
+        if not key:
+            return None
+        return self._topics.get(self._aliases.get(key, key))
+
+    def close_topic(self, key: str, producer: Optional[str] = None):
+        """
+        Called when a producing session ends. The topic (and all its
+        aliases) is closed once its last producer is gone.
+        """
+        key = self._aliases.get(key, key)
+        topic = self._topics.get(key)
+        if not topic:
+            return
+        topic.producers.discard(producer or key)
+        if producer and self._aliases.get(producer) == key:
+            del self._aliases[producer]
+        if topic.producers:
+            logger.info(
+                f"[TranscriptHub] Producer left {key}, {len(topic.producers)} still live"
+            )
+            return
+
+        del self._topics[key]
+        self._aliases = {a: k for a, k in self._aliases.items() if k != key}
+        self.total_evicted += topic.evicted
+        topic.close()
+        logger.info(f"[TranscriptHub] Closed topic {key}")
+
+    def get_stats(self) -> dict:
+        topics = list(self._topics.values())
+        return {
+            "topics": len(topics),
+            "producers": sum(len(t.producers) for t in topics),
+            "subscribers": sum(len(t.subscribers) for t in topics),
+            "published": sum(t.published for t in topics),
+            "evicted": self.total_evicted + sum(t.evicted for t in topics),
+        }
+
+
+_hub: Optional[TranscriptHub] = None
+
+
+def get_transcript_hub() -> TranscriptHub:
+    """Get the process-wide transcript hub."""
+    global _hub
+    if _hub is None:
+        _hub = TranscriptHub()
+    return _hub
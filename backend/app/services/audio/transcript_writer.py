@@ -0,0 +1,148 @@
+"""
+Write-behind persistence of finalized live transcript segments.
+
+Finals used to reach the DB only when the frontend posted the whole
+transcript to /save-transcript at the end of the meeting, so a crashed tab
+lost everything and the save landed as one large burst. Each streaming
+session now owns a TranscriptWriteBehind that batches its finals into
+transcript_segments every TRANSCRIPT_FLUSH_SEGMENTS segments or
+TRANSCRIPT_FLUSH_SECONDS seconds, whichever comes first, and is flushed on
+disconnect.
+
+save_meeting_transcripts_batch skips segments that are already stored, so
+failed batches can simply be retried and /save-transcript acts as a
+reconcile of whatever the write-behind did not get to.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional, Set
+
+try:
+    from ...schemas.meeting import Transcript
+except (ImportError, ValueError):
+    from schemas.meeting import Transcript
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_FLUSH_SEGMENTS = int(os.getenv("TRANSCRIPT_FLUSH_SEGMENTS", "10"))
+TRANSCRIPT_FLUSH_SECONDS = float(os.getenv("TRANSCRIPT_FLUSH_SECONDS", "5"))
+
+
+class TranscriptWriteBehind:
+    """Per-session buffer of finalized segments, flushed in batches."""
+
+    def __init__(
+        self,
+        db,
+        meeting_id: str,
+        max_segments: int = TRANSCRIPT_FLUSH_SEGMENTS,
+        max_delay: float = TRANSCRIPT_FLUSH_SECONDS,
+        source: str = "live",
+    ):
+        """
+        Args:
+            db: DatabaseManager
+            meeting_id: Meeting the segments belong to
+            max_segments: Flush once this many segments are pending
+            max_delay: Flush at most this many seconds after a segment arrives
+            source: transcript_segments.source for written rows
+        """
+        self.db = db
+        self.meeting_id = meeting_id
+        self.max_segments = max_segments
+        self.max_delay = max_delay
+        self.source = source
+
+        self._pending: List[Transcript] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._seq = 0
+
+        self.segments_written = 0
+        self.batches_written = 0
+        self.flush_failures = 0
+
+    def add(self, segment: dict):
+        """Queue a final (the dict passed to on_final). Never blocks."""
+        text = segment.get("text")
+        if not text:
+            return
+
+        self._seq += 1
+        self._pending.append(
+            Transcript(
+                id=f"{self.meeting_id}-live-{self._seq}",
+                text=text,
+                timestamp=datetime.utcnow().isoformat(),
+                audio_start_time=segment.get("audio_start_time"),
+                audio_end_time=segment.get("audio_end_time"),
+                duration=segment.get("duration"),
+            )
+        )
+
+        if len(self._pending) >= self.max_segments:
+            task = asyncio.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._arm_timer()
+
+    def _arm_timer(self):
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_delay())
+
+    async def _flush_after_delay(self):
+        await asyncio.sleep(self.max_delay)
+        self._timer = None  # Lets a failed flush re-arm a fresh timer
+        # Shielded: cancelling the timer must not abort a write in progress
+        await asyncio.shield(self.flush())
+
+    async def flush(self) -> bool:
+        """Write everything pending. Failed batches stay queued for retry."""
+        async with self._lock:
+            if not self._pending:
+                return True
+
+            batch, self._pending = self._pending, []
+            try:
+                await self.db.save_meeting_transcripts_batch(
+                    self.meeting_id, batch, source=self.source
+                )
+                self.segments_written += len(batch)
+                self.batches_written += 1
+                logger.debug(f"💾 Wrote {len(batch)} live segments for {self.meeting_id}")
+                return True
+            except Exception as e:
+                self.flush_failures += 1
+                self._pending = batch + self._pending
+                logger.error(
+                    f"Failed to write {len(batch)} live segments for {self.meeting_id}: {e}"
+                )
+                return False
+            finally:
+                if self._pending:
+                    self._arm_timer()
+
+    async def close(self) -> bool:
+        """Stop the timer and write whatever is left."""
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        ok = await self.flush()
+        # A failed final flush re-arms the timer; nothing will retry now
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        return ok
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "segments_written": self.segments_written,
+            "batches_written": self.batches_written,
+            "flush_failures": self.flush_failures,
+        }
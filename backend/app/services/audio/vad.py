@@ -1,14 +1,93 @@
 """
 Simple Voice Activity Detection (VAD) based on audio amplitude.
 Fast and lightweight alternative to Silero VAD for MVP.
+
+All backends share a frame-level API:
+- frame_size: samples per frame
+- frame_probabilities(audio) -> np.ndarray: one score per full frame
+- get_speech_segments(...): vectorized segmentation over those scores
 """
 
 import numpy as np
 import logging
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+
+def _to_float32(audio: np.ndarray) -> np.ndarray:
+    if audio.dtype == np.int16:
+        return audio.astype(np.float32) / 32768.0
+    return audio.astype(np.float32, copy=False)
+
+
+def _to_int16(audio: np.ndarray) -> np.ndarray:
+    if audio.dtype == np.int16:
+        return audio
+    if audio.dtype in (np.float32, np.float64):
+        return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    return audio.astype(np.int16)
+
+
+def _frames(audio: np.ndarray, frame_size: int) -> np.ndarray:
+    """(n_frames, frame_size) view of the full frames in audio."""
+    n_frames = len(audio) // frame_size
+    return audio[: n_frames * frame_size].reshape(n_frames, frame_size)
+
+
+def segments_from_frames(
+    speech: np.ndarray,
+    frame_ms: float,
+    total_ms: float,
+    min_speech_duration_ms: int = 250,
+    min_silence_duration_ms: int = 500,
+    hangover_ms: Optional[float] = None,
+) -> List[dict]:
+    """
+    Turn per-frame speech decisions into {'start': ms, 'end': ms} segments.
+
+    A segment closes once silence lasts ``min_silence_duration_ms``; shorter
+    pauses are bridged. Closed segments end ``hangover_ms`` after their last
+    speech frame (default: the frame at which the silence threshold was
+    reached, matching the old frame-by-frame loop). A segment still open at
+    the end runs to ``total_ms``. Segments shorter than
+    ``min_speech_duration_ms`` are dropped.
+    """
+    speech = np.asarray(speech, dtype=bool)
+    if not speech.any():
+        return []
+
+    # Frames of silence needed to close a segment
+    close_frames = max(1, int(np.ceil(min_silence_duration_ms / frame_ms)))
+    if hangover_ms is None:
+        hangover_ms = (close_frames - 1) * frame_ms
+
+    # Speech runs as [start, end) frame indices
+    padded = np.concatenate(([False], speech, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    run_starts, run_ends = edges[0::2], edges[1::2]
+
+    # Bridge gaps too short to close a segment
+    gaps = run_starts[1:] - run_ends[:-1]
+    breaks = np.flatnonzero(gaps >= close_frames)
+    seg_starts = run_starts[np.concatenate(([0], breaks + 1))]
+    seg_last = run_ends[np.concatenate((breaks, [len(run_ends) - 1]))]
+
+    starts_ms = seg_starts * frame_ms
+    ends_ms = seg_last * frame_ms + hangover_ms
+
+    # Last segment stays open unless enough trailing silence follows it
+    if len(speech) - seg_last[-1] < close_frames:
+        ends_ms[-1] = total_ms
+    ends_ms = np.minimum(ends_ms, total_ms)
+
+    keep = (ends_ms - starts_ms) >= min_speech_duration_ms
+    return [
+        {"start": int(start), "end": int(end)}
+        for start, end in zip(starts_ms[keep], ends_ms[keep])
+    ]
+
 class SimpleVAD:
     """
     Amplitude-based Voice Activity Detection.
@@ -26,6 +105,7 @@ class SimpleVAD:
         """
         self.threshold = threshold
         self.sample_rate = sample_rate
+        self.frame_size = int(0.1 * sample_rate)  # 100ms frames
         logger.info(f"✅ SimpleVAD initialized (threshold={threshold})")
 
     def is_speech(self, audio_chunk: np.ndarray) -> bool:
@@ -52,6 +132,18 @@ class SimpleVAD:
 
         return is_speech
 
+    def frame_probabilities(self, audio: np.ndarray, reset_state: bool = True) -> np.ndarray:
+        """
+        RMS energy of every full 100ms frame, in one vectorized pass.
+        (Stateless; ``reset_state`` is accepted for API parity.)
+
+        Returns:
+            float32 array of shape (len(audio) // frame_size,); a frame is
+            speech if its value is above ``threshold``.
+        """
+        frames = _frames(_to_float32(audio), self.frame_size)
+        return np.sqrt(np.mean(frames ** 2, axis=1)).astype(np.float32)
+
     def get_speech_segments(
         self,
         audio: np.ndarray,
@@ -69,55 +161,14 @@ class SimpleVAD:
         Returns:
             List of {'start': ms, 'end': ms} dicts
         """
-        # Process in chunks
-        chunk_duration_ms = 100  # 100ms chunks
-        chunk_size = int((chunk_duration_ms / 1000) * self.sample_rate)
-
-        segments = []
-        current_segment_start = None
-        silence_duration = 0
-
-        for i in range(0, len(audio), chunk_size):
-            chunk = audio[i:i + chunk_size]
-            if len(chunk) < chunk_size:
-                break
-
-            is_speech = self.is_speech(chunk)
-            timestamp_ms = (i / self.sample_rate) * 1000
-
-            if is_speech:
-                silence_duration = 0
-                # Start new segment if not in one
-                if current_segment_start is None:
-                    current_segment_start = timestamp_ms
-            else:
-                # Accumulate silence
-                silence_duration += chunk_duration_ms
-
-                # End segment if silence long enough
-                if current_segment_start is not None and silence_duration >= min_silence_duration_ms:
-                    segment_duration = timestamp_ms - current_segment_start
-
-                    # Only add if long enough
-                    if segment_duration >= min_speech_duration_ms:
-                        segments.append({
-                            'start': int(current_segment_start),
-                            'end': int(timestamp_ms)
-                        })
-
-                    current_segment_start = None
-
-        # Add final segment if exists
-        if current_segment_start is not None:
-            final_timestamp = (len(audio) / self.sample_rate) * 1000
-            segment_duration = final_timestamp - current_segment_start
-            if segment_duration >= min_speech_duration_ms:
-                segments.append({
-                    'start': int(current_segment_start),
-                    'end': int(final_timestamp)
-                })
-
-        return segments
+        probs = self.frame_probabilities(audio)
+        return segments_from_frames(
+            probs > self.threshold,
+            frame_ms=self.frame_size / self.sample_rate * 1000,
+            total_ms=len(audio) / self.sample_rate * 1000,
+            min_speech_duration_ms=min_speech_duration_ms,
+            min_silence_duration_ms=min_silence_duration_ms,
+        )
 
 
 class SileroVAD:
@@ -128,29 +179,32 @@ class SileroVAD:
     Requires torch to be installed.
     """
 
-    def __init__(self, threshold: float = 0.5, sample_rate: int = 16000):
+    def __init__(self, threshold: float = 0.5, sample_rate: int = 16000, model=None):
         """
         Args:
             threshold: Speech probability threshold (0.0-1.0)
             sample_rate: Audio sample rate (16000 recommended)
+            model: Already loaded Silero model (skips torch.hub.load; the
+                   VAD pool passes a copy of a model it loaded once)
         """
         try:
             import torch
             self.torch = torch
             
             # Load Silero VAD model
-            model, utils = torch.hub.load(
-                repo_or_dir='snakers4/silero-vad',
-                model='silero_vad',
-                force_reload=False,
-                onnx=False,
-                trust_repo=True
-            )
+            if model is None:
+                model, _ = torch.hub.load(
+                    repo_or_dir='snakers4/silero-vad',
+                    model='silero_vad',
+                    force_reload=False,
+                    onnx=False,
+                    trust_repo=True
+                )
             
             self.model = model
-            self.get_speech_timestamps, _, self.read_audio, *_ = utils
             self.threshold = threshold
             self.sample_rate = sample_rate
+            self.frame_size = 512 if sample_rate == 16000 else 256
             
             # State for streaming
             self.h = None  # Hidden state for LSTM
@@ -173,38 +227,16 @@ class SileroVAD:
             True if speech detected, False if silence/noise
         """
         try:
-            # Convert to float32 tensor
-            if audio_chunk.dtype == np.int16:
-                audio_float = audio_chunk.astype(np.float32) / 32768.0
-            else:
-                audio_float = audio_chunk.astype(np.float32)
-            
-            # Silero VAD (v4) typically expects 512, 1024, or 1536 samples for 16kHz
-            # We will process in chunks of 512 and return True if ANY chunk is speech
-            
-            window_size = 512
-            
-            # Pad if less than window size
-            if len(audio_float) < window_size:
-                 pad_len = window_size - len(audio_float)
-                 audio_float = np.pad(audio_float, (0, pad_len))
-            
-            # Process in windows
-            for i in range(0, len(audio_float) - window_size + 1, window_size):
-                window = audio_float[i:i + window_size]
-                
-                # Convert to torch tensor
-                audio_tensor = self.torch.from_numpy(window)
-                
-                # Get speech probability
-                # Reset states for each new stream, but here we are stateless for simple check
-                speech_prob = self.model(audio_tensor, self.sample_rate).item()
-                
-                if speech_prob > self.threshold:
-                    return True
-            
-            return False
-            
+            audio_float = _to_float32(audio_chunk)
+
+            # Pad if less than one frame
+            if len(audio_float) < self.frame_size:
+                audio_float = np.pad(audio_float, (0, self.frame_size - len(audio_float)))
+
+            # Live chunks keep the model state from the previous chunk
+            probs = self.frame_probabilities(audio_float, reset_state=False)
+            return bool((probs > self.threshold).any())
+
         except Exception as e:
             logger.error(f"SileroVAD error: {e}")
             # Fallback to simple RMS check on error
@@ -215,6 +247,41 @@ class SileroVAD:
             rms = np.sqrt(np.mean(audio_float ** 2))
             return rms > 0.02
 
+    def reset_state(self):
+        """Forget the model's recurrent state (e.g. before reuse by another stream)."""
+        if hasattr(self.model, "reset_states"):
+            self.model.reset_states()
+
+    def frame_probabilities(self, audio: np.ndarray, reset_state: bool = True) -> np.ndarray:
+        """
+        Speech probability for every full 512-sample frame.
+
+        With ``reset_state`` (whole files) the model's batched
+        ``audio_forward`` pass is used when available. Otherwise one tensor
+        is built up front and fed frame by frame, carrying the model state
+        across frames (and, without ``reset_state``, across calls).
+        """
+        frames = _frames(_to_float32(audio), self.frame_size)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        with self.torch.no_grad():
+            audio_forward = getattr(self.model, "audio_forward", None)
+            if reset_state and audio_forward is not None:
+                probs = audio_forward(
+                    self.torch.from_numpy(np.ascontiguousarray(frames).reshape(-1)),
+                    self.sample_rate,
+                )
+                return probs.reshape(-1)[: len(frames)].numpy().astype(np.float32)
+
+            if reset_state:
+                self.reset_state()
+            tensor = self.torch.from_numpy(np.ascontiguousarray(frames))
+            probs = np.empty(len(frames), dtype=np.float32)
+            for i in range(len(frames)):
+                probs[i] = self.model(tensor[i], self.sample_rate).item()
+            return probs
+
     def get_speech_segments(
         self,
         audio: np.ndarray,
@@ -233,34 +300,14 @@ class SileroVAD:
             List of {'start': ms, 'end': ms} dicts
         """
         try:
-            # Convert to float32 tensor
-            if audio.dtype == np.int16:
-                audio_float = audio.astype(np.float32) / 32768.0
-            else:
-                audio_float = audio.astype(np.float32)
-            
-            audio_tensor = self.torch.from_numpy(audio_float)
-            
-            # Get speech timestamps using Silero's built-in function
-            speech_timestamps = self.get_speech_timestamps(
-                audio_tensor, 
-                self.model,
-                sampling_rate=self.sample_rate,
-                threshold=self.threshold,
+            probs = self.frame_probabilities(audio)
+            return segments_from_frames(
+                probs > self.threshold,
+                frame_ms=self.frame_size / self.sample_rate * 1000,
+                total_ms=len(audio) / self.sample_rate * 1000,
                 min_speech_duration_ms=min_speech_duration_ms,
-                min_silence_duration_ms=min_silence_duration_ms
+                min_silence_duration_ms=min_silence_duration_ms,
             )
-            
-            # Convert sample indices to milliseconds
-            segments = []
-            for ts in speech_timestamps:
-                segments.append({
-                    'start': int((ts['start'] / self.sample_rate) * 1000),
-                    'end': int((ts['end'] / self.sample_rate) * 1000)
-                })
-            
-            return segments
-            
         except Exception as e:
             logger.error(f"SileroVAD get_speech_segments error: {e}")
             # Fallback to SimpleVAD behavior
@@ -289,6 +336,8 @@ class TenVAD:
             from ten_vad import TenVad
             # Initialize TenVad with default hop_size=256
             self.hop_size = 256
+            self.frame_size = self.hop_size
+            self._vad_class = TenVad
             self.vad = TenVad(hop_size=self.hop_size, threshold=threshold)
             self.sample_rate = 16000
             self.threshold = threshold
@@ -310,54 +359,51 @@ class TenVAD:
 
         Returns:
             True if speech detected in any frame of the chunk.
+
+        Every hop is processed, since the model is stateful.
         """
         try:
-            # Ensure int16
-            if audio_chunk.dtype == np.float32:
-                # Clip and convert to int16
-                audio_int16 = (np.clip(audio_chunk, -1.0, 1.0) * 32767).astype(np.int16)
-            elif audio_chunk.dtype == np.int16:
-                audio_int16 = audio_chunk
-            else:
-                # Try to cast
-                audio_int16 = audio_chunk.astype(np.int16)
+            audio_int16 = _to_int16(audio_chunk)
 
-            # Process in hop_size chunks
-            total_samples = len(audio_int16)
-            
             # If smaller than hop_size, pad it
-            if total_samples < self.hop_size:
-                padding = np.zeros(self.hop_size - total_samples, dtype=np.int16)
+            if len(audio_int16) < self.hop_size:
+                padding = np.zeros(self.hop_size - len(audio_int16), dtype=np.int16)
                 audio_int16 = np.concatenate([audio_int16, padding])
-                total_samples = self.hop_size
 
-            is_speech_detected = False
-            
-            # Iterate
-            for i in range(0, total_samples, self.hop_size):
-                chunk = audio_int16[i : i + self.hop_size]
-                
-                # Check for exact size (drop last partial chunk if any, though padding handled most)
-                if len(chunk) == self.hop_size:
-                    prob, flags = self.vad.process(chunk)
-                    # flags: 1 for speech, 0 for silence? Or prob > threshold?
-                    # The doc says prob is returned. 
-                    # Based on usage, we rely on prob > threshold (already set in init) 
-                    # BUT wait, the init takes threshold. Does process return bool based on it?
-                    # The C code signature returns prob and flags.
-                    # Let's assume prob is the confidence.
-                    
-                    if prob > self.threshold:
-                         is_speech_detected = True
-                         # We can return early if we just want to know "is there speech?"
-                         return True
-            
-            return is_speech_detected
+            # Last partial hop (if any) is dropped
+            return bool((self.frame_probabilities(audio_int16) > self.threshold).any())
 
         except Exception as e:
             logger.error(f"TenVAD error: {e}")
             return False
 
+    def reset_state(self):
+        """
+        Start from a fresh model state.
+
+        ten-vad has no reset call and its native handle keeps recurrent
+        state across hops and calls, so the handle is rebuilt (cheap: no
+        model download, just a native init).
+        """
+        self.vad = self._vad_class(hop_size=self.hop_size, threshold=self.threshold)
+
+    def frame_probabilities(self, audio: np.ndarray, reset_state: bool = True) -> np.ndarray:
+        """
+        Speech probability for every full 256-sample hop.
+
+        ten-vad only exposes a per-hop native call, so the hops are taken
+        from one contiguous (n, 256) int16 view and fed in a tight loop
+        with no per-hop slicing, conversion or length checks. The native
+        handle carries its state across hops and calls (``reset_state`` is
+        accepted for API parity; call reset_state() to start fresh).
+        """
+        frames = np.ascontiguousarray(_frames(_to_int16(audio), self.hop_size))
+        probs = np.empty(len(frames), dtype=np.float32)
+        process = self.vad.process
+        for i, frame in enumerate(frames):
+            probs[i] = process(frame)[0]
+        return probs
+
     def get_speech_segments(
         self,
         audio: np.ndarray,
@@ -375,53 +421,156 @@ class TenVAD:
         Returns:
             List of {'start': ms, 'end': ms} dicts
         """
-        # Convert to int16
-        if audio.dtype == np.float32:
-             audio_int16 = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
-        else:
-             audio_int16 = audio.astype(np.int16)
+        probs = self.frame_probabilities(audio)
+        return segments_from_frames(
+            probs > self.threshold,
+            frame_ms=self.hop_size / self.sample_rate * 1000,
+            total_ms=len(audio) / self.sample_rate * 1000,
+            min_speech_duration_ms=min_speech_duration_ms,
+            min_silence_duration_ms=min_silence_duration_ms,
+        )
 
-        segments = []
-        current_segment_start = None
-        silence_duration = 0
-        
-        # We need to process in exact hop_size
-        chunk_size = self.hop_size # 256 samples = 16ms
-        chunk_duration_ms = (chunk_size / self.sample_rate) * 1000
-        
-        for i in range(0, len(audio_int16), chunk_size):
-            chunk = audio_int16[i : i + chunk_size]
-            if len(chunk) < chunk_size:
-                break # Drop last partial chunk
-            
-            prob, flags = self.vad.process(chunk)
-            is_speech = prob > self.threshold
-            timestamp_ms = (i / self.sample_rate) * 1000
-            
-            if is_speech:
-                silence_duration = 0
-                if current_segment_start is None:
-                    current_segment_start = timestamp_ms
+
+@dataclass
+class VADChunkResult:
+    """What StreamingVADSession.process decided for one chunk."""
+
+    chunk_start: int  # Absolute sample offset of the chunk's first sample
+    speech_mask: np.ndarray  # Per-sample decisions for the chunk's samples
+    in_speech: bool  # Speech state after the chunk
+    # ("start" | "end", absolute sample offset) boundaries found in this chunk
+    events: List[Tuple[str, int]] = field(default_factory=list)
+    sample_rate: int = 16000
+
+    @property
+    def any_speech(self) -> bool:
+        return bool(self.speech_mask.any())
+
+    def relative_time(self, offset: int) -> float:
+        """Seconds from the chunk's first sample to ``offset`` (may be < 0)."""
+        return (offset - self.chunk_start) / self.sample_rate
+
+
+class StreamingVADSession:
+    """
+    Per-stream VAD state on top of any backend with frame_probabilities().
+
+    Websocket chunks rarely line up with VAD frames, so samples left over
+    after the last full frame are carried into the next call and frames
+    stay aligned to the stream whatever the client's chunk size. Frame
+    probabilities are smoothed (EMA) and pass through onset/offset
+    hysteresis:
+
+    - speech starts once the smoothed probability stays >= onset_threshold
+      for min_speech_ms (single clicks and key presses don't qualify)
+    - speech ends once it stays < offset_threshold for min_silence_ms
+
+    Start/end are reported as exact sample offsets from the stream start
+    (the first frame of the qualifying run), not chunk boundaries.
+    """
+
+    def __init__(
+        self,
+        vad,
+        onset_threshold: Optional[float] = None,
+        offset_threshold: Optional[float] = None,
+        smoothing: float = 0.5,
+        min_speech_ms: int = 64,
+        min_silence_ms: int = 200,
+    ):
+        """
+        Args:
+            vad: Backend (SimpleVAD, SileroVAD, TenVAD)
+            onset_threshold: Smoothed score to enter speech (default: vad.threshold)
+            offset_threshold: Smoothed score to leave speech (default: 0.7 * onset)
+            smoothing: EMA weight of the newest frame (1.0 = no smoothing)
+            min_speech_ms: Sustained score needed to start a segment
+            min_silence_ms: Sustained silence needed to end a segment
+        """
+        self.vad = vad
+        self.frame_size = vad.frame_size
+        self.sample_rate = vad.sample_rate
+        self.onset_threshold = vad.threshold if onset_threshold is None else onset_threshold
+        self.offset_threshold = (
+            0.7 * self.onset_threshold if offset_threshold is None else offset_threshold
+        )
+        self.smoothing = smoothing
+
+        frame_ms = self.frame_size / self.sample_rate * 1000
+        self.min_speech_frames = max(1, int(np.ceil(min_speech_ms / frame_ms)))
+        self.min_silence_frames = max(1, int(np.ceil(min_silence_ms / frame_ms)))
+        self.reset()
+
+    def reset(self):
+        self._leftover = np.zeros(0, dtype=np.int16)
+        self.samples_seen = 0
+        self.smoothed = 0.0
+        self.in_speech = False
+        self.speech_start: Optional[int] = None  # Sample offset of the current/last start
+        self.speech_end: Optional[int] = None  # Sample offset of the last end
+        self._run = 0  # Consecutive frames pending a state change
+        self._run_start = 0
+
+    def process(self, samples: np.ndarray) -> VADChunkResult:
+        """Feed the next chunk of the stream."""
+        n = len(samples)
+        chunk_start = self.samples_seen
+        carried = len(self._leftover)
+        audio = np.concatenate([self._leftover, samples]) if carried else samples
+        frame_pos = chunk_start - carried  # Absolute offset of audio[0]
+
+        n_frames = len(audio) // self.frame_size
+        usable = n_frames * self.frame_size
+        self._leftover = audio[usable:].copy()
+        self.samples_seen += n
+
+        if n_frames:
+            probs = self.vad.frame_probabilities(audio[:usable], reset_state=False)
+        else:
+            probs = np.zeros(0, dtype=np.float32)
+
+        flags = np.empty(n_frames, dtype=bool)
+        events: List[Tuple[str, int]] = []
+        alpha = self.smoothing
+        for i, prob in enumerate(probs):
+            self.smoothed = alpha * float(prob) + (1 - alpha) * self.smoothed
+            crossing = (
+                self.smoothed < self.offset_threshold
+                if self.in_speech
+                else self.smoothed >= self.onset_threshold
+            )
+            if not crossing:
+                self._run = 0
             else:
-                silence_duration += chunk_duration_ms
-                
-                if current_segment_start is not None and silence_duration >= min_silence_duration_ms:
-                    segment_duration = timestamp_ms - current_segment_start
-                    if segment_duration >= min_speech_duration_ms:
-                        segments.append({
-                            'start': int(current_segment_start),
-                            'end': int(timestamp_ms)
-                        })
-                    current_segment_start = None
-
-        # Final segment
-        if current_segment_start is not None:
-            final_timestamp = (len(audio_int16) / self.sample_rate) * 1000
-            segment_duration = final_timestamp - current_segment_start
-            if segment_duration >= min_speech_duration_ms:
-                 segments.append({
-                    'start': int(current_segment_start),
-                    'end': int(final_timestamp)
-                })
-                
-        return segments
+                if self._run == 0:
+                    self._run_start = frame_pos + i * self.frame_size
+                self._run += 1
+                if not self.in_speech and self._run >= self.min_speech_frames:
+                    self.in_speech = True
+                    self.speech_start = self._run_start
+                    events.append(("start", self._run_start))
+                    # Frames of the qualifying run (in this chunk) are speech
+                    flags[max(0, (self._run_start - frame_pos) // self.frame_size) : i] = True
+                    self._run = 0
+                elif self.in_speech and self._run >= self.min_silence_frames:
+                    self.in_speech = False
+                    self.speech_end = self._run_start
+                    events.append(("end", self._run_start))
+                    self._run = 0
+            flags[i] = self.in_speech
+
+        # Map frame decisions onto this chunk's samples; the carried-over
+        # tail (not yet a full frame) takes the current state
+        mask = np.empty(n, dtype=bool)
+        covered = max(0, usable - carried)
+        if covered:
+            mask[:covered] = np.repeat(flags, self.frame_size)[carried:usable]
+        mask[covered:] = self.in_speech
+
+        return VADChunkResult(
+            chunk_start=chunk_start,
+            speech_mask=mask,
+            in_speech=self.in_speech,
+            events=events,
+            sample_rate=self.sample_rate,
+        )
@@ -0,0 +1,198 @@
+"""
+Process-wide VAD model pool.
+
+Loading a VAD model (torch.hub.load for Silero, the native library for
+TenVAD) used to happen inside every StreamingTranscriptionManager, i.e.
+while the websocket client waited for its `connected` message. The pool
+loads the backend once per process, warms a few instances at startup and
+hands them out per session:
+
+- SimpleVAD is stateless, so every session shares one instance.
+- SileroVAD and TenVAD carry recurrent state between frames, so each
+  session checks out its own instance and returns it on cleanup, where
+  reset_state() clears it (Silero resets its model states, TenVAD rebuilds
+  its native handle). New Silero instances copy the already loaded model
+  instead of reloading it.
+
+Model loads never run under the pool lock, and acquire_async() (used by
+the streaming websocket) runs them in a worker thread, so a session that
+finds the pool empty does not stall the event loop for every other live
+session. Taking an instance below the warm size refills the pool in the
+background.
+
+Backend and threshold are chosen per deployment:
+
+    VAD_BACKEND=ten|silero|simple   (default: ten)
+    VAD_THRESHOLD=<float>           (default: per backend)
+    VAD_POOL_WARM=<int>             (instances preloaded at startup)
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from .vad import SileroVAD, SimpleVAD, TenVAD
+
+logger = logging.getLogger(__name__)
+
+# Default threshold per backend (scores are probabilities for ten/silero,
+# RMS for simple)
+BACKENDS = {
+    "ten": (TenVAD, 0.5),
+    "silero": (SileroVAD, 0.3),
+    "simple": (SimpleVAD, 0.08),
+}
+
+VAD_BACKEND = os.getenv("VAD_BACKEND", "ten").lower()
+VAD_THRESHOLD = os.getenv("VAD_THRESHOLD")
+VAD_POOL_WARM = int(os.getenv("VAD_POOL_WARM", "2"))
+
+
+class VADPool:
+    """Hands out VAD instances of one backend; see module docstring."""
+
+    def __init__(
+        self,
+        backend: str = VAD_BACKEND,
+        threshold: Optional[float] = None,
+        warm_size: int = VAD_POOL_WARM,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown VAD backend '{backend}' (expected one of {', '.join(BACKENDS)})"
+            )
+        self.backend = backend
+        vad_class, default_threshold = BACKENDS[backend]
+        self._vad_class = vad_class
+        if threshold is None:
+            threshold = float(VAD_THRESHOLD) if VAD_THRESHOLD else default_threshold
+        self.threshold = threshold
+        self.warm_size = warm_size
+        self.stateful = backend != "simple"
+
+        self._lock = threading.Lock()
+        self._idle: List = []
+        self._shared = None  # Stateless backend instance / Silero model source
+        self._refill: Optional[asyncio.Task] = None
+        self.created = 0
+        self.in_use = 0
+
+    def _create(self):
+        """
+        Build one instance (slow: a model load, except for Silero copies).
+        Blocking, and called without holding the lock.
+        """
+        shared = self._shared
+        if self._vad_class is SileroVAD and shared is not None:
+            vad = SileroVAD(threshold=self.threshold, model=copy.deepcopy(shared.model))
+            vad.reset_state()
+        else:
+            vad = self._vad_class(threshold=self.threshold)
+        with self._lock:
+            if self._shared is None:
+                self._shared = vad
+            self.created += 1
+        return vad
+
+    def warm(self, count: Optional[int] = None):
+        """
+        Preload instances so sessions never wait on a model load.
+        Blocking - run it off the event loop (see main.py startup).
+        """
+        count = self.warm_size if count is None else count
+        if not self.stateful:
+            if self._shared is None:
+                self._create()
+            return
+        # Load outside the lock so acquire() on the event loop never waits
+        # behind a model load
+        while len(self._idle) < count:
+            vad = self._create()
+            with self._lock:
+                self._idle.append(vad)
+        logger.info(
+            f"✅ VAD pool warmed: backend={self.backend} threshold={self.threshold} "
+            f"idle={len(self._idle)}"
+        )
+
+    def _take(self):
+        """Idle (or shared) instance, or None if one has to be created."""
+        with self._lock:
+            if not self.stateful:
+                return self._shared
+            if not self._idle:
+                return None
+            self.in_use += 1
+            return self._idle.pop()
+
+    def _checkout(self, vad):
+        """Account for an instance created for a session."""
+        if not self.stateful:
+            return self._shared
+        with self._lock:
+            self.in_use += 1
+        return vad
+
+    def acquire(self):
+        """
+        Instance for one streaming session (exclusive if stateful).
+        Blocks on a model load if the pool is empty; on the event loop use
+        acquire_async().
+        """
+        vad = self._take()
+        if vad is None:
+            logger.info(f"VAD pool empty, creating {self.backend} instance")
+            vad = self._checkout(self._create())
+        return vad
+
+    async def acquire_async(self):
+        """acquire() that loads models in a worker thread, off the event loop."""
+        vad = self._take()
+        if vad is None:
+            logger.info(f"VAD pool empty, creating {self.backend} instance")
+            vad = self._checkout(await asyncio.to_thread(self._create))
+        if self.stateful and len(self._idle) < self.warm_size and (
+            self._refill is None or self._refill.done()
+        ):
+            self._refill = asyncio.create_task(asyncio.to_thread(self.warm))
+        return vad
+
+    def release(self, vad):
+        """Return a session's instance to the pool."""
+        if vad is None or not self.stateful:
+            return
+        try:
+            vad.reset_state()
+        except Exception as e:
+            # Never hand a dirty instance to the next session
+            logger.error(f"❌ Failed to reset {self.backend} VAD, discarding it: {e}")
+            with self._lock:
+                self.in_use = max(0, self.in_use - 1)
+            return
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            self._idle.append(vad)
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "threshold": self.threshold,
+            "stateful": self.stateful,
+            "created": self.created,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+        }
+
+
+_pool: Optional[VADPool] = None
+
+
+def get_vad_pool() -> VADPool:
+    """Get the process-wide VAD pool."""
+    global _pool
+    if _pool is None:
+        _pool = VADPool()
+    return _pool
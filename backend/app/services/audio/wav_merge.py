@@ -0,0 +1,268 @@
+"""
+Constant-memory merge of recorded PCM chunks into a WAV file.
+
+The old merge read every chunk into one bytearray, copied it to bytes and
+wrapped that in a BytesIO WAV - three copies of the whole meeting (~345 MB
+of PCM for 3 hours, >1 GB peak RSS). Here the WAV header is written first
+with zero lengths, PCM is streamed into the target file one block at a
+time and the RIFF/data lengths are patched at the end, so peak memory is
+one block (or one downloaded chunk) regardless of meeting length.
+
+For an object-store destination, the WAV is composed on the server from a
+header object and the chunks (StorageService.compose), so nothing is
+downloaded. If that is not possible (odd-sized chunks need realigning),
+chunks are downloaded in parallel, in order, a few at a time
+(StorageService.download_many) and streamed straight into the WAV object
+(StorageService.open_write, a resumable upload on GCS). The chunk sizes are
+listed up front, so the header is written first and nothing is spooled.
+"""
+
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Union
+
+import aiofiles
+
+try:
+    from ..storage import StorageService
+except (ImportError, ValueError):
+    from services.storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+WAV_HEADER_BYTES = 44
+MERGE_BLOCK_BYTES = int(os.getenv("MERGE_BLOCK_BYTES", str(1024 * 1024)))
+
+# RIFF sizes are 32-bit
+_MAX_DATA_BYTES = 0xFFFFFFFF - (WAV_HEADER_BYTES - 8)
+
+
+def wav_header(
+    data_bytes: int, sample_rate: int = 16000, channels: int = 1, bits_per_sample: int = 16
+) -> bytes:
+    """Canonical 44-byte PCM WAV header for `data_bytes` of audio."""
+    block_align = channels * bits_per_sample // 8
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        WAV_HEADER_BYTES - 8 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits_per_sample,
+        b"data",
+        data_bytes,
+    )
+
+
+async def read_file_blocks(
+    paths: Iterable[Union[str, Path]], block_size: int = MERGE_BLOCK_BYTES
+) -> AsyncIterator[bytes]:
+    """Contents of local files, in order, as blocks of at most block_size."""
+    for path in paths:
+        async with aiofiles.open(path, "rb") as f:
+            while True:
+                block = await f.read(block_size)
+                if not block:
+                    break
+                yield block
+
+
+async def read_storage_objects(names: Iterable[str]) -> AsyncIterator[bytes]:
+    """Storage objects, in order (downloaded a bounded few at a time)."""
+    async for name, data in StorageService.download_many(names):
+        if data is None:
+            raise IOError(f"Failed to download {name}")
+        yield data
+
+
+async def aligned_blocks(blocks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Re-cut blocks to whole 16-bit samples, carrying an odd byte into the
+    next block (a trailing odd byte is dropped).
+    """
+    odd_byte = b""
+    async for block in blocks:
+        if odd_byte:
+            block = odd_byte + block
+        if len(block) % 2:
+            block, odd_byte = block[:-1], block[-1:]
+        else:
+            odd_byte = b""
+        if block:
+            yield block
+
+
+async def write_wav(
+    blocks: AsyncIterator[bytes], target_path: Union[str, Path], sample_rate: int = 16000
+) -> int:
+    """
+    Stream PCM blocks into a WAV file at target_path (written to a
+    temporary name and renamed on success).
+
+    Returns:
+        Number of PCM bytes written
+    """
+    target_path = Path(target_path)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = target_path.with_name(target_path.name + ".partial")
+
+    data_bytes = 0
+    try:
+        async with aiofiles.open(partial, "wb") as f:
+            await f.write(wav_header(0, sample_rate))
+            # Keep sample alignment across chunk boundaries
+            async for block in aligned_blocks(blocks):
+                data_bytes += len(block)
+                if data_bytes > _MAX_DATA_BYTES:
+                    raise ValueError("Recording too large for a WAV file (4 GB)")
+                await f.write(block)
+
+            await f.seek(0)
+            await f.write(wav_header(data_bytes, sample_rate))
+        os.replace(partial, target_path)
+    except BaseException:
+        try:
+            partial.unlink()
+        except OSError:
+            pass
+        raise
+    return data_bytes
+
+
+async def merge_to_wav_file(
+    meeting_id: str,
+    target_path: Union[str, Path],
+    storage_path: str = "./data/recordings",
+) -> Optional[Path]:
+    """
+    Merge a meeting's recorded chunks (local or object store, per the
+    configured storage backend) into a WAV file at target_path.
+
+    Returns:
+        target_path, or None if there is nothing to merge or it failed
+    """
+    chunk_prefix = os.getenv("AUDIO_CHUNK_PREFIX", "pcm_chunks")
+
+    try:
+        if not StorageService.is_local():
+            files = await StorageService.list_files(f"{meeting_id}/{chunk_prefix}/")
+            chunk_files = sorted(f for f in files if f.endswith(".pcm"))
+            if not chunk_files:
+                logger.error(f"No audio chunks found in storage for {meeting_id}")
+                return None
+            blocks = read_storage_objects(chunk_files)
+            count = len(chunk_files)
+        else:
+            chunk_dir = Path(storage_path) / meeting_id
+            merged_pcm = chunk_dir / "merged_recording.pcm"
+            if merged_pcm.exists():
+                chunks = [merged_pcm]
+            else:
+                chunks = sorted(chunk_dir.glob("chunk_*.pcm"))
+            if not chunks:
+                logger.error(f"No audio chunks found in {chunk_dir}")
+                return None
+            blocks = read_file_blocks(chunks)
+            count = len(chunks)
+
+        data_bytes = await write_wav(blocks, target_path)
+        logger.info(
+            f"Merged {count} chunks into {target_path} "
+            f"({data_bytes / (16000 * 2):.1f}s of audio)"
+        )
+        return Path(target_path)
+
+    except Exception as e:
+        logger.error(f"Failed to merge audio chunks for {meeting_id}: {e}")
+        return None
+
+
+async def compose_storage_wav(meeting_id: str, destination: str) -> bool:
+    """
+    Server-side merge: compose a header object and the chunks into the WAV
+    object at destination.
+
+    Returns:
+        True if composed; False if it failed or the chunks cannot be
+        composed as is (odd sizes, over 4 GB)
+    """
+    chunk_prefix = os.getenv("AUDIO_CHUNK_PREFIX", "pcm_chunks")
+    sizes = await StorageService.list_file_sizes(f"{meeting_id}/{chunk_prefix}/")
+    chunk_files = sorted(name for name in sizes if name.endswith(".pcm"))
+    if not chunk_files or any(sizes[name] % 2 for name in chunk_files):
+        return False
+    data_bytes = sum(sizes[name] for name in chunk_files)
+    if data_bytes > _MAX_DATA_BYTES:
+        return False
+
+    header_path = f"{destination}.header"
+    if not await StorageService.upload_bytes(wav_header(data_bytes), header_path):
+        return False
+    try:
+        composed = await StorageService.compose(
+            [header_path] + chunk_files, destination, content_type="audio/wav"
+        )
+    finally:
+        await StorageService.delete_file(header_path)
+    if composed:
+        logger.info(
+            f"✅ Composed WAV for {meeting_id} from {len(chunk_files)} chunks "
+            f"({data_bytes / (16000 * 2):.1f}s of audio)"
+        )
+    return composed
+
+
+async def stream_storage_wav(meeting_id: str, destination: str) -> bool:
+    """
+    Merge object-store chunks into the WAV object at destination by
+    streaming them through (realigning odd-sized chunks). The header is
+    computed from the listed sizes; if the chunks change meanwhile, the
+    upload is abandoned.
+    """
+    chunk_prefix = os.getenv("AUDIO_CHUNK_PREFIX", "pcm_chunks")
+    sizes = await StorageService.list_file_sizes(f"{meeting_id}/{chunk_prefix}/")
+    chunk_files = sorted(name for name in sizes if name.endswith(".pcm"))
+    if not chunk_files:
+        logger.error(f"No audio chunks found in storage for {meeting_id}")
+        return False
+    total = sum(sizes[name] for name in chunk_files)
+    data_bytes = total - total % 2
+    if data_bytes > _MAX_DATA_BYTES:
+        logger.error(f"Recording for {meeting_id} too large for a WAV file (4 GB)")
+        return False
+
+    try:
+        async with StorageService.open_write(destination, "audio/wav") as writer:
+            await writer.write(wav_header(data_bytes))
+            async for block in aligned_blocks(read_storage_objects(chunk_files)):
+                await writer.write(block)
+            if writer.bytes_written != WAV_HEADER_BYTES + data_bytes:
+                raise IOError("Chunks changed while merging")
+    except Exception as e:
+        logger.error(f"Failed to stream merged WAV to {destination}: {e}")
+        return False
+
+    logger.info(
+        f"✅ Streamed WAV for {meeting_id} from {len(chunk_files)} chunks "
+        f"({data_bytes / 1024 / 1024:.2f} MB)"
+    )
+    return True
+
+
+async def merge_to_storage_wav(meeting_id: str, destination: str) -> bool:
+    """
+    Merge object-store chunks into a WAV object at destination: composed
+    on the server when possible, else (or if composing failed) streamed
+    through with open_write.
+    """
+    if await compose_storage_wav(meeting_id, destination):
+        return True
+    return await stream_storage_wav(meeting_id, destination)
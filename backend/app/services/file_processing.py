@@ -7,16 +7,18 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
 
-import aiofiles
-
 try:
     from ..db import DatabaseManager
     from .audio.groq_client import GroqTranscriptionClient
+    from .audio.scheduler import get_transcription_scheduler, PRIORITY_POST
     from .audio.diarization import get_diarization_service
+    from .audio.audio_source import AudioSource
 except (ImportError, ValueError):
     from db import DatabaseManager
     from services.audio.groq_client import GroqTranscriptionClient
+    from services.audio.scheduler import get_transcription_scheduler, PRIORITY_POST
     from services.audio.diarization import get_diarization_service
+    from services.audio.audio_source import AudioSource
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,7 @@ class FileProcessor:
         file_path: Local temporary path where the file is currently stored.
                    It is expected to be a temp file and will be cleaned up after processing.
         """
+        audio = None
         try:
             logger.info(
                 f"🚀 Starting processing for meeting {meeting_id} (File: {file_path})"
@@ -80,12 +83,15 @@ class FileProcessor:
 
             # 2. Transcribe
             logger.info(f"📝 Transcribing {meeting_id}...")
-            # Read the raw PCM data
-            async with aiofiles.open(pcm_path, "rb") as f:
-                pcm_data = await f.read()
-
-            transcription_result = await self.groq_client.transcribe_full_audio(
-                pcm_data
+            # Map the raw PCM (shared by transcription and diarization)
+            audio = AudioSource(pcm_path)
+
+            transcription_result = await get_transcription_scheduler().submit(
+                meeting_id,
+                self.groq_client.api_key,
+                audio,
+                priority=PRIORITY_POST,
+                method="transcribe_full_audio",
             )
 
             if "error" in transcription_result:
@@ -179,6 +185,7 @@ class FileProcessor:
                     meeting_id=meeting_id,
                     storage_path=str(RECORDING_DIR),
                     provider="deepgram",
+                    audio=audio,
                 )
 
                 if diarization_result.status == "completed":
@@ -230,6 +237,9 @@ class FileProcessor:
                 f"❌ Fatal error processing file for {meeting_id}: {e}", exc_info=True
             )
         finally:
+            if audio is not None:
+                audio.close()
+
             # Cleanup source file (it was a temp file passed from upload)
             try:
                 if file_path.exists():
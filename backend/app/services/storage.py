@@ -1,21 +1,60 @@
 """
 Storage Service Module
 
-Handles file storage operations, abstracting between Local Filesystem and Google Cloud Storage (GCP).
+Handles file storage operations for meeting recordings. StorageService is
+a static facade over one configured backend (STORAGE_TYPE):
+
+    local   LocalStorageBackend   files under RECORDINGS_STORAGE_PATH
+    gcp     GCSStorageBackend     a Google Cloud Storage bucket
+    memory  MemoryStorageBackend  in-process dict with injectable latency
+                                  (benchmarks and local experiments)
+
+The GCS backend shares one client across all calls. Its HTTP connection
+pool and a dedicated thread pool are both sized to GCS_MAX_CONNECTIONS, so
+parallel transfers neither queue behind other work in the default executor
+nor churn connections (the client's default pool keeps 10). Large uploads
+go up as resumable uploads in GCS_UPLOAD_CHUNK_BYTES pieces.
+
+Every backend supports streaming reads and writes (open_read / open_write),
+ranged reads (read_range) and server-side concatenation (compose).
+
+Bulk operations (download_many, copy_many, delete_many) run up to
+STORAGE_TRANSFER_CONCURRENCY transfers at a time instead of one round-trip
+per object. download_many yields results in request order through a
+reorder window of that size, so at most that many objects are in memory.
+compose concatenates objects on the server (GCS compose, 32 sources per
+call) without downloading them.
 """
 
+import asyncio
+import functools
 import os
 import logging
 import shutil
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
 # Configuration
-STORAGE_TYPE = os.getenv("STORAGE_TYPE", "local").lower()  # 'local' or 'gcp'
+STORAGE_TYPE = os.getenv("STORAGE_TYPE", "local").lower()  # 'local', 'gcp' or 'memory'
 GCP_BUCKET_NAME = os.getenv("GCP_BUCKET_NAME")
+LOCAL_STORAGE_ROOT = os.getenv("RECORDINGS_STORAGE_PATH", "./data/recordings")
 
 # Determine correct credentials path
 default_creds = "backend/gcp-service-account.json"
@@ -26,531 +65,1029 @@ elif os.path.exists("gcp-service-account.json"):
 
 GOOGLE_CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", default_creds)
 
-# Initialize GCP Client (lazy load)
-_gcp_client = None
-_gcp_bucket = None
+# Parallel transfers per bulk operation
+STORAGE_TRANSFER_CONCURRENCY = int(os.getenv("STORAGE_TRANSFER_CONCURRENCY", "8"))
+# Block size for streaming reads and writes
+STORAGE_BLOCK_BYTES = int(os.getenv("STORAGE_BLOCK_BYTES", str(1024 * 1024)))
+# GCS compose accepts at most 32 source objects per request
+GCS_COMPOSE_MAX_SOURCES = 32
+# Connections (and transfer threads) shared by all GCS calls
+GCS_MAX_CONNECTIONS = int(os.getenv("GCS_MAX_CONNECTIONS", "32"))
+# Resumable upload chunk size; GCS requires a multiple of 256 KiB
+_GCS_CHUNK_ALIGN = 256 * 1024
+GCS_UPLOAD_CHUNK_BYTES = max(
+    _GCS_CHUNK_ALIGN,
+    int(os.getenv("GCS_UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+    // _GCS_CHUNK_ALIGN
+    * _GCS_CHUNK_ALIGN,
+)
+# Per-request latency of the memory backend (STORAGE_TYPE=memory)
+MEMORY_STORAGE_LATENCY_MS = float(os.getenv("MEMORY_STORAGE_LATENCY_MS", "0"))
+
+
+async def _run_bounded(
+    items: Iterable, fn: Callable[..., Awaitable], concurrency: Optional[int] = None
+) -> List:
+    """Await fn(item) for every item, at most `concurrency` at a time; results in order."""
+    semaphore = asyncio.Semaphore(concurrency or STORAGE_TRANSFER_CONCURRENCY)
+
+    async def run(item):
+        async with semaphore:
+            return await fn(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+class StorageWriter:
+    """Handle yielded by open_write; write() blocks in order."""
+
+    def __init__(self, write: Callable[[bytes], Awaitable]):
+        self._write = write
+        self.bytes_written = 0
+
+    async def write(self, data: bytes):
+        if data:
+            await self._write(data)
+            self.bytes_written += len(data)
+
+
+class StorageBackend(ABC):
+    """
+    Interface implemented by each storage backend.
 
+    Paths are logical ('meeting-123/recording.wav'). Single-object methods
+    log and return False / None / empty on failure, like the facade.
+    open_read and open_write raise instead (FileNotFoundError for a missing
+    object); open_write only publishes the object if its block exits
+    without an exception.
 
-def get_gcp_bucket():
-    """Get or initialize the GCP bucket client."""
-    global _gcp_client, _gcp_bucket
+    Subclasses implement the abstract methods; open_read is typically an
+    async generator and open_write an @asynccontextmanager.
+    """
 
-    if STORAGE_TYPE != "gcp":
-        return None
+    name = "base"
+    # True when objects are plain files under a local directory
+    is_local = False
 
-    if _gcp_bucket:
-        return _gcp_bucket
+    async def ready(self) -> bool:
+        """Whether the backend is usable (e.g. credentials and bucket resolved)."""
+        return True
 
-    try:
-        from google.cloud import storage
-        from google.oauth2 import service_account
+    @abstractmethod
+    async def upload_file(self, local_path: str, path: str) -> bool:
+        raise NotImplementedError
 
-        if not GCP_BUCKET_NAME:
-            logger.error("GCP_BUCKET_NAME environment variable not set")
-            return None
+    @abstractmethod
+    async def upload_bytes(self, data: bytes, path: str, content_type: str) -> bool:
+        raise NotImplementedError
 
-        # Authenticate
-        if os.path.exists(GOOGLE_CREDENTIALS_PATH):
-            credentials = service_account.Credentials.from_service_account_file(
-                GOOGLE_CREDENTIALS_PATH
-            )
-            _gcp_client = storage.Client(credentials=credentials)
-        else:
-            # Fallback to default credentials (e.g. running on GCE/Cloud Run)
-            logger.warning(
-                f"Service account key not found at {GOOGLE_CREDENTIALS_PATH}, using default credentials"
-            )
-            _gcp_client = storage.Client()
+    @abstractmethod
+    async def download_file(self, path: str, local_path: str) -> bool:
+        raise NotImplementedError
 
-        _gcp_bucket = _gcp_client.bucket(GCP_BUCKET_NAME)
-        logger.info(f"✅ Connected to GCS bucket: {GCP_BUCKET_NAME}")
-        return _gcp_bucket
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize GCP storage: {e}")
-        return None
+    @abstractmethod
+    async def download_bytes(self, path: str) -> Optional[bytes]:
+        raise NotImplementedError
 
+    @abstractmethod
+    async def read_range(self, path: str, start: int, length: int) -> Optional[bytes]:
+        """Up to `length` bytes from offset `start` (short at the end of the object)."""
+        raise NotImplementedError
 
-class StorageService:
-    """
-    Abstract storage service for meeting recordings.
-    """
+    @abstractmethod
+    def open_read(self, path: str, block_size: int) -> AsyncIterator[bytes]:
+        """The object's contents as blocks of at most block_size."""
+        raise NotImplementedError
 
-    @staticmethod
-    async def upload_file(local_path: str, destination_path: str) -> bool:
-        """
-        Upload a file to storage.
+    @abstractmethod
+    def open_write(self, path: str, content_type: str):
+        """Async context manager yielding a StorageWriter for path."""
+        raise NotImplementedError
 
-        Args:
-            local_path: Path to the local file to upload
-            destination_path: Logical path in storage (e.g. 'meeting-123/recording.wav')
-        """
-        if not os.path.exists(local_path):
-            logger.error(f"Upload failed: Source file not found {local_path}")
-            return False
+    @abstractmethod
+    async def delete(self, path: str) -> bool:
+        raise NotImplementedError
 
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._upload_to_gcp(local_path, destination_path)
-        else:
-            return await StorageService._save_locally(local_path, destination_path)
+    @abstractmethod
+    async def list(self, prefix: str) -> List[str]:
+        raise NotImplementedError
 
-    @staticmethod
-    async def upload_bytes(
-        data: bytes, destination_path: str, content_type: str = "application/octet-stream"
-    ) -> bool:
-        """
-        Upload raw bytes to storage.
-        """
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._upload_bytes_to_gcp(
-                data, destination_path, content_type
-            )
-        else:
-            return await StorageService._save_bytes_locally(data, destination_path)
+    @abstractmethod
+    async def list_sizes(self, prefix: str) -> Dict[str, int]:
+        raise NotImplementedError
 
-    @staticmethod
-    async def download_file(source_path: str, local_destination: str) -> bool:
-        """
-        Download a file from storage to local path.
-        """
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._download_from_gcp(
-                source_path, local_destination
-            )
-        else:
-            return await StorageService._copy_locally(source_path, local_destination)
+    @abstractmethod
+    async def copy(self, source: str, destination: str) -> bool:
+        raise NotImplementedError
 
-    @staticmethod
-    async def download_bytes(source_path: str) -> Optional[bytes]:
-        """
-        Download a file from storage into memory.
-        """
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._download_bytes_from_gcp(source_path)
-        else:
-            return await StorageService._read_local_bytes(source_path)
+    @abstractmethod
+    async def exists(self, path: str) -> bool:
+        raise NotImplementedError
 
-    @staticmethod
-    async def delete_file(path: str) -> bool:
-        """Delete a file from storage."""
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._delete_from_gcp(path)
-        else:
-            return await StorageService._delete_locally(path)
+    async def compose(
+        self, sources: List[str], destination: str, content_type: str
+    ) -> bool:
+        """Concatenate sources into destination by streaming through open_write."""
+        try:
+            async with self.open_write(destination, content_type) as writer:
+                for source in sources:
+                    async for block in self.open_read(source, STORAGE_BLOCK_BYTES):
+                        await writer.write(block)
+            return True
+        except Exception as e:
+            logger.error(f"{self.name} compose failed: {e}")
+            return False
 
-    @staticmethod
-    async def list_files(prefix: str) -> list:
-        """List files under a prefix."""
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._list_gcp_files(prefix)
-        else:
-            return await StorageService._list_local_files(prefix)
+    async def delete_prefix(self, prefix: str) -> bool:
+        files = await self.list(prefix)
+        await _run_bounded(files, self.delete)
+        return True
 
-    @staticmethod
-    async def copy_file(source_path: str, destination_path: str) -> bool:
-        """Copy a file within storage."""
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._copy_gcp_file(source_path, destination_path)
-        else:
-            return await StorageService._copy_local_file(source_path, destination_path)
+    async def signed_url(self, path: str, expiration_seconds: int) -> Optional[str]:
+        return None
 
-    @staticmethod
-    async def delete_prefix(prefix: str) -> bool:
-        """Delete all files under a prefix."""
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._delete_gcp_prefix(prefix)
-        else:
-            return await StorageService._delete_local_prefix(prefix)
 
-    @staticmethod
-    async def generate_signed_url(
-        path: str, expiration_seconds: int = 3600
-    ) -> Optional[str]:
-        """
-        Generate a temporary accessible URL for a file.
-        For GCP: Generates a Signed URL.
-        For Local: Returns a static file path (assuming served via FastAPI StaticFiles).
-        """
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._generate_gcp_signed_url(
-                path, expiration_seconds
-            )
-        else:
-            # Local dev mode: Return relative URL to be served by StaticFiles
-            # We assume 'data/recordings' is mounted at '/audio'
-            # path is like 'meeting-123/recording.wav'
-            return f"/audio/{path}"
+class LocalStorageBackend(StorageBackend):
+    """Files under a local directory."""
 
-    @staticmethod
-    async def check_file_exists(path: str) -> bool:
-        """Check if file exists in storage."""
-        if STORAGE_TYPE == "gcp":
-            return await StorageService._check_gcp_exists(path)
-        else:
-            return await StorageService._check_local_exists(path)
+    name = "local"
+    is_local = True
 
-    # --- Internal Implementations ---
+    def __init__(self, root: str = LOCAL_STORAGE_ROOT):
+        self.root = Path(root)
 
-    @staticmethod
-    async def _check_gcp_exists(blob_name: str) -> bool:
+    async def upload_file(self, local_path: str, path: str) -> bool:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return False
-
-            blob = bucket.blob(blob_name)
+            dest_path = self.root / path
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-            import asyncio
+            # If source is same as dest (already in place), do nothing
+            if os.path.abspath(local_path) == os.path.abspath(dest_path):
+                return True
 
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, blob.exists)
+            shutil.copy2(local_path, dest_path)
+            return True
         except Exception as e:
-            logger.error(f"GCS Exists check failed: {e}")
+            logger.error(f"Local save failed: {e}")
             return False
 
-    @staticmethod
-    async def _check_local_exists(relative_path: str) -> bool:
-        base_path = Path("./data/recordings")
-        return (base_path / relative_path).exists()
+    async def upload_bytes(self, data: bytes, path: str, content_type: str) -> bool:
+        try:
+            async with self.open_write(path, content_type) as writer:
+                await writer.write(data)
+            return True
+        except Exception as e:
+            logger.error(f"Local save bytes failed: {e}")
+            return False
 
-    @staticmethod
-    async def _upload_to_gcp(local_path: str, blob_name: str) -> bool:
+    async def download_file(self, path: str, local_path: str) -> bool:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
+            source_path = self.root / path
+            if not source_path.exists():
                 return False
 
-            blob = bucket.blob(blob_name)
+            os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+            shutil.copy2(source_path, local_path)
+            return True
+        except Exception as e:
+            logger.error(f"Local copy failed: {e}")
+            return False
 
-            # Run blocking I/O in executor
-            import asyncio
+    async def download_bytes(self, path: str) -> Optional[bytes]:
+        try:
+            source_path = self.root / path
+            if not source_path.exists():
+                return None
 
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, blob.upload_from_filename, local_path)
+            import aiofiles
 
-            logger.info(f"⬆️  Uploaded to GCS: gs://{GCP_BUCKET_NAME}/{blob_name}")
-            return True
+            async with aiofiles.open(source_path, "rb") as f:
+                return await f.read()
         except Exception as e:
-            logger.error(f"GCS Upload failed: {e}")
+            logger.error(f"Local read bytes failed: {e}")
+            return None
+
+    async def read_range(self, path: str, start: int, length: int) -> Optional[bytes]:
+        try:
+            import aiofiles
+
+            async with aiofiles.open(self.root / path, "rb") as f:
+                await f.seek(start)
+                return await f.read(length)
+        except Exception as e:
+            logger.error(f"Local ranged read failed: {e}")
+            return None
+
+    async def open_read(
+        self, path: str, block_size: int = STORAGE_BLOCK_BYTES
+    ) -> AsyncIterator[bytes]:
+        import aiofiles
+
+        async with aiofiles.open(self.root / path, "rb") as f:
+            while True:
+                block = await f.read(block_size)
+                if not block:
+                    break
+                yield block
+
+    @asynccontextmanager
+    async def open_write(self, path: str, content_type: str = "application/octet-stream"):
+        import aiofiles
+
+        dest_path = self.root / path
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = dest_path.with_name(dest_path.name + ".partial")
+        try:
+            async with aiofiles.open(partial, "wb") as f:
+                yield StorageWriter(f.write)
+            os.replace(partial, dest_path)
+        except BaseException:
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+            raise
+
+    async def delete(self, path: str) -> bool:
+        try:
+            target_path = self.root / path
+
+            if target_path.exists():
+                os.remove(target_path)
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"Local delete failed: {e}")
             return False
 
-    @staticmethod
-    async def _upload_bytes_to_gcp(
-        data: bytes, blob_name: str, content_type: str
-    ) -> bool:
+    async def list(self, prefix: str) -> List[str]:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
+            target_path = self.root / prefix
+            if target_path.is_file():
+                return [str(target_path.relative_to(self.root))]
+            if not target_path.exists():
+                return []
+
+            files = []
+            for path in target_path.rglob("*"):
+                if path.is_file():
+                    files.append(str(path.relative_to(self.root)))
+            return files
+        except Exception as e:
+            logger.error(f"Local list failed: {e}")
+            return []
+
+    async def list_sizes(self, prefix: str) -> Dict[str, int]:
+        files = await self.list(prefix)
+        return {name: (self.root / name).stat().st_size for name in files}
+
+    async def copy(self, source: str, destination: str) -> bool:
+        try:
+            source_path = self.root / source
+            dest_path = self.root / destination
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if not source_path.exists():
                 return False
 
-            blob = bucket.blob(blob_name)
+            shutil.copy2(source_path, dest_path)
+            return True
+        except Exception as e:
+            logger.error(f"Local copy failed: {e}")
+            return False
 
-            import asyncio
+    async def exists(self, path: str) -> bool:
+        return (self.root / path).exists()
 
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(
-                None, lambda: blob.upload_from_string(data, content_type=content_type)
-            )
+    async def compose(
+        self, sources: List[str], destination: str, content_type: str
+    ) -> bool:
+        try:
+            dest_path = self.root / destination
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = dest_path.with_name(dest_path.name + ".partial")
 
-            logger.info(f"⬆️  Uploaded bytes to GCS: gs://{GCP_BUCKET_NAME}/{blob_name}")
+            with open(partial, "wb") as out:
+                for source in sources:
+                    with open(self.root / source, "rb") as f:
+                        shutil.copyfileobj(f, out, STORAGE_BLOCK_BYTES)
+            os.replace(partial, dest_path)
             return True
         except Exception as e:
-            logger.error(f"GCS Upload bytes failed: {e}")
+            logger.error(f"Local compose failed: {e}")
             return False
 
-    @staticmethod
-    async def _download_from_gcp(blob_name: str, local_path: str) -> bool:
+    async def delete_prefix(self, prefix: str) -> bool:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return False
+            target_path = self.root / prefix
+            if not target_path.exists():
+                return True
 
-            blob = bucket.blob(blob_name)
+            if target_path.is_file():
+                target_path.unlink()
+                return True
 
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            for path in target_path.rglob("*"):
+                if path.is_file():
+                    path.unlink()
 
-            # Run blocking I/O in executor
-            import asyncio
+            # Clean up empty dirs
+            for path in sorted(target_path.rglob("*"), reverse=True):
+                if path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
 
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, blob.download_to_filename, local_path)
+            if target_path.is_dir() and not any(target_path.iterdir()):
+                target_path.rmdir()
 
-            logger.info(f"⬇️  Downloaded from GCS: {blob_name} -> {local_path}")
             return True
         except Exception as e:
-            logger.error(f"GCS Download failed: {e}")
+            logger.error(f"Local delete prefix failed: {e}")
             return False
 
-    @staticmethod
-    async def _download_bytes_from_gcp(blob_name: str) -> Optional[bytes]:
-        try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return None
+    async def signed_url(self, path: str, expiration_seconds: int) -> Optional[str]:
+        # Local dev mode: Return relative URL to be served by StaticFiles
+        # We assume 'data/recordings' is mounted at '/audio'
+        return f"/audio/{path}"
 
-            blob = bucket.blob(blob_name)
 
-            import asyncio
+class GCSStorageBackend(StorageBackend):
+    """
+    A Google Cloud Storage bucket on one shared client.
 
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, blob.download_as_bytes)
+    The client library is synchronous; calls run on a dedicated thread pool
+    with as many workers as the client's HTTP connection pool has
+    connections.
+    """
+
+    name = "gcp"
+
+    def __init__(
+        self,
+        bucket_name: Optional[str] = GCP_BUCKET_NAME,
+        credentials_path: str = GOOGLE_CREDENTIALS_PATH,
+        max_connections: int = GCS_MAX_CONNECTIONS,
+    ):
+        self.bucket_name = bucket_name
+        self.credentials_path = credentials_path
+        self.max_connections = max_connections
+        self._client = None
+        self._bucket = None
+        self._connect_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="gcs"
+        )
+
+    @property
+    def bucket(self):
+        """The bucket handle, connecting on first use (None if that fails)."""
+        if self._bucket is None:
+            with self._connect_lock:
+                if self._bucket is None:
+                    self._connect()
+        return self._bucket
+
+    def _connect(self):
+        try:
+            from google.cloud import storage
+            from google.oauth2 import service_account
+
+            if not self.bucket_name:
+                logger.error("GCP_BUCKET_NAME environment variable not set")
+                return
+
+            # Authenticate
+            if os.path.exists(self.credentials_path):
+                credentials = service_account.Credentials.from_service_account_file(
+                    self.credentials_path
+                )
+                client = storage.Client(credentials=credentials)
+            else:
+                # Fallback to default credentials (e.g. running on GCE/Cloud Run)
+                logger.warning(
+                    f"Service account key not found at {self.credentials_path}, using default credentials"
+                )
+                client = storage.Client()
+
+            self._size_connection_pool(client)
+            self._client = client
+            self._bucket = client.bucket(self.bucket_name)
+            logger.info(
+                f"✅ Connected to GCS bucket: {self.bucket_name} "
+                f"({self.max_connections} connections)"
+            )
         except Exception as e:
-            logger.error(f"GCS Download bytes failed: {e}")
-            return None
+            logger.error(f"❌ Failed to initialize GCP storage: {e}")
 
-    @staticmethod
-    async def _delete_from_gcp(blob_name: str) -> bool:
+    def _size_connection_pool(self, client):
+        """Give the client's session one pooled connection per transfer thread."""
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return False
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(
+                pool_connections=self.max_connections,
+                pool_maxsize=self.max_connections,
+            )
+            client._http.mount("https://", adapter)
+        except Exception as e:
+            logger.warning(f"Could not resize GCS connection pool: {e}")
+
+    def _require_bucket(self):
+        bucket = self.bucket
+        if bucket is None:
+            raise IOError("GCS bucket is not available")
+        return bucket
 
-            blob = bucket.blob(blob_name)
+    async def _run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
 
-            import asyncio
+    async def ready(self) -> bool:
+        return await self._run(lambda: self.bucket) is not None
 
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, blob.delete)
+    async def upload_file(self, local_path: str, path: str) -> bool:
+        try:
+            bucket = self._require_bucket()
+            # With a chunk size set, uploads are resumable: sent in pieces,
+            # each retried on its own
+            blob = bucket.blob(path, chunk_size=GCS_UPLOAD_CHUNK_BYTES)
+            await self._run(blob.upload_from_filename, local_path)
 
-            logger.info(f"🗑️  Deleted from GCS: {blob_name}")
+            logger.info(f"⬆️  Uploaded to GCS: gs://{self.bucket_name}/{path}")
             return True
         except Exception as e:
-            logger.warning(f"GCS Delete failed (might not exist): {e}")
+            logger.error(f"GCS Upload failed: {e}")
             return False
 
-    @staticmethod
-    async def _list_gcp_files(prefix: str) -> list:
+    async def upload_bytes(self, data: bytes, path: str, content_type: str) -> bool:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return []
+            bucket = self._require_bucket()
+            blob = bucket.blob(path)
+            if len(data) > GCS_UPLOAD_CHUNK_BYTES:
+                blob.chunk_size = GCS_UPLOAD_CHUNK_BYTES
+            await self._run(blob.upload_from_string, data, content_type=content_type)
+
+            logger.info(f"⬆️  Uploaded bytes to GCS: gs://{self.bucket_name}/{path}")
+            return True
+        except Exception as e:
+            logger.error(f"GCS Upload bytes failed: {e}")
+            return False
 
-            import asyncio
+    async def download_file(self, path: str, local_path: str) -> bool:
+        try:
+            bucket = self._require_bucket()
+            blob = bucket.blob(path)
 
-            loop = asyncio.get_running_loop()
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
 
-            def _list():
-                return [blob.name for blob in bucket.list_blobs(prefix=prefix)]
+            await self._run(blob.download_to_filename, local_path)
 
-            return await loop.run_in_executor(None, _list)
+            logger.info(f"⬇️  Downloaded from GCS: {path} -> {local_path}")
+            return True
         except Exception as e:
-            logger.error(f"GCS list failed: {e}")
-            return []
+            logger.error(f"GCS Download failed: {e}")
+            return False
 
-    @staticmethod
-    async def _copy_gcp_file(source_path: str, destination_path: str) -> bool:
+    async def download_bytes(self, path: str) -> Optional[bytes]:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return False
+            bucket = self._require_bucket()
+            return await self._run(bucket.blob(path).download_as_bytes)
+        except Exception as e:
+            logger.error(f"GCS Download bytes failed: {e}")
+            return None
+
+    async def read_range(self, path: str, start: int, length: int) -> Optional[bytes]:
+        if length <= 0:
+            return b""
+        try:
+            bucket = self._require_bucket()
+            # end is inclusive
+            return await self._run(
+                bucket.blob(path).download_as_bytes, start=start, end=start + length - 1
+            )
+        except Exception as e:
+            if getattr(e, "code", None) == 416:
+                # Range starts past the end of the object
+                return b""
+            logger.error(f"GCS ranged read failed: {e}")
+            return None
 
-            import asyncio
+    async def open_read(
+        self, path: str, block_size: int = STORAGE_BLOCK_BYTES
+    ) -> AsyncIterator[bytes]:
+        bucket = self._require_bucket()
+        blob = bucket.blob(path)
+        # BlobReader sends no request until the first read, so check the
+        # object up front; a 404 while reading (deleted meanwhile) is
+        # mapped the same way
+        try:
+            await self._run(blob.reload)
+            reader = await self._run(blob.open, "rb", chunk_size=block_size)
+        except Exception as e:
+            if getattr(e, "code", None) == 404:
+                raise FileNotFoundError(path) from e
+            raise
+        try:
+            while True:
+                try:
+                    block = await self._run(reader.read, block_size)
+                except Exception as e:
+                    if getattr(e, "code", None) == 404:
+                        raise FileNotFoundError(path) from e
+                    raise
+                if not block:
+                    break
+                yield block
+        finally:
+            reader.close()
+
+    @asynccontextmanager
+    async def open_write(self, path: str, content_type: str = "application/octet-stream"):
+        bucket = self._require_bucket()
+        writer = await self._run(
+            bucket.blob(path).open,
+            "wb",
+            chunk_size=GCS_UPLOAD_CHUNK_BYTES,
+            content_type=content_type,
+        )
+        # Resumable upload: each full chunk is sent as it fills. If the
+        # block raises, the upload is never finalized and no object appears.
+        yield StorageWriter(lambda data: self._run(writer.write, data))
+        await self._run(writer.close)
+        logger.info(f"⬆️  Streamed to GCS: gs://{self.bucket_name}/{path}")
+
+    async def delete(self, path: str) -> bool:
+        try:
+            bucket = self._require_bucket()
+            await self._run(bucket.blob(path).delete)
 
-            loop = asyncio.get_running_loop()
+            logger.info(f"🗑️  Deleted from GCS: {path}")
+            return True
+        except Exception as e:
+            logger.warning(f"GCS Delete failed (might not exist): {e}")
+            return False
 
-            def _copy():
-                source_blob = bucket.blob(source_path)
-                bucket.copy_blob(source_blob, bucket, destination_path)
+    async def list(self, prefix: str) -> List[str]:
+        try:
+            bucket = self._require_bucket()
+            return await self._run(
+                lambda: [blob.name for blob in bucket.list_blobs(prefix=prefix)]
+            )
+        except Exception as e:
+            logger.error(f"GCS list failed: {e}")
+            return []
 
-            await loop.run_in_executor(None, _copy)
+    async def list_sizes(self, prefix: str) -> Dict[str, int]:
+        try:
+            bucket = self._require_bucket()
+            return await self._run(
+                lambda: {blob.name: blob.size for blob in bucket.list_blobs(prefix=prefix)}
+            )
+        except Exception as e:
+            logger.error(f"GCS list failed: {e}")
+            return {}
+
+    async def copy(self, source: str, destination: str) -> bool:
+        try:
+            bucket = self._require_bucket()
+            await self._run(bucket.copy_blob, bucket.blob(source), bucket, destination)
             return True
         except Exception as e:
             logger.error(f"GCS copy failed: {e}")
             return False
 
-    @staticmethod
-    async def _delete_gcp_prefix(prefix: str) -> bool:
+    async def exists(self, path: str) -> bool:
         try:
-            bucket = get_gcp_bucket()
+            bucket = self.bucket
             if not bucket:
                 return False
+            return await self._run(bucket.blob(path).exists)
+        except Exception as e:
+            logger.error(f"GCS Exists check failed: {e}")
+            return False
 
-            import asyncio
-
-            loop = asyncio.get_running_loop()
-
-            def _delete_all():
-                blobs = list(bucket.list_blobs(prefix=prefix))
-                for blob in blobs:
-                    blob.delete()
+    async def compose(
+        self, sources: List[str], destination: str, content_type: str
+    ) -> bool:
+        temporaries = []
+        try:
+            bucket = self._require_bucket()
+
+            def _compose(names: List[str], target: str):
+                blob = bucket.blob(target)
+                blob.content_type = content_type
+                blob.compose([bucket.blob(name) for name in names])
+
+            # Compose in rounds of up to 32 (in parallel) until one request is left
+            level = 0
+            names = list(sources)
+            while len(names) > GCS_COMPOSE_MAX_SOURCES:
+                groups = [
+                    names[i : i + GCS_COMPOSE_MAX_SOURCES]
+                    for i in range(0, len(names), GCS_COMPOSE_MAX_SOURCES)
+                ]
+                targets = [f"{destination}.compose-{level}-{i}" for i in range(len(groups))]
+                temporaries.extend(targets)
+                await _run_bounded(zip(groups, targets), lambda job: self._run(_compose, *job))
+                names = targets
+                level += 1
+
+            await self._run(_compose, names, destination)
+            logger.info(
+                f"🧩 Composed {len(sources)} objects into gs://{self.bucket_name}/{destination}"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"GCS compose failed: {e}")
+            return False
+        finally:
+            if temporaries:
+                await _run_bounded(temporaries, self.delete)
 
-            await loop.run_in_executor(None, _delete_all)
+    async def delete_prefix(self, prefix: str) -> bool:
+        try:
+            bucket = self._require_bucket()
+            blobs = await self._run(lambda: list(bucket.list_blobs(prefix=prefix)))
+            await _run_bounded(blobs, lambda blob: self._run(blob.delete))
             return True
         except Exception as e:
             logger.error(f"GCS delete prefix failed: {e}")
             return False
 
-    @staticmethod
-    async def _generate_gcp_signed_url(
-        blob_name: str, expiration: int
-    ) -> Optional[str]:
+    async def signed_url(self, path: str, expiration_seconds: int) -> Optional[str]:
         try:
-            bucket = get_gcp_bucket()
-            if not bucket:
-                return None
-
-            blob = bucket.blob(blob_name)
-
-            import asyncio
-
-            loop = asyncio.get_running_loop()
-
-            url = await loop.run_in_executor(
-                None,
-                lambda: blob.generate_signed_url(
-                    version="v4", expiration=timedelta(seconds=expiration), method="GET"
-                ),
+            bucket = self._require_bucket()
+            return await self._run(
+                bucket.blob(path).generate_signed_url,
+                version="v4",
+                expiration=timedelta(seconds=expiration_seconds),
+                method="GET",
             )
-            return url
         except Exception as e:
             logger.error(f"Signed URL generation failed: {e}")
             return None
 
-    # --- Local Fallbacks ---
 
-    @staticmethod
-    async def _save_locally(local_source: str, relative_dest: str) -> bool:
+class MemoryStorageBackend(StorageBackend):
+    """
+    Objects held in a dict. Each request sleeps `latency` seconds (plus
+    size / `bandwidth` if given) to stand in for an object store round-trip,
+    and requests in flight are counted, so benchmarks can measure transfer
+    patterns without a bucket.
+    """
+
+    name = "memory"
+
+    def __init__(self, latency: float = 0.0, bandwidth: Optional[float] = None):
+        self.objects: Dict[str, bytes] = {}
+        self.latency = latency
+        # Bytes per second; None for unlimited
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @asynccontextmanager
+    async def _request(self, size: int = 0):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.latency + (size / self.bandwidth if self.bandwidth else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def reset_stats(self):
+        self.requests = 0
+        self.max_in_flight = 0
+
+    async def upload_file(self, local_path: str, path: str) -> bool:
         try:
-            # Base storage path
-            base_path = Path("./data/recordings")
-            dest_path = base_path / relative_dest
+            with open(local_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.error(f"Memory upload failed: {e}")
+            return False
+        return await self.upload_bytes(data, path, "application/octet-stream")
 
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
+    async def upload_bytes(self, data: bytes, path: str, content_type: str) -> bool:
+        async with self._request(len(data)):
+            self.objects[path] = bytes(data)
+        return True
 
-            # If source is same as dest (already in place), do nothing
-            if os.path.abspath(local_source) == os.path.abspath(dest_path):
-                return True
+    async def download_file(self, path: str, local_path: str) -> bool:
+        data = await self.download_bytes(path)
+        if data is None:
+            return False
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        with open(local_path, "wb") as f:
+            f.write(data)
+        return True
+
+    async def download_bytes(self, path: str) -> Optional[bytes]:
+        async with self._request(len(self.objects.get(path, b""))):
+            return self.objects.get(path)
+
+    async def read_range(self, path: str, start: int, length: int) -> Optional[bytes]:
+        data = self.objects.get(path)
+        if data is None:
+            return None
+        async with self._request(min(length, max(len(data) - start, 0))):
+            return data[start : start + length]
+
+    async def open_read(
+        self, path: str, block_size: int = STORAGE_BLOCK_BYTES
+    ) -> AsyncIterator[bytes]:
+        if path not in self.objects:
+            raise FileNotFoundError(path)
+        data = self.objects[path]
+        for offset in range(0, len(data), block_size):
+            block = data[offset : offset + block_size]
+            async with self._request(len(block)):
+                pass
+            yield block
+
+    @asynccontextmanager
+    async def open_write(self, path: str, content_type: str = "application/octet-stream"):
+        buffer = bytearray()
+        unsent = 0
+
+        async def write(data: bytes):
+            nonlocal unsent
+            buffer.extend(data)
+            unsent += len(data)
+            # Sent in resumable-upload pieces, like GCS
+            while unsent >= GCS_UPLOAD_CHUNK_BYTES:
+                async with self._request(GCS_UPLOAD_CHUNK_BYTES):
+                    unsent -= GCS_UPLOAD_CHUNK_BYTES
+
+        yield StorageWriter(write)
+        async with self._request(unsent):
+            self.objects[path] = bytes(buffer)
+
+    async def delete(self, path: str) -> bool:
+        async with self._request():
+            return self.objects.pop(path, None) is not None
+
+    async def list(self, prefix: str) -> List[str]:
+        async with self._request():
+            return [name for name in self.objects if name.startswith(prefix)]
+
+    async def list_sizes(self, prefix: str) -> Dict[str, int]:
+        async with self._request():
+            return {
+                name: len(data)
+                for name, data in self.objects.items()
+                if name.startswith(prefix)
+            }
+
+    async def copy(self, source: str, destination: str) -> bool:
+        async with self._request():
+            if source not in self.objects:
+                return False
+            self.objects[destination] = self.objects[source]
+            return True
+
+    async def exists(self, path: str) -> bool:
+        async with self._request():
+            return path in self.objects
 
-            shutil.copy2(local_source, dest_path)
+    async def compose(
+        self, sources: List[str], destination: str, content_type: str
+    ) -> bool:
+        # Server-side: one request per 32 sources, no transfer
+        for _ in range(0, len(sources), GCS_COMPOSE_MAX_SOURCES):
+            async with self._request():
+                pass
+        try:
+            self.objects[destination] = b"".join(self.objects[name] for name in sources)
             return True
-        except Exception as e:
-            logger.error(f"Local save failed: {e}")
+        except KeyError as e:
+            logger.error(f"Memory compose failed: missing {e}")
             return False
 
-    @staticmethod
-    async def _save_bytes_locally(data: bytes, relative_dest: str) -> bool:
-        try:
-            base_path = Path("./data/recordings")
-            dest_path = base_path / relative_dest
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-            import aiofiles
+def create_storage_backend(storage_type: str = STORAGE_TYPE) -> StorageBackend:
+    """Build the backend for a STORAGE_TYPE value."""
+    if storage_type == "gcp":
+        return GCSStorageBackend()
+    if storage_type == "memory":
+        return MemoryStorageBackend(latency=MEMORY_STORAGE_LATENCY_MS / 1000)
+    return LocalStorageBackend()
 
-            async with aiofiles.open(dest_path, "wb") as f:
-                await f.write(data)
 
-            return True
-        except Exception as e:
-            logger.error(f"Local save bytes failed: {e}")
-            return False
+# Global backend instance
+_storage_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """Get or create the configured storage backend."""
+    global _storage_backend
+    if _storage_backend is None:
+        _storage_backend = create_storage_backend()
+    return _storage_backend
+
+
+def set_storage_backend(backend: StorageBackend):
+    """Replace the configured backend (benchmarks, migration scripts)."""
+    global _storage_backend
+    _storage_backend = backend
+
+
+def get_gcp_bucket():
+    """The GCS bucket of the configured backend (None unless STORAGE_TYPE=gcp)."""
+    backend = get_storage_backend()
+    if isinstance(backend, GCSStorageBackend):
+        return backend.bucket
+    return None
+
+
+class StorageService:
+    """
+    Storage for meeting recordings, on the configured backend.
+    """
 
     @staticmethod
-    async def _copy_locally(relative_source: str, local_dest: str) -> bool:
-        try:
-            base_path = Path("./data/recordings")
-            source_path = base_path / relative_source
+    def backend() -> StorageBackend:
+        return get_storage_backend()
 
-            if not source_path.exists():
-                return False
+    @staticmethod
+    def is_local() -> bool:
+        """Whether recordings are plain files on local disk (STORAGE_TYPE=local)."""
+        return get_storage_backend().is_local
 
-            os.makedirs(os.path.dirname(local_dest), exist_ok=True)
-            shutil.copy2(source_path, local_dest)
-            return True
-        except Exception as e:
-            logger.error(f"Local copy failed: {e}")
+    @staticmethod
+    async def is_ready() -> bool:
+        """Whether the backend is usable (GCS: bucket and credentials resolved)."""
+        return await get_storage_backend().ready()
+
+    @staticmethod
+    async def upload_file(local_path: str, destination_path: str) -> bool:
+        """
+        Upload a file to storage.
+
+        Args:
+            local_path: Path to the local file to upload
+            destination_path: Logical path in storage (e.g. 'meeting-123/recording.wav')
+        """
+        if not os.path.exists(local_path):
+            logger.error(f"Upload failed: Source file not found {local_path}")
             return False
 
+        return await get_storage_backend().upload_file(local_path, destination_path)
+
     @staticmethod
-    async def _read_local_bytes(relative_source: str) -> Optional[bytes]:
-        try:
-            base_path = Path("./data/recordings")
-            source_path = base_path / relative_source
-            if not source_path.exists():
-                return None
+    async def upload_bytes(
+        data: bytes, destination_path: str, content_type: str = "application/octet-stream"
+    ) -> bool:
+        """
+        Upload raw bytes to storage.
+        """
+        return await get_storage_backend().upload_bytes(data, destination_path, content_type)
 
-            import aiofiles
+    @staticmethod
+    async def download_file(source_path: str, local_destination: str) -> bool:
+        """
+        Download a file from storage to local path.
+        """
+        return await get_storage_backend().download_file(source_path, local_destination)
 
-            async with aiofiles.open(source_path, "rb") as f:
-                return await f.read()
-        except Exception as e:
-            logger.error(f"Local read bytes failed: {e}")
-            return None
+    @staticmethod
+    async def download_bytes(source_path: str) -> Optional[bytes]:
+        """
+        Download a file from storage into memory.
+        """
+        return await get_storage_backend().download_bytes(source_path)
 
     @staticmethod
-    async def _delete_locally(relative_path: str) -> bool:
-        try:
-            base_path = Path("./data/recordings")
-            target_path = base_path / relative_path
+    async def read_range(path: str, start: int, length: int) -> Optional[bytes]:
+        """Read `length` bytes from offset `start` (short at the end; None on failure)."""
+        return await get_storage_backend().read_range(path, start, length)
 
-            if target_path.exists():
-                os.remove(target_path)
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Local delete failed: {e}")
-            return False
+    @staticmethod
+    def open_read(path: str, block_size: int = STORAGE_BLOCK_BYTES) -> AsyncIterator[bytes]:
+        """
+        Stream a file as blocks of at most block_size:
+
+            async for block in StorageService.open_read(path): ...
+
+        Raises FileNotFoundError if it does not exist.
+        """
+        return get_storage_backend().open_read(path, block_size)
 
     @staticmethod
-    async def _list_local_files(prefix: str) -> list:
-        try:
-            base_path = Path("./data/recordings")
-            target_path = base_path / prefix
-            if target_path.is_file():
-                return [str(target_path.relative_to(base_path))]
-            if not target_path.exists():
-                return []
+    def open_write(path: str, content_type: str = "application/octet-stream"):
+        """
+        Stream a file into storage (a resumable upload on GCS):
 
-            files = []
-            for path in target_path.rglob("*"):
-                if path.is_file():
-                    files.append(str(path.relative_to(base_path)))
-            return files
-        except Exception as e:
-            logger.error(f"Local list failed: {e}")
-            return []
+            async with StorageService.open_write(path) as writer:
+                await writer.write(block)
+
+        The file only appears if the block exits without an exception.
+        """
+        return get_storage_backend().open_write(path, content_type)
 
     @staticmethod
-    async def _copy_local_file(relative_source: str, relative_dest: str) -> bool:
-        try:
-            base_path = Path("./data/recordings")
-            source_path = base_path / relative_source
-            dest_path = base_path / relative_dest
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
+    async def delete_file(path: str) -> bool:
+        """Delete a file from storage."""
+        return await get_storage_backend().delete(path)
 
-            if not source_path.exists():
-                return False
+    @staticmethod
+    async def list_files(prefix: str) -> list:
+        """List files under a prefix."""
+        return await get_storage_backend().list(prefix)
 
-            shutil.copy2(source_path, dest_path)
-            return True
-        except Exception as e:
-            logger.error(f"Local copy failed: {e}")
-            return False
+    @staticmethod
+    async def copy_file(source_path: str, destination_path: str) -> bool:
+        """Copy a file within storage."""
+        return await get_storage_backend().copy(source_path, destination_path)
 
     @staticmethod
-    async def _delete_local_prefix(prefix: str) -> bool:
-        try:
-            base_path = Path("./data/recordings")
-            target_path = base_path / prefix
-            if not target_path.exists():
-                return True
+    async def delete_prefix(prefix: str) -> bool:
+        """Delete all files under a prefix."""
+        return await get_storage_backend().delete_prefix(prefix)
 
-            if target_path.is_file():
-                target_path.unlink()
-                return True
+    @staticmethod
+    async def download_many(
+        paths: Iterable[str], concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """
+        Download objects in parallel, yielding (path, bytes or None) in the
+        order given. Holds at most `concurrency` objects in memory.
+        """
+        window = concurrency or STORAGE_TRANSFER_CONCURRENCY
+        pending = deque()
+        paths = iter(paths)
+        try:
+            while True:
+                while len(pending) < window:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    pending.append(
+                        (path, asyncio.ensure_future(StorageService.download_bytes(path)))
+                    )
+                if not pending:
+                    return
+                path, task = pending.popleft()
+                yield path, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
 
-            for path in target_path.rglob("*"):
-                if path.is_file():
-                    path.unlink()
+    @staticmethod
+    async def copy_many(
+        pairs: Iterable[Tuple[str, str]], concurrency: Optional[int] = None
+    ) -> bool:
+        """Copy (source, destination) pairs in parallel; True if all succeeded."""
+        results = await _run_bounded(
+            pairs, lambda pair: StorageService.copy_file(*pair), concurrency
+        )
+        return all(results)
 
-            # Clean up empty dirs
-            for path in sorted(target_path.rglob("*"), reverse=True):
-                if path.is_dir() and not any(path.iterdir()):
-                    path.rmdir()
+    @staticmethod
+    async def delete_many(paths: Iterable[str], concurrency: Optional[int] = None) -> bool:
+        """Delete files in parallel; True if all succeeded."""
+        results = await _run_bounded(paths, StorageService.delete_file, concurrency)
+        return all(results)
 
-            if target_path.is_dir() and not any(target_path.iterdir()):
-                target_path.rmdir()
+    @staticmethod
+    async def list_file_sizes(prefix: str) -> Dict[str, int]:
+        """Sizes (bytes) of the files under a prefix."""
+        return await get_storage_backend().list_sizes(prefix)
 
-            return True
-        except Exception as e:
-            logger.error(f"Local delete prefix failed: {e}")
+    @staticmethod
+    async def compose(
+        sources: List[str],
+        destination: str,
+        content_type: str = "application/octet-stream",
+    ) -> bool:
+        """
+        Concatenate files into destination without downloading them
+        (GCS server-side compose; a streamed copy locally).
+        """
+        if not sources:
             return False
+        return await get_storage_backend().compose(sources, destination, content_type)
+
+    @staticmethod
+    async def generate_signed_url(
+        path: str, expiration_seconds: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a temporary accessible URL for a file.
+        For GCP: Generates a Signed URL.
+        For Local: Returns a static file path (assuming served via FastAPI StaticFiles).
+        For Memory: None.
+        """
+        return await get_storage_backend().signed_url(path, expiration_seconds)
+
+    @staticmethod
+    async def check_file_exists(path: str) -> bool:
+        """Check if file exists in storage."""
+        return await get_storage_backend().exists(path)
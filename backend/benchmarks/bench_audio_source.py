@@ -0,0 +1,164 @@
+"""
+Memory held by post-meeting jobs reading one recording.
+
+Writes a synthetic merged recording (default 3 hours of 16kHz PCM, ~345 MB)
+to a temp directory, then runs --jobs concurrent jobs against it in a fresh
+subprocess per mode. Each job does what a diarization job does with the
+audio: computes a statistic over the samples and sends it as a WAV request
+body (to a no-op sink, one block at a time):
+
+    bytes   legacy: aiofiles read + convert_pcm_to_wav per job
+    mmap    AudioSource: samples() views and wav_body() blocks
+
+Reports peak anonymous RSS (process-private memory). Mapped pages are
+reported separately: RssFile counts them once per mapping, but they are one
+copy in the page cache, shared by every job and process, and reclaimable.
+
+Usage:
+    python benchmarks/bench_audio_source.py [--hours 3] [--jobs 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+SAMPLE_RATE = 16000
+BLOCK_BYTES = 1024 * 1024
+
+
+def rss_kb() -> dict:
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return {key: int(fields[key].split()[0]) for key in ("RssAnon", "RssFile")}
+
+
+class PeakSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = {"RssAnon": 0, "RssFile": 0}
+        self.running = True
+
+    def run(self):
+        while self.running:
+            for key, value in rss_kb().items():
+                self.peak[key] = max(self.peak[key], value)
+            time.sleep(0.005)
+
+
+async def job_bytes(path: Path):
+    import aiofiles
+    from services.audio.recorder import AudioRecorder
+
+    async with aiofiles.open(path, "rb") as f:
+        pcm = await f.read()
+    level = float(np.abs(np.frombuffer(pcm, dtype=np.int16)).mean())
+    wav = AudioRecorder.convert_pcm_to_wav(pcm)
+    sent = 0
+    for offset in range(0, len(wav), BLOCK_BYTES):
+        sent += len(wav[offset : offset + BLOCK_BYTES])
+        await asyncio.sleep(0)
+    return level, sent
+
+
+async def job_mmap(path: Path):
+    from services.audio.audio_source import AudioSource
+
+    with AudioSource(path) as audio:
+        level = 0.0
+        # Per-minute statistic over zero-copy views
+        for minute in range(int(audio.duration_seconds // 60) + 1):
+            level += float(np.abs(audio.samples(minute * 60, minute * 60 + 60)).sum())
+        level /= audio.num_frames
+        sent = 0
+        async for block in audio.wav_body():
+            sent += len(block)
+        return level, sent
+
+
+def run_child(mode: str, path: Path, jobs: int):
+    baseline = rss_kb()
+    sampler = PeakSampler()
+    sampler.start()
+    start = time.perf_counter()
+
+    async def run():
+        job = job_bytes if mode == "bytes" else job_mmap
+        return await asyncio.gather(*(job(path) for _ in range(jobs)))
+
+    results = asyncio.run(run())
+    sampler.running = False
+    sampler.join()
+    print(
+        json.dumps(
+            {
+                "seconds": round(time.perf_counter() - start, 2),
+                "anon_mb": round((sampler.peak["RssAnon"] - baseline["RssAnon"]) / 1024, 1),
+                "file_mb": round((sampler.peak["RssFile"] - baseline["RssFile"]) / 1024, 1),
+                "results": results,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.0, help="Synthetic recording length")
+    parser.add_argument("--jobs", type=int, default=3, help="Concurrent jobs on the recording")
+    parser.add_argument("--modes", default="bytes,mmap")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, Path(args.path), args.jobs)
+        return
+
+    root = Path(tempfile.mkdtemp(prefix="bench-audio-source-"))
+    try:
+        path = root / "merged_recording.pcm"
+        rng = np.random.default_rng(0)
+        minute = (rng.standard_normal(SAMPLE_RATE * 60) * 3000).astype(np.int16).tobytes()
+        with open(path, "wb") as f:
+            for _ in range(int(args.hours * 60)):
+                f.write(minute)
+        print(f"{args.hours}h recording: {path.stat().st_size / 1e6:.0f} MB PCM, {args.jobs} concurrent jobs")
+
+        expected = None
+        for mode in args.modes.split(","):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--path", str(path), "--jobs", str(args.jobs)],
+                capture_output=True,
+                text=True,
+            )
+            if out.returncode != 0:
+                print(f"{mode:<6} failed: {out.stderr.strip().splitlines()[-1:]}")
+                continue
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            level, sent = result["results"][0]
+            assert sent == path.stat().st_size + 44, "WAV body length"
+            if expected is None:
+                expected = level
+            assert abs(level - expected) < 1e-6 * expected, "sample statistic"
+            print(
+                f"{mode:<6} {result['seconds']:>6.2f}s  private memory +{result['anon_mb']:>7.1f} MB  "
+                f"mapped page cache +{result['file_mb']:>6.1f} MB  output verified"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Replay benchmark for overlap removal.
+
+Compares the previous set-rebuilding _remove_overlap search with
+OverlapIndex on a stream of overlapping window transcripts, reporting
+time per call, agreement between the two, and dedup accuracy (detected vs
+true overlap length).
+
+Input is either recorded Whisper outputs (--replay, JSONL with one
+{"text": ..., "overlap": <true overlap words, optional>} per window, in
+order) or synthetic windows cut from a reference text with Whisper-like
+noise (dropped/substituted words, punctuation and casing changes).
+
+Usage:
+    python benchmarks/bench_overlap_removal.py [--windows 2000] [--replay outputs.jsonl]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.dedup import OverlapIndex
+
+VOCAB = (
+    "we need to ship the release next week so please review the budget and the "
+    "roadmap before friday then sync with design about onboarding metrics churn "
+    "pricing customers support hiring plan quarterly targets launch demo"
+).split()
+
+
+def legacy_find_overlap(final_text: str, new_words: list) -> int:
+    """The previous _remove_overlap search, kept here as the baseline."""
+
+    def word_similarity(words1, words2):
+        if not words1 or not words2:
+            return 0.0
+        set1 = set(w.lower() for w in words1)
+        set2 = set(w.lower() for w in words2)
+        union = len(set1 | set2)
+        return len(set1 & set2) / union if union > 0 else 0.0
+
+    final_words = final_text.split()
+    if len(new_words) < 4:
+        return 0
+    max_overlap_check = min(20, len(new_words) // 2 + 5)
+    search_window = min(50, len(final_words))
+    final_tail_words = final_words[-search_window:]
+
+    best_overlap = 0
+    for overlap_size in range(max_overlap_check, 2, -1):
+        new_head = new_words[:overlap_size]
+        for start in range(0, min(15, search_window)):
+            if start + overlap_size > search_window:
+                break
+            if word_similarity(new_head, final_tail_words[start : start + overlap_size]) >= 0.5:
+                best_overlap = max(best_overlap, overlap_size)
+                break
+        if overlap_size <= search_window:
+            if word_similarity(new_head, final_tail_words[-overlap_size:]) >= 0.5:
+                best_overlap = max(best_overlap, overlap_size)
+        if best_overlap > 0:
+            break
+    return best_overlap
+
+
+def whisperize(words: list, rng: random.Random, noise: float) -> list:
+    """Apply Whisper-like variation to a word sequence."""
+    out = []
+    for w in words:
+        r = rng.random()
+        if r < noise / 3:
+            continue  # dropped word
+        if r < noise * 2 / 3:
+            w = rng.choice(VOCAB)  # misheard word
+        if rng.random() < 0.1:
+            w = w.capitalize()
+        out.append(w)
+    if out and rng.random() < 0.5:
+        out[-1] += "."
+    return out
+
+
+def synthetic_windows(count: int, noise: float, seed: int = 0):
+    """Yield (window_text, true_overlap_words) like 6s windows with a 2s slide."""
+    rng = random.Random(seed)
+    # Mostly common words plus a long tail of rarer ones (names, numbers, jargon)
+    rare = [f"{w}{i}" for i, w in enumerate(VOCAB * 10)]
+    stream = [
+        rng.choice(VOCAB) if rng.random() < 0.6 else rng.choice(rare)
+        for _ in range(count * 8 + 20)
+    ]
+    pos = 0
+    for _ in range(count):
+        overlap = rng.randint(0, 12)
+        fresh = rng.randint(4, 14)
+        start = max(0, pos - overlap)
+        words = whisperize(stream[start : pos + fresh], rng, noise)
+        yield " ".join(words), pos - start
+        pos += fresh
+
+
+def replay_windows(path: str):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield item["text"], item.get("overlap")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--windows", type=int, default=2000, help="Synthetic windows")
+    parser.add_argument("--noise", type=float, default=0.15, help="Synthetic word noise rate")
+    parser.add_argument("--replay", help="JSONL of recorded Whisper window outputs")
+    args = parser.parse_args()
+
+    windows = list(replay_windows(args.replay) if args.replay else synthetic_windows(args.windows, args.noise))
+
+    index = OverlapIndex()
+    final_text = ""
+    legacy_time = new_time = 0.0
+    agree = exact_legacy = exact_new = labelled = 0
+    abs_err_legacy = abs_err_new = 0
+
+    for text, true_overlap in windows:
+        new_words = text.split()
+
+        t0 = time.perf_counter()
+        legacy = legacy_find_overlap(final_text, new_words) if final_text else 0
+        t1 = time.perf_counter()
+        new = index.find_overlap(new_words)
+        t2 = time.perf_counter()
+        legacy_time += t1 - t0
+        new_time += t2 - t1
+
+        agree += legacy == new
+        if true_overlap is not None:
+            labelled += 1
+            exact_legacy += legacy == true_overlap
+            exact_new += new == true_overlap
+            abs_err_legacy += abs(legacy - true_overlap)
+            abs_err_new += abs(new - true_overlap)
+
+        # Finalize the deduplicated remainder, as the manager does
+        remainder = " ".join(new_words[new:])
+        if remainder:
+            final_text += " " + remainder
+            index.add_text(remainder)
+
+    n = len(windows)
+    print(f"windows: {n}  ({'replay ' + args.replay if args.replay else f'synthetic, noise={args.noise}'})")
+    print(f"{'impl':<8} {'us/call':>10} {'exact':>8} {'mean |err|':>11}")
+    for name, total, exact, err in (
+        ("legacy", legacy_time, exact_legacy, abs_err_legacy),
+        ("index", new_time, exact_new, abs_err_new),
+    ):
+        acc = f"{exact / labelled:.1%}" if labelled else "n/a"
+        mae = f"{err / labelled:.2f}" if labelled else "n/a"
+        print(f"{name:<8} {total / n * 1e6:>10.1f} {acc:>8} {mae:>11}")
+    print(f"agreement legacy vs index: {agree / n:.2%}")
+
+
+if __name__ == "__main__":
+    main()
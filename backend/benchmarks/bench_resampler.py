@@ -0,0 +1,69 @@
+"""
+Throughput benchmark for the streaming resample/downmix stage.
+
+Feeds synthetic client audio through AudioFormatConverter in websocket-
+sized chunks on a single thread and reports input samples/sec per core
+(and the real-time factor). Also checks that chunked conversion matches
+converting the whole signal at once (no boundary artifacts or drift).
+
+Usage:
+    python benchmarks/bench_resampler.py [--seconds 60] [--chunk-ms 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.resample import AudioFormatConverter
+
+FORMATS = [(48000, 2), (48000, 1), (44100, 2), (44100, 1), (22050, 1), (8000, 1), (16000, 2)]
+
+
+def synthetic_pcm(rate: int, channels: int, seconds: float) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * seconds)) / rate
+    mono = 6000 * np.sin(2 * np.pi * 440 * t) + 500 * rng.standard_normal(len(t))
+    frames = np.repeat(mono[:, None], channels, axis=1)
+    return frames.astype(np.int16).tobytes()
+
+
+def bench(rate: int, channels: int, seconds: float, chunk_ms: int):
+    pcm = synthetic_pcm(rate, channels, seconds)
+    chunk_bytes = int(rate * chunk_ms / 1000) * 2 * channels
+
+    converter = AudioFormatConverter(rate, channels)
+    start = time.perf_counter()
+    chunked = b"".join(
+        converter.convert(pcm[i : i + chunk_bytes]) for i in range(0, len(pcm), chunk_bytes)
+    )
+    elapsed = time.perf_counter() - start
+
+    whole = AudioFormatConverter(rate, channels).convert(pcm)
+    same = chunked == whole
+
+    samples_in = len(pcm) // 2  # Counting every channel sample
+    print(
+        f"{rate:>6}Hz x{channels}  {samples_in / elapsed / 1e6:7.2f} M samples/s/core  "
+        f"RTF={elapsed / seconds:.5f}  out={len(chunked) // 2} samples  "
+        f"chunked==whole: {same}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0, help="Audio length per format")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Websocket chunk size")
+    args = parser.parse_args()
+
+    for rate, channels in FORMATS:
+        bench(rate, channels, args.seconds, args.chunk_ms)
+
+
+if __name__ == "__main__":
+    main()
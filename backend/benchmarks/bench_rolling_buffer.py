@@ -0,0 +1,88 @@
+"""
+Micro-benchmark for RollingAudioBuffer.
+
+Measures appends/sec and window reads/sec for the 6s and 12s windows used by
+the streaming manager, and compares against the old deque-backed buffer.
+
+Usage:
+    python benchmarks/bench_rolling_buffer.py [--seconds 2.0] [--chunk-ms 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.buffer import RollingAudioBuffer
+
+SAMPLE_RATE = 16000
+
+
+class DequeBuffer:
+    """The previous deque-of-ints implementation, kept here as a baseline."""
+
+    def __init__(self, window_duration_ms: int):
+        self.window_size = int((window_duration_ms / 1000) * SAMPLE_RATE)
+        self.buffer = deque(maxlen=self.window_size)
+
+    def add_samples(self, samples: np.ndarray):
+        self.buffer.extend(samples)
+
+    def get_window_bytes(self) -> bytes:
+        if len(self.buffer) < self.window_size:
+            window = np.zeros(self.window_size, dtype=np.int16)
+            window[-len(self.buffer) :] = list(self.buffer)
+            return window.tobytes()
+        return np.array(self.buffer, dtype=np.int16).tobytes()
+
+
+def _rate(fn, seconds: float) -> float:
+    """Call fn repeatedly for ~seconds and return calls per second."""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(10):
+            fn()
+        calls += 10
+    return calls / (time.perf_counter() - start)
+
+
+def bench(buffer, chunk: np.ndarray, seconds: float) -> tuple:
+    # Fill once so window reads hit the steady-state path
+    for _ in range(buffer.window_size // len(chunk) + 1):
+        buffer.add_samples(chunk)
+
+    appends = _rate(lambda: buffer.add_samples(chunk), seconds)
+    reads = _rate(buffer.get_window_bytes, seconds)
+    return appends, reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time per measurement")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Append chunk size")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    chunk = rng.integers(-32768, 32767, int(SAMPLE_RATE * args.chunk_ms / 1000), dtype=np.int16)
+
+    print(f"chunk={args.chunk_ms}ms ({len(chunk)} samples), {args.seconds}s per measurement\n")
+    print(f"{'impl':<8} {'window':>7} {'appends/s':>14} {'reads/s':>12}")
+    for window_ms in (6000, 12000):
+        for name, buffer in (
+            ("ring", RollingAudioBuffer(window_duration_ms=window_ms, slide_duration_ms=2000)),
+            ("deque", DequeBuffer(window_ms)),
+        ):
+            appends, reads = bench(buffer, chunk, args.seconds)
+            print(f"{name:<8} {window_ms / 1000:>6.0f}s {appends:>14,.0f} {reads:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
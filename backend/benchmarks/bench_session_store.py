@@ -0,0 +1,252 @@
+"""
+Session lease lifecycle against the Redis store's Lua scripts.
+
+RedisSessionStore does all lease checks and fenced writes in EVAL scripts,
+so a mistake in them only shows up against a server that runs Lua. This
+runs the real scripts in an embedded Lua interpreter (lupa) behind
+LuaRedisStandIn, a minimal redis.asyncio stand-in (GET/DEL/EVAL, SET PX
+inside scripts, PX expiry on the wall clock), and walks two workers
+through a session:
+
+    acquire         first worker takes the lease; a second is refused
+    renew           keepalive renews past several TTLs, saving snapshots
+    fenced write    a non-owner cannot write the snapshot
+    steal           after the owner dies, the lease expires and is taken
+    stale owner     the old owner notices the loss; its writes and its
+                    release cannot touch the new owner's lease
+    release         final snapshot saved, lease freed; handoff latency
+    outage          acquire raises SessionStoreUnavailable instead of
+                    reporting the session as held elsewhere; a holder
+                    that cannot renew for a whole TTL gives the lease up
+
+Requires lupa (pip install lupa). Point --redis-url at a real server to
+run the same walk against it instead (needs the redis package).
+
+Usage:
+    python benchmarks/bench_session_store.py [--ttl 0.3] [--redis-url URL]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.session_store import (
+    RedisSessionStore,
+    SessionLease,
+    SessionStoreUnavailable,
+)
+
+SESSION_ID = "bench-session"
+
+
+class LuaRedisStandIn:
+    """
+    In-process redis.asyncio client stand-in that runs EVAL scripts in a
+    real Lua interpreter. Only what RedisSessionStore uses is implemented.
+    Set `down` to make every command fail like an unreachable server.
+    """
+
+    def __init__(self):
+        try:
+            from lupa.lua51 import LuaRuntime  # Redis embeds Lua 5.1
+        except ImportError:
+            from lupa import LuaRuntime
+
+        self.lua = LuaRuntime()
+        self.redis = self.lua.table_from({"call": self._call})
+        self.data: Dict[str, Tuple[str, Optional[float]]] = {}  # key -> (value, expiry)
+        self.down = False
+        self.commands = Counter()
+        self._scripts = {}
+
+    def _check(self, command: str):
+        if self.down:
+            raise ConnectionError("stand-in Redis is down")
+        self.commands[command] += 1
+
+    def _get(self, key: str) -> Optional[str]:
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[0] if entry else None
+
+    def _call(self, command, *args):
+        """redis.call() as seen from Lua (nil replies are false)."""
+        command = command.upper()
+        if command == "GET":
+            value = self._get(args[0])
+            return False if value is None else value
+        if command == "SET":
+            key, value, options = args[0], str(args[1]), [str(a).upper() for a in args[2:]]
+            expiry = None
+            if "PX" in options:
+                expiry = time.monotonic() + int(args[2 + options.index("PX") + 1]) / 1000
+            self.data[key] = (value, expiry)
+            return self.lua.table_from({"ok": "OK"})
+        if command == "DEL":
+            return sum(1 for key in args if self.data.pop(key, None) is not None)
+        raise NotImplementedError(f"stand-in does not support {command}")
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args):
+        self._check("EVAL")
+        fn = self._scripts.get(script)
+        if fn is None:
+            fn = self.lua.eval(f"function(redis, KEYS, ARGV)\n{script}\nend")
+            self._scripts[script] = fn
+        # Redis hands every key and argument to Lua as a string
+        keys = self.lua.table_from([str(k) for k in keys_and_args[:numkeys]])
+        argv = self.lua.table_from([str(a) for a in keys_and_args[numkeys:]])
+        result = fn(self.redis, keys, argv)
+        return int(result) if isinstance(result, (int, float)) else result
+
+    async def get(self, key: str) -> Optional[str]:
+        self._check("GET")
+        return self._get(key)
+
+    async def delete(self, *keys: str) -> int:
+        self._check("DEL")
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def aclose(self):
+        pass
+
+
+def check(label: str, ok: bool, detail: str = ""):
+    print(f"  {'ok ' if ok else 'FAIL'} {label}{f'  ({detail})' if detail else ''}")
+    if not ok:
+        raise SystemExit(1)
+
+
+async def run(ttl: float, client, standin: Optional[LuaRedisStandIn]):
+    store = RedisSessionStore(client=client, prefix="bench:session:")
+    await client.delete(store._lease_key(SESSION_ID), store._state_key(SESSION_ID))
+
+    def lease(owner: str) -> SessionLease:
+        return SessionLease(store, SESSION_ID, owner=owner, ttl=ttl, state_ttl=60)
+
+    print("acquire")
+    a, b = lease("worker-a"), lease("worker-b")
+    check("first worker takes the lease", await a.acquire(wait=0))
+    check("second worker is refused while it is held", not await b.acquire(wait=ttl / 2))
+
+    print("renew")
+    snapshots = iter(range(1, 1000))
+    a.start(lambda: {"chunk_index": next(snapshots)})
+    await asyncio.sleep(ttl * 3)
+    check("lease outlives 3 TTLs while renewed", not await b.acquire(wait=0))
+    state = await store.load_state(SESSION_ID)
+    check("keepalive saved snapshots", bool(state and state["chunk_index"] >= 3), f"state={state}")
+
+    print("fenced write")
+    check(
+        "non-owner snapshot write is refused",
+        not await store.save_state(SESSION_ID, "worker-b", {"chunk_index": -1}, 60),
+    )
+    check("snapshot untouched", (await store.load_state(SESSION_ID))["chunk_index"] > 0)
+
+    print("steal")
+    a._keepalive.cancel()  # Worker A dies without releasing
+    a._keepalive = None
+    start = time.monotonic()
+    check("second worker takes the lease after expiry", await b.acquire(wait=ttl * 4))
+    check("...only once the old lease expired", time.monotonic() - start >= ttl * 0.5,
+          f"{time.monotonic() - start:.2f}s")
+
+    print("stale owner")
+    a.start(lambda: {"chunk_index": -1})
+    await asyncio.sleep(ttl / 3 + 0.1)
+    check("old owner notices it lost the lease", a.lost)
+    check("...and its lost event fires", a.lost_event.is_set())
+    check("old owner's snapshot write is refused", not await a.save({"chunk_index": -1}))
+    check(
+        "old owner's release leaves the new lease alone",
+        not await store.release_lease(SESSION_ID, "worker-a"),
+    )
+    await a.release({"chunk_index": -1})
+    check("new owner still holds it", not await lease("worker-c").acquire(wait=0))
+
+    print("release")
+    b.start(lambda: {"chunk_index": 100})
+    waiter = lease("worker-c")
+    pending = asyncio.create_task(waiter.acquire(wait=ttl * 10))
+    await asyncio.sleep(0.3)
+    released_at = time.monotonic()
+    await b.release({"chunk_index": 101, "final": True})
+    check("waiting worker gets the lease", await pending)
+    handoff = time.monotonic() - released_at
+    check("handoff without waiting for expiry", handoff < ttl + 0.3, f"{handoff * 1000:.0f}ms")
+    check("final snapshot saved", (await store.load_state(SESSION_ID)).get("final") is True)
+    await waiter.release()
+
+    if standin is not None:
+        print("outage")
+        standin.down = True
+        start = time.monotonic()
+        try:
+            await lease("worker-d").acquire(wait=0.5)
+            check("acquire raises SessionStoreUnavailable", False)
+        except SessionStoreUnavailable:
+            check(
+                "acquire raises SessionStoreUnavailable after retrying",
+                True,
+                f"{time.monotonic() - start:.2f}s",
+            )
+        standin.down = False
+        check("store recovers", await lease("worker-d").acquire(wait=0))
+
+        holder = lease("worker-e")
+        await store.release_lease(SESSION_ID, "worker-d")
+        check("holder takes the lease", await holder.acquire(wait=0))
+        holder.start(lambda: {"chunk_index": 1})
+        standin.down = True
+        await asyncio.sleep(ttl / 2)
+        check("holder keeps it through a short outage", not holder.lost_event.is_set())
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(holder.lost_event.wait(), timeout=ttl * 2)
+        except asyncio.TimeoutError:
+            pass
+        check(
+            "holder gives the lease up once the outage outlasts the TTL",
+            holder.lost_event.is_set(),
+            f"after {ttl / 2 + time.monotonic() - start:.2f}s",
+        )
+        standin.down = False
+        await holder.release()
+        print(f"commands: {dict(standin.commands)}")
+
+    await client.delete(store._lease_key(SESSION_ID), store._state_key(SESSION_ID))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ttl", type=float, default=0.3, help="Lease TTL in seconds")
+    parser.add_argument("--redis-url", help="Run against a real Redis server instead")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        import redis.asyncio as redis
+
+        client, standin = redis.from_url(args.redis_url, decode_responses=True), None
+    else:
+        try:
+            standin = LuaRedisStandIn()
+        except ImportError:
+            print("lupa is not installed (pip install lupa); cannot run the Lua scripts")
+            sys.exit(1)
+        client = standin
+    print(f"Lease TTL {args.ttl}s against {args.redis_url or 'the Lua stand-in'}")
+    asyncio.run(run(args.ttl, client, standin))
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
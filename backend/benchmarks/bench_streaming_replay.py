@@ -0,0 +1,593 @@
+"""
+Offline replay harness for StreamingTranscriptionManager.
+
+Feeds recorded PCM (or synthetic speech-like audio) through
+process_audio_chunk in websocket-sized chunks with client timestamps, at
+--speed times real time. Groq is replaced by ScriptedTranscriber: every
+window the manager sends is answered with the reference words whose
+midpoint falls inside that window's audio span (so consecutive windows
+overlap the way Whisper's do), after a configurable latency, optionally
+with word errors. Manager clocks run at the same speed, so triggers and
+intervals behave as in real time.
+
+Reports:
+
+- CPU seconds per audio hour and RSS growth over the run
+- Groq calls per audio minute
+- finalize lag (audio fed when the final was emitted minus the final's
+  audio_end_time) and the manager's stage latency histograms
+- duplicate / missed / substituted word rates of the finalized transcript
+  against the reference
+- cost per meeting hour: Groq calls and billed audio (Groq bills every
+  request as at least GROQ_MIN_BILLED_SECONDS)
+- the adaptive cadence controller's state and decisions (--adaptive)
+
+--api-rpm makes the stub itself answer 429 (with retry-after) above a
+request rate, like Groq does when the scheduler's budget is too generous;
+--low-confidence-rate makes some answers come back with low confidence.
+Comparing runs with and without --adaptive shows what the controller
+trades between cost per meeting hour and finalize latency.
+
+Thresholds (--max-duplicate-rate, --max-missed-rate, --max-finalize-p95)
+make it a regression gate for dedup and trigger changes: the exit status
+is 1 when one is exceeded.
+
+Audio/reference inputs:
+    (default)              synthetic audio with a generated reference
+    --pcm FILE             16kHz mono int16 .pcm, or any .wav (converted)
+    --reference FILE       .json list of {"text", "start"/"audio_start_time",
+                           "end"/"audio_end_time"} segments (e.g. exported
+                           transcript_segments), or .txt (words spread
+                           over the detected speech)
+
+Usage:
+    python benchmarks/bench_streaming_replay.py [--minutes 10] [--speed 20]
+        [--vad simple] [--latency 0.6] [--jitter 0.3] [--word-error-rate 0]
+        [--adaptive] [--api-rpm 30] [--low-confidence-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import logging
+import os
+import random
+import re
+import resource
+import sys
+import time
+import wave
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import services.audio.manager as manager_module
+from services.audio.manager import StreamingTranscriptionManager
+from services.audio.resample import AudioFormatConverter
+from services.audio.scheduler import TranscriptionScheduler
+from services.audio.vad_pool import BACKENDS, VADPool
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+# Groq bills each transcription request as at least this much audio
+GROQ_MIN_BILLED_SECONDS = 10.0
+
+VOCABULARY = (
+    "we need to ship the release before friday so let us review the open issues "
+    "first the login page still times out for some users and the dashboard is slow "
+    "on large accounts can you take the database migration and I will look at "
+    "caching after that we should update the docs and tell support what changed "
+    "budget numbers look fine but marketing wants the launch date confirmed today"
+).split()
+
+
+@dataclass
+class RefWord:
+    text: str
+    start: float
+    end: float
+    sentence_end: bool = False
+
+
+# --- Audio and reference -----------------------------------------------------
+
+
+def synthetic_session(minutes: float, seed: int = 0) -> Tuple[np.ndarray, List[RefWord]]:
+    """
+    Speech-like bursts (voiced harmonics with ~4Hz syllable modulation)
+    separated by pauses, plus a reference of ~2.5 words/s per burst.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    parts: List[np.ndarray] = []
+    words: List[RefWord] = []
+    pos = 0
+    while pos < total:
+        # Pause
+        n = int(rng.uniform(0.3, 2.5) * SAMPLE_RATE)
+        parts.append(0.002 * rng.standard_normal(n))
+        pos += n
+        # Utterance
+        seconds = rng.uniform(1.0, 9.0)
+        n = int(seconds * SAMPLE_RATE)
+        t = np.arange(n) / SAMPLE_RATE
+        f0 = rng.uniform(100, 220)
+        voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 5))
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t)
+        parts.append(0.25 * voiced * envelope + 0.02 * rng.standard_normal(n))
+
+        count = max(1, int(seconds * 2.5))
+        step = seconds / count
+        start_time = pos / SAMPLE_RATE
+        for i in range(count):
+            words.append(
+                RefWord(
+                    VOCABULARY[int(rng.integers(len(VOCABULARY)))],
+                    start_time + i * step,
+                    start_time + (i + 1) * step,
+                    sentence_end=i == count - 1,
+                )
+            )
+        pos += n
+
+    audio = np.concatenate(parts)[:total]
+    words = [w for w in words if w.end <= total / SAMPLE_RATE]
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16), words
+
+
+def load_pcm(path: str) -> np.ndarray:
+    """16kHz mono int16 samples from a raw .pcm or any PCM .wav."""
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError("Only 16-bit WAV files are supported")
+            pcm = wav.readframes(wav.getnframes())
+            converter = AudioFormatConverter(wav.getframerate(), wav.getnchannels())
+            pcm = converter.convert(pcm)
+    else:
+        with open(path, "rb") as f:
+            pcm = f.read()
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+def _spread(text: str, start: float, end: float) -> List[RefWord]:
+    tokens = text.split()
+    if not tokens:
+        return []
+    step = (end - start) / len(tokens)
+    return [
+        RefWord(
+            token,
+            start + i * step,
+            start + (i + 1) * step,
+            sentence_end=token.endswith((".", "!", "?")),
+        )
+        for i, token in enumerate(tokens)
+    ]
+
+
+def load_reference(path: str, audio: np.ndarray) -> List[RefWord]:
+    """Reference words with timings (see module docstring for formats)."""
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            segments = json.load(f)
+        words: List[RefWord] = []
+        for seg in segments:
+            start = seg.get("start", seg.get("audio_start_time"))
+            end = seg.get("end", seg.get("audio_end_time"))
+            words.extend(_spread(seg["text"], float(start), float(end)))
+        return words
+
+    # Plain text: spread the words over 100ms frames that carry energy
+    with open(path) as f:
+        tokens = f.read().split()
+    frame = SAMPLE_RATE // 10
+    n = len(audio) // frame
+    rms = np.sqrt(np.mean((audio[: n * frame].reshape(n, frame) / 32768.0) ** 2, axis=1))
+    speech_frames = np.flatnonzero(rms > max(0.01, np.percentile(rms, 30)))
+    if not len(speech_frames) or not tokens:
+        return []
+    per_word = len(speech_frames) / len(tokens)
+    words = []
+    for i, token in enumerate(tokens):
+        first = speech_frames[int(i * per_word)]
+        last = speech_frames[min(len(speech_frames) - 1, int((i + 1) * per_word) - 1)]
+        words.append(
+            RefWord(token, first / 10, (last + 1) / 10, token.endswith((".", "!", "?")))
+        )
+    return words
+
+
+def normalize_words(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+# --- Groq stand-in -------------------------------------------------------------
+
+
+class ScriptedTranscriber:
+    """
+    Deterministic stand-in for Groq (TranscriptionScheduler transcriber).
+
+    Returns the reference words inside the window's audio span. Spans are
+    registered by the harness when the manager snapshots a window; other
+    uploads (force_flush) are assumed to end at the newest buffered audio.
+    """
+
+    def __init__(
+        self,
+        words: List[RefWord],
+        latency: float,
+        jitter: float,
+        speed: float,
+        word_error_rate: float = 0.0,
+        seed: int = 0,
+        api_rpm: Optional[float] = None,
+        low_confidence_rate: float = 0.0,
+    ):
+        self.words = words
+        self._mids = np.array([(w.start + w.end) / 2 for w in words])
+        self.latency = latency
+        self.jitter = jitter
+        self.speed = speed
+        self.word_error_rate = word_error_rate
+        self.api_rpm = api_rpm
+        self.low_confidence_rate = low_confidence_rate
+        self._random = random.Random(seed)
+        self._accepted: List[float] = []  # Audio-time of accepted requests
+        self.spans: Dict[int, Tuple[bytes, float, float]] = {}
+        self.manager: Optional[StreamingTranscriptionManager] = None
+        self.calls = 0
+        self.rejected = 0
+        self.audio_seconds = 0.0
+        self.billed_seconds = 0.0
+        self._clock_start = time.monotonic()
+
+    def register(self, audio: bytes, start: float, end: float):
+        self.spans[id(audio)] = (audio, start, end)
+
+    def _span(self, audio: bytes) -> Tuple[float, float]:
+        entry = self.spans.pop(id(audio), None)
+        if entry is not None and entry[0] is audio:
+            return entry[1], entry[2]
+        end = self.manager.buffer_end_time if self.manager else 0.0
+        return end - len(audio) / BYTES_PER_SECOND, end
+
+    def script(self, start: float, end: float) -> str:
+        lo, hi = np.searchsorted(self._mids, [start, end])
+        tokens = []
+        for word in self.words[lo:hi]:
+            token = word.text
+            if self.word_error_rate and self._random.random() < self.word_error_rate:
+                token = self._random.choice(VOCABULARY)
+            if word.sentence_end and not token.endswith((".", "!", "?")):
+                token += "."
+            tokens.append(token)
+        text = " ".join(tokens)
+        return text[:1].upper() + text[1:]
+
+    def _rate_limited(self) -> Optional[float]:
+        """Audio seconds until the next request is accepted, if over api_rpm."""
+        if not self.api_rpm:
+            return None
+        now = (time.monotonic() - self._clock_start) * self.speed
+        self._accepted = [t for t in self._accepted if now - t < 60.0]
+        if len(self._accepted) >= self.api_rpm:
+            return max(0.1, 60.0 - (now - self._accepted[0]))
+        self._accepted.append(now)
+        return None
+
+    async def __call__(self, api_key: str, method: str, audio_data: bytes, kwargs: dict) -> dict:
+        self.calls += 1
+        retry_after = self._rate_limited()
+        if retry_after is not None:
+            self.rejected += 1
+            return {
+                "text": "",
+                "confidence": 0.0,
+                "error": "rate_limit_exceeded",
+                # The scheduler waits in real time
+                "rate_limit": {"retry-after": f"{retry_after / self.speed:.3f}"},
+            }
+        seconds = len(audio_data) / BYTES_PER_SECOND
+        self.audio_seconds += seconds
+        self.billed_seconds += max(GROQ_MIN_BILLED_SECONDS, seconds)
+        start, end = self._span(audio_data)
+        await asyncio.sleep((self.latency + self._random.uniform(0, self.jitter)) / self.speed)
+        low = self.low_confidence_rate and self._random.random() < self.low_confidence_rate
+        return {
+            "text": self.script(start, end),
+            "confidence": 0.3 if low else 0.9,
+            "language": "en",
+            "audio_seconds": len(audio_data) / BYTES_PER_SECOND,
+        }
+
+
+class ScaledClock:
+    """
+    Stand-in for the `time` module inside manager.py: time(), monotonic()
+    and perf_counter() run `speed` times faster than real time.
+    """
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self._real_start = time.monotonic()
+        self._wall_start = time.time()
+
+    def _elapsed(self) -> float:
+        return (time.monotonic() - self._real_start) * self.speed
+
+    def monotonic(self) -> float:
+        return self._real_start + self._elapsed()
+
+    def perf_counter(self) -> float:
+        return self.monotonic()
+
+    def time(self) -> float:
+        return self._wall_start + self._elapsed()
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class ReplayManager(StreamingTranscriptionManager):
+    """Manager that tells the stub which audio span each window covers."""
+
+    transcriber: ScriptedTranscriber
+
+    def _snapshot_window(self):
+        audio, time_map = super()._snapshot_window()
+        if time_map is not None and time_map.pieces:
+            start, end = time_map.start_time, time_map.end_time
+        else:
+            end = self.buffer_end_time
+            start = end - len(audio) / BYTES_PER_SECOND
+        self.transcriber.register(audio, start, end)
+        return audio, time_map
+
+
+# --- Metrics --------------------------------------------------------------------
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        # Peak, not current, but still shows growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def word_error_rates(reference: List[str], hypothesis: List[str]) -> dict:
+    """Duplicate (inserted), missed (deleted) and substituted word rates."""
+    matcher = difflib.SequenceMatcher(a=reference, b=hypothesis, autojunk=False)
+    inserted = deleted = substituted = 0
+    for op, a0, a1, b0, b1 in matcher.get_opcodes():
+        if op == "insert":
+            inserted += b1 - b0
+        elif op == "delete":
+            deleted += a1 - a0
+        elif op == "replace":
+            common = min(a1 - a0, b1 - b0)
+            substituted += common
+            deleted += (a1 - a0) - common
+            inserted += (b1 - b0) - common
+    total = max(1, len(reference))
+    return {
+        "reference_words": len(reference),
+        "hypothesis_words": len(hypothesis),
+        "duplicate_rate": round(inserted / total, 4),
+        "missed_rate": round(deleted / total, 4),
+        "substitution_rate": round(substituted / total, 4),
+    }
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+# --- Replay ----------------------------------------------------------------------
+
+
+async def replay(audio: np.ndarray, words: List[RefWord], args) -> dict:
+    speed = args.speed
+    clock = ScaledClock(speed)
+    real_time_module = manager_module.time
+    manager_module.time = clock
+
+    stub = ScriptedTranscriber(
+        words,
+        args.latency,
+        args.jitter,
+        speed,
+        args.word_error_rate,
+        args.seed,
+        api_rpm=args.api_rpm,
+        low_confidence_rate=args.low_confidence_rate,
+    )
+    scheduler = TranscriptionScheduler(
+        transcriber=stub,
+        # The limit is per audio minute; the scheduler runs on real time
+        requests_per_minute=(args.rpm or 1e6) * speed,
+        burst=args.burst,
+    )
+    pool = VADPool(backend=args.vad, threshold=args.vad_threshold, warm_size=1)
+    ReplayManager.transcriber = stub
+    manager = ReplayManager("replay-key", session_id="replay", scheduler=scheduler, vad_pool=pool)
+    manager.cadence.enabled = args.adaptive
+    stub.manager = manager
+
+    finals: List[dict] = []
+    lags: List[float] = []
+    reasons: Dict[str, int] = {}
+    fed_until = 0.0
+
+    async def on_final(data):
+        finals.append(data)
+        reasons[data.get("reason", "unknown")] = reasons.get(data.get("reason", "unknown"), 0) + 1
+        if data.get("audio_end_time"):
+            lags.append(fed_until - data["audio_end_time"])
+
+    chunk_samples = SAMPLE_RATE * args.chunk_ms // 1000
+    total_seconds = len(audio) / SAMPLE_RATE
+    rss_samples = []
+    next_rss = 0.0
+
+    cpu_start = time.process_time()
+    real_start = time.monotonic()
+    for offset in range(0, len(audio), chunk_samples):
+        chunk = audio[offset : offset + chunk_samples]
+        client_timestamp = offset / SAMPLE_RATE
+        chunk_end = client_timestamp + len(chunk) / SAMPLE_RATE
+
+        # A chunk can only be sent once it has been captured
+        delay = real_start + chunk_end / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+        fed_until = chunk_end
+        await manager.process_audio_chunk(
+            chunk.tobytes(),
+            client_timestamp=client_timestamp,
+            on_final=on_final,
+            received_at=clock.monotonic(),
+        )
+
+        if chunk_end >= next_rss:
+            rss_samples.append((chunk_end, rss_mb()))
+            next_rss += max(60.0, total_seconds / 20)
+
+    await manager.wait_for_inference(timeout=30.0)
+    flush = await manager.force_flush()
+    if flush:
+        flush["reason"] = "flush"
+        await on_final(flush)
+    real_elapsed = time.monotonic() - real_start
+    cpu = time.process_time() - cpu_start
+    rss_samples.append((total_seconds, rss_mb()))
+
+    stats = manager.get_stats()
+    manager.cleanup()
+    await scheduler.close()
+    manager_module.time = real_time_module
+
+    hypothesis = normalize_words(" ".join(f["text"] for f in finals))
+    reference = normalize_words(" ".join(w.text for w in words))
+
+    # Growth after warm-up (first sample is taken at the start)
+    warm = rss_samples[1] if len(rss_samples) > 2 else rss_samples[0]
+    audio_hours = total_seconds / 3600
+    return {
+        "audio_seconds": round(total_seconds, 1),
+        "real_seconds": round(real_elapsed, 1),
+        "achieved_speed": round(total_seconds / real_elapsed, 1),
+        "cpu_s_per_audio_hour": round(cpu / audio_hours, 1),
+        "rss_mb": {
+            "start": round(rss_samples[0][1], 1),
+            "end": round(rss_samples[-1][1], 1),
+            "growth_after_warmup": round(rss_samples[-1][1] - warm[1], 1),
+        },
+        "groq_calls": stub.calls,
+        "groq_rejected_429": stub.rejected,
+        "groq_calls_per_audio_minute": round(stub.calls / (total_seconds / 60), 2),
+        "groq_audio_seconds_per_audio_second": round(stub.audio_seconds / total_seconds, 2),
+        "cost_per_meeting_hour": {
+            "requests": round((stub.calls - stub.rejected) / audio_hours, 1),
+            "billed_audio_hours": round(stub.billed_seconds / 3600 / audio_hours, 2),
+        },
+        "finals": len(finals),
+        "finals_by_reason": reasons,
+        "finalize_lag_s": {
+            "p50": round(percentile(lags, 0.5), 2) if lags else None,
+            "p95": round(percentile(lags, 0.95), 2) if lags else None,
+            "max": round(max(lags), 2) if lags else None,
+        },
+        "words": word_error_rates(reference, hypothesis),
+        "stage_latency": stats["latency"],
+        "trigger_config": stats["trigger_config"],
+        "cadence": stats["cadence"],
+    }
+
+
+def check_gates(result: dict, args) -> List[str]:
+    failures = []
+    words = result["words"]
+    if args.max_duplicate_rate is not None and words["duplicate_rate"] > args.max_duplicate_rate:
+        failures.append(f"duplicate_rate {words['duplicate_rate']} > {args.max_duplicate_rate}")
+    if args.max_missed_rate is not None and words["missed_rate"] > args.max_missed_rate:
+        failures.append(f"missed_rate {words['missed_rate']} > {args.max_missed_rate}")
+    p95 = result["finalize_lag_s"]["p95"]
+    if args.max_finalize_p95 is not None and p95 is not None and p95 > args.max_finalize_p95:
+        failures.append(f"finalize_lag p95 {p95}s > {args.max_finalize_p95}s")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pcm", help="Recorded audio (.pcm 16kHz mono int16, or .wav)")
+    parser.add_argument("--reference", help="Reference transcript (.json segments or .txt)")
+    parser.add_argument("--minutes", type=float, default=10.0, help="Synthetic audio length")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speed", type=float, default=20.0, help="Replay speed (x real time)")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Websocket chunk size")
+    parser.add_argument("--vad", default="simple", choices=sorted(BACKENDS))
+    parser.add_argument("--vad-threshold", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.6, help="Stub Groq latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Extra uniform latency (s)")
+    parser.add_argument("--word-error-rate", type=float, default=0.0, help="Stub word substitutions")
+    parser.add_argument("--rpm", type=float, default=None, help="Groq budget per audio minute")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--api-rpm", type=float, default=None, help="Stub 429s above this rate per audio minute")
+    parser.add_argument("--low-confidence-rate", type=float, default=0.0, help="Share of low-confidence answers")
+    parser.add_argument("--adaptive", action="store_true", help="Enable the adaptive cadence controller")
+    parser.add_argument("--max-duplicate-rate", type=float, default=None)
+    parser.add_argument("--max-missed-rate", type=float, default=None)
+    parser.add_argument("--max-finalize-p95", type=float, default=None, help="Seconds")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON only")
+    args = parser.parse_args()
+
+    if args.pcm:
+        if not args.reference:
+            parser.error("--pcm needs --reference")
+        audio = load_pcm(args.pcm)
+        words = load_reference(args.reference, audio)
+    else:
+        audio, words = synthetic_session(args.minutes, args.seed)
+
+    # Per-chunk INFO logs from the manager would dominate the CPU numbers
+    logging.disable(logging.INFO)
+
+    result = asyncio.run(replay(audio, words, args))
+    failures = check_gates(result, args)
+    result["gate_failures"] = failures
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        summary = {k: v for k, v in result.items() if k != "stage_latency"}
+        print(json.dumps(summary, indent=2))
+        print("stage latency p95 (ms, audio time):")
+        for stage, labels in result["stage_latency"].items():
+            print(
+                f"  {stage:<11} "
+                + "  ".join(f"{label}={s['p95_ms']}({s['count']})" for label, s in labels.items())
+            )
+    if failures:
+        print("GATE FAILED: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Load test for live transcript fan-out.
+
+Publishes a session's partials/finals to hundreds of in-process
+subscribers per topic (each drained by its own task, like the
+/ws/transcript-subscribe sender) and reports publish cost, delivery
+latency percentiles and how many deliberately slow subscribers were
+evicted. Fast subscribers must never be evicted or miss an event.
+
+Usage:
+    python benchmarks/bench_transcript_hub.py [--sessions 4] [--subscribers 500]
+        [--events 400] [--rate 50] [--slow 10]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.transcript_hub import CLOSE_SLOW_CONSUMER, TranscriptHub
+
+
+async def consume(subscriber, latencies, send_delay: float):
+    received = 0
+    while True:
+        message = await subscriber.get()
+        if message is None:
+            return received
+        event = json.loads(message)
+        if "sent_at" in event:
+            latencies.append(time.perf_counter() - event["sent_at"])
+        received += 1
+        # Stands in for websocket.send_text on a slow link
+        await asyncio.sleep(send_delay)
+
+
+async def run(args):
+    hub = TranscriptHub()
+    topics = [hub.open_topic(f"meeting-{i}", aliases=[f"session-{i}"]) for i in range(args.sessions)]
+
+    # A few finals before anyone joins, to exercise replay
+    for topic in topics:
+        for i in range(5):
+            topic.publish({"type": "final", "text": f"earlier segment {i}"}, replay=True)
+
+    latencies = []
+    consumers = []  # (slow, subscriber, task)
+    for topic in topics:
+        for i in range(args.subscribers):
+            slow = i < args.slow
+            subscriber = hub.get_topic(topic.key).subscribe()
+            delay = 1.0 if slow else 0
+            consumers.append((slow, subscriber, asyncio.create_task(consume(subscriber, latencies, delay))))
+
+    publish_times = []
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+    for n in range(args.events):
+        for topic in topics:
+            event = {
+                "type": "final" if n % 4 == 3 else "partial",
+                "text": "the quick brown fox jumps over the lazy dog " * 2,
+                "confidence": 0.9,
+                "sent_at": time.perf_counter(),
+            }
+            t0 = time.perf_counter()
+            topic.publish(event, replay=event["type"] == "final")
+            publish_times.append(time.perf_counter() - t0)
+        await asyncio.sleep(interval)
+    elapsed = time.perf_counter() - start
+
+    stats = hub.get_stats()
+    for topic in topics:
+        hub.close_topic(topic.key)
+    results = [(slow, subscriber, await task) for slow, subscriber, task in consumers]
+
+    expected = 5 + args.events + 1  # replay + live + session_ended
+    fast = [(s, r) for is_slow, s, r in results if not is_slow]
+    slow = [(s, r) for is_slow, s, r in results if is_slow]
+    fast_complete = sum(1 for _, r in fast if r == expected)
+    slow_evicted = sum(1 for s, _ in slow if s.close_reason == CLOSE_SLOW_CONSUMER)
+    fast_evicted = sum(1 for s, _ in fast if s.close_reason == CLOSE_SLOW_CONSUMER)
+
+    lat = np.array(latencies) * 1000
+    pub = np.array(publish_times) * 1000
+    print(
+        f"{args.sessions} sessions x {args.subscribers} subscribers, "
+        f"{args.events} events each at {args.rate}/s ({elapsed:.1f}s)"
+    )
+    print(
+        f"publish (fan-out to {args.subscribers}): p50={np.percentile(pub, 50):.3f}ms "
+        f"p99={np.percentile(pub, 99):.3f}ms max={pub.max():.3f}ms"
+    )
+    print(
+        f"delivery latency: p50={np.percentile(lat, 50):.2f}ms "
+        f"p99={np.percentile(lat, 99):.2f}ms max={lat.max():.2f}ms "
+        f"({len(lat)} deliveries)"
+    )
+    print(f"fast subscribers with every event: {fast_complete}/{len(fast)} (evicted: {fast_evicted})")
+    print(f"slow subscribers evicted: {slow_evicted}/{len(slow)}")
+    print(f"hub stats before close: {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent live sessions")
+    parser.add_argument("--subscribers", type=int, default=500, help="Subscribers per session")
+    parser.add_argument("--events", type=int, default=400, help="Events published per session")
+    parser.add_argument("--rate", type=float, default=50.0, help="Events per second per session")
+    parser.add_argument("--slow", type=int, default=10, help="Slow subscribers per session")
+    args = parser.parse_args()
+    # One eviction warning per slow subscriber is just noise here
+    logging.getLogger("services.audio.transcript_hub").setLevel(logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
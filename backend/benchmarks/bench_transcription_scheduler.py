@@ -0,0 +1,109 @@
+"""
+Offline load test for TranscriptionScheduler.
+
+Simulates N live sessions submitting a window every --interval seconds
+against a StubTranscriber with configurable latency and requests-per-minute
+limit, then prints scheduler metrics (queue depth, wait times, coalescing,
+429s).
+
+Usage:
+    python benchmarks/bench_transcription_scheduler.py --sessions 100 --duration 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.scheduler import (
+    StubTranscriber,
+    TranscriptionScheduler,
+    PRIORITY_LIVE,
+    PRIORITY_FLUSH,
+)
+
+WINDOW_BYTES = b"\0" * 6 * 32000  # 6s of 16kHz int16 silence
+
+
+async def live_session(scheduler, session_id, api_key, interval, duration, stats):
+    deadline = time.monotonic() + duration
+    # Stagger session start so windows do not all land on the same tick
+    await asyncio.sleep(hash(session_id) % 1000 / 1000 * interval)
+    pending = set()
+    while time.monotonic() < deadline:
+        pending.add(asyncio.create_task(_submit(scheduler, session_id, api_key, PRIORITY_LIVE, stats)))
+        await asyncio.sleep(interval)
+    pending.add(asyncio.create_task(_submit(scheduler, session_id, api_key, PRIORITY_FLUSH, stats)))
+    await asyncio.gather(*pending)
+
+
+async def _submit(scheduler, session_id, api_key, priority, stats):
+    start = time.monotonic()
+    result = await scheduler.submit(session_id, api_key, WINDOW_BYTES, priority=priority)
+    if result.get("coalesced"):
+        stats["coalesced"] += 1
+    elif result.get("expired"):
+        stats["expired"] += 1
+    elif result.get("error"):
+        stats["errors"] += 1
+    else:
+        stats["completed"] += 1
+        stats["latencies"].append(time.monotonic() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--keys", type=int, default=1, help="Distinct API keys")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load")
+    parser.add_argument("--interval", type=float, default=3.0, help="Seconds between windows")
+    parser.add_argument("--latency", type=float, default=0.6, help="Stub API latency")
+    parser.add_argument("--jitter", type=float, default=0.4)
+    parser.add_argument("--api-rpm", type=float, default=2000, help="Stub API limit per key")
+    parser.add_argument("--scheduler-rpm", type=float, default=1800, help="Scheduler budget per key")
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--max-in-flight", type=int, default=32)
+    args = parser.parse_args()
+
+    stub = StubTranscriber(latency=args.latency, jitter=args.jitter, requests_per_minute=args.api_rpm)
+    scheduler = TranscriptionScheduler(
+        transcriber=stub,
+        requests_per_minute=args.scheduler_rpm,
+        burst=args.burst,
+        max_in_flight_per_key=args.max_in_flight,
+    )
+    stats = {"completed": 0, "coalesced": 0, "expired": 0, "errors": 0, "latencies": []}
+
+    started = time.monotonic()
+    await asyncio.gather(
+        *(
+            live_session(
+                scheduler, f"session-{i}", f"key-{i % args.keys}", args.interval, args.duration, stats
+            )
+            for i in range(args.sessions)
+        )
+    )
+    elapsed = time.monotonic() - started
+
+    latencies = sorted(stats.pop("latencies"))
+    summary = {
+        "elapsed_s": round(elapsed, 2),
+        "api_calls": stub.calls,
+        "api_calls_per_min": round(stub.calls / elapsed * 60, 1),
+        "api_429s": stub.rejected,
+        **stats,
+        "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+        "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+        "scheduler": scheduler.get_metrics(),
+    }
+    print(json.dumps(summary, indent=2))
+    await scheduler.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Real-time factor benchmark for the VAD backends.
+
+For every backend that can be loaded here (SimpleVAD always, SileroVAD if
+torch + the hub model are available, TenVAD if ten-vad loads), reports:
+
+- frame_probabilities: whole-file scoring (post-recording segmenting)
+- get_speech_segments: scoring + vectorized segmentation
+- is_speech: live path, 100ms chunks
+
+RTF = processing time / audio duration (lower is better; 0.01 means an hour
+of audio takes 36s).
+
+For the stateful backends it then checks VADPool reuse: an instance that
+streamed one session, was released and was acquired again must score a
+known clip exactly like a freshly built instance.
+
+Usage:
+    python benchmarks/bench_vad.py [--seconds 600] [--chunk-ms 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.audio.vad import SileroVAD, SimpleVAD, TenVAD
+from services.audio.vad_pool import VADPool
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_audio(seconds: float, seed: int = 0) -> np.ndarray:
+    """Alternating 0.5-3s bursts of noisy 'speech' and near-silence, int16."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    total = int(seconds * SAMPLE_RATE)
+    speaking = True
+    while sum(len(p) for p in parts) < total:
+        n = int(rng.uniform(0.5, 3.0) * SAMPLE_RATE)
+        if speaking:
+            t = np.arange(n) / SAMPLE_RATE
+            tone = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 300) * t)
+            part = tone + 0.05 * rng.standard_normal(n)
+        else:
+            part = 0.002 * rng.standard_normal(n)
+        parts.append(part)
+        speaking = not speaking
+    audio = np.concatenate(parts)[:total]
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def load_backends():
+    backends = []
+    for name, cls in (("simple", SimpleVAD), ("silero", SileroVAD), ("ten", TenVAD)):
+        try:
+            backends.append((name, cls()))
+        except Exception as e:
+            print(f"  skipping {name}: {e}")
+    return backends
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench(name: str, vad, audio: np.ndarray, chunk_ms: int):
+    duration = len(audio) / SAMPLE_RATE
+    chunk = int(SAMPLE_RATE * chunk_ms / 1000)
+
+    t_probs = timed(lambda: vad.frame_probabilities(audio))
+    t_segments = timed(lambda: vad.get_speech_segments(audio))
+
+    def live():
+        for i in range(0, len(audio) - chunk + 1, chunk):
+            vad.is_speech(audio[i : i + chunk])
+
+    t_live = timed(live)
+    segments = vad.get_speech_segments(audio)
+
+    print(
+        f"{name:<8} frame={vad.frame_size:>5}  "
+        f"probs RTF={t_probs / duration:.5f}  "
+        f"segments RTF={t_segments / duration:.5f} ({len(segments)} segs)  "
+        f"is_speech({chunk_ms}ms) RTF={t_live / duration:.5f}"
+    )
+
+
+def stream_scores(vad, audio: np.ndarray, chunk: int) -> np.ndarray:
+    """Frame scores as a live session sees them (state carried across chunks)."""
+    return np.concatenate(
+        [
+            vad.frame_probabilities(audio[i : i + chunk], reset_state=False)
+            for i in range(0, len(audio) - chunk + 1, chunk)
+        ]
+    )
+
+
+def check_pool_reset(name: str, audio: np.ndarray, chunk_ms: int):
+    chunk = int(SAMPLE_RATE * chunk_ms / 1000) // 512 * 512  # Whole frames for every backend
+    clip = synthetic_audio(10, seed=1)
+    pool = VADPool(backend=name, warm_size=0)
+
+    vad = pool.acquire()
+    stream_scores(vad, audio[: 60 * SAMPLE_RATE], chunk)  # Previous session
+    pool.release(vad)
+    reused = pool.acquire()
+    assert reused is vad, "pool did not hand back the released instance"
+    reused_scores = stream_scores(reused, clip, chunk)
+
+    fresh_scores = stream_scores(pool._vad_class(threshold=pool.threshold), clip, chunk)
+    same = np.array_equal(reused_scores, fresh_scores)
+    print(
+        f"{name:<8} pool reuse: {'identical to fresh instance' if same else 'DIFFERS from fresh instance'} "
+        f"(max diff {np.abs(reused_scores - fresh_scores).max():.2e})"
+    )
+    assert same, f"{name}: released instance kept state from its previous session"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=600.0, help="Synthetic audio length")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Live chunk size for is_speech")
+    args = parser.parse_args()
+
+    audio = synthetic_audio(args.seconds)
+    print(f"Audio: {args.seconds:.0f}s @ {SAMPLE_RATE}Hz")
+    backends = load_backends()
+    for name, vad in backends:
+        bench(name, vad, audio, args.chunk_ms)
+    for name, _ in backends:
+        if name != "simple":
+            check_pool_reset(name, audio, args.chunk_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Peak memory of merging a recorded meeting's PCM chunks into a WAV file.
+
+Writes a synthetic recording (30s chunks, default 4 hours ≈ 460 MB of
+PCM) to a temp directory, then merges it in a fresh subprocess per mode so
+each gets its own peak RSS:
+
+    stream   wav_merge.merge_to_wav_file (header, streamed blocks, patch)
+    legacy   AudioRecorder.merge_chunks + convert_pcm_to_wav + write
+
+The merged WAV is checked for a correct header and chunk order.
+
+Usage:
+    python benchmarks/bench_wav_merge.py [--hours 4] [--modes stream,legacy]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add app directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 30
+CHUNK_BYTES = SAMPLE_RATE * 2 * CHUNK_SECONDS
+MEETING_ID = "bench-meeting"
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_recording(root: Path, hours: float) -> int:
+    """Chunk i starts with its index as int32, so order can be checked."""
+    chunk_dir = root / MEETING_ID
+    chunk_dir.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(CHUNK_BYTES // 2) * 3000).astype(np.int16)
+    count = int(hours * 3600 / CHUNK_SECONDS)
+    for i in range(count):
+        samples[:2] = np.frombuffer(np.int32(i).tobytes(), dtype=np.int16)
+        (chunk_dir / f"chunk_{i:05d}.pcm").write_bytes(samples.tobytes())
+    return count
+
+
+async def merge(mode: str, root: Path, target: Path):
+    os.environ["STORAGE_TYPE"] = "local"
+    if mode == "stream":
+        from services.audio.wav_merge import merge_to_wav_file
+
+        if not await merge_to_wav_file(MEETING_ID, target, str(root)):
+            raise RuntimeError("merge failed")
+    else:
+        from services.audio.recorder import AudioRecorder
+
+        pcm = await AudioRecorder.merge_chunks(MEETING_ID, str(root))
+        wav = AudioRecorder.convert_pcm_to_wav(pcm)
+        target.write_bytes(wav)
+
+
+def run_child(mode: str, root: Path, target: Path):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    asyncio.run(merge(mode, root, target))
+    print(
+        json.dumps(
+            {
+                "seconds": round(time.perf_counter() - start, 2),
+                "baseline_rss_mb": round(baseline, 1),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
+        )
+    )
+
+
+def verify(target: Path, chunks: int):
+    with wave.open(str(target), "rb") as wav:
+        assert wav.getframerate() == SAMPLE_RATE and wav.getnchannels() == 1
+        assert wav.getnframes() == chunks * CHUNK_BYTES // 2, "data length"
+    with open(target, "rb") as f:
+        for i in (0, chunks // 2, chunks - 1):
+            f.seek(44 + i * CHUNK_BYTES)
+            assert int(np.frombuffer(f.read(4), dtype=np.int32)[0]) == i, f"chunk {i} order"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4.0, help="Synthetic recording length")
+    parser.add_argument("--modes", default="stream,legacy")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    parser.add_argument("--target", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, Path(args.root), Path(args.target))
+        return
+
+    root = Path(tempfile.mkdtemp(prefix="bench-wav-merge-"))
+    try:
+        chunks = write_recording(root, args.hours)
+        pcm_mb = chunks * CHUNK_BYTES / 1e6
+        print(f"{args.hours}h recording: {chunks} chunks, {pcm_mb:.0f} MB PCM")
+        for mode in args.modes.split(","):
+            target = root / f"{mode}.wav"
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--root", str(root), "--target", str(target)],
+                capture_output=True,
+                text=True,
+            )
+            if out.returncode != 0:
+                print(f"{mode:<7} failed: {out.stderr.strip().splitlines()[-1:]}")
+                continue
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            verify(target, chunks)
+            print(
+                f"{mode:<7} {result['seconds']:>6.2f}s  peak RSS {result['peak_rss_mb']:>7.1f} MB "
+                f"(+{result['peak_rss_mb'] - result['baseline_rss_mb']:.1f} MB over startup)  output verified"
+            )
+            target.unlink()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,12 @@ from pathlib import Path
 sys.path.append(os.path.join(os.path.dirname(__file__), "../backend/app"))
 
 try:
-    from storage import StorageService, STORAGE_TYPE
-    from audio_recorder import AudioRecorder
-    import aiofiles
+    from services.storage import (
+        StorageService,
+        STORAGE_TYPE,
+        STORAGE_TRANSFER_CONCURRENCY,
+    )
+    from services.audio.wav_merge import read_file_blocks, write_wav
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure you run this script from the project root")
@@ -39,33 +42,18 @@ async def migrate_meeting(meeting_id: str, local_path: Path):
     source_file = None
     if merged_wav.exists():
         source_file = merged_wav
-    elif merged_pcm.exists():
-        # Ideally convert PCM to WAV before upload, but for now we upload what we have?
-        # Actually AudioRecorder logic prefers WAV in cloud.
-        # Let's convert if needed.
-        logger.info(f"  Converting PCM to WAV for {meeting_id}")
-        async with aiofiles.open(merged_pcm, "rb") as f:
-            pcm_data = await f.read()
-        wav_data = AudioRecorder.convert_pcm_to_wav(pcm_data)
-        async with aiofiles.open(merged_wav, "wb") as f:
-            await f.write(wav_data)
-        source_file = merged_wav
     else:
-        # Try merging chunks
-        chunks = list(local_path.glob("chunk_*.pcm"))
-        if chunks:
-            logger.info(f"  Merging {len(chunks)} chunks for {meeting_id}")
-            audio_bytes = await AudioRecorder.merge_chunks(
-                meeting_id, str(local_path.parent)
-            )
-            if audio_bytes:
-                wav_data = AudioRecorder.convert_pcm_to_wav(audio_bytes)
-                async with aiofiles.open(merged_wav, "wb") as f:
-                    await f.write(wav_data)
-                source_file = merged_wav
+        # Stream merged PCM or the chunks into a WAV (constant memory)
+        if merged_pcm.exists():
+            sources = [merged_pcm]
         else:
+            sources = sorted(local_path.glob("chunk_*.pcm"))
+        if not sources:
             logger.warning(f"  No audio found for {meeting_id}, skipping")
             return
+        logger.info(f"  Merging {len(sources)} PCM file(s) into WAV for {meeting_id}")
+        await write_wav(read_file_blocks(sources), merged_wav)
+        source_file = merged_wav
 
     # 2. Upload to GCS
     if source_file and source_file.exists():
@@ -100,25 +88,27 @@ async def main():
 
     logger.info("Starting migration to Google Cloud Storage...")
 
-    tasks = []
-    # Iterate over all meeting directories
-    for meeting_dir in recordings_dir.iterdir():
-        if meeting_dir.is_dir():
-            tasks.append(migrate_meeting(meeting_dir.name, meeting_dir))
-
-    if not tasks:
+    meeting_dirs = [d for d in recordings_dir.iterdir() if d.is_dir()]
+    if not meeting_dirs:
         logger.info("No meetings found to migrate.")
         return
 
-    # Run migrations (limited concurrency)
-    # Process in batches of 5 to avoid network/memory overload
-    batch_size = 5
-    for i in range(0, len(tasks), batch_size):
-        batch = tasks[i : i + batch_size]
-        await asyncio.gather(*batch)
-        logger.info(
-            f"Processed batch {i // batch_size + 1}/{(len(tasks) + batch_size - 1) // batch_size}"
-        )
+    # Bounded concurrency (STORAGE_TRANSFER_CONCURRENCY): a slow upload no
+    # longer holds back a whole batch
+    semaphore = asyncio.Semaphore(STORAGE_TRANSFER_CONCURRENCY)
+    done = 0
+
+    async def migrate(meeting_dir: Path):
+        nonlocal done
+        async with semaphore:
+            try:
+                await migrate_meeting(meeting_dir.name, meeting_dir)
+            except Exception as e:
+                logger.error(f"❌ Failed to migrate {meeting_dir.name}: {e}")
+        done += 1
+        logger.info(f"Processed {done}/{len(meeting_dirs)} meetings")
+
+    await asyncio.gather(*(migrate(d) for d in meeting_dirs))
 
     logger.info("🎉 Migration complete!")
 